@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de agregação da aplicação InterNews
+Calcula KPIs, séries dos gráficos e o resumo por técnico em uma única
+passada agrupada sobre códigos categóricos
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# Colunas que participam do agrupamento e o nome da dimensão no modelo
+DIMENSOES = {
+    "tecnicos": "Técnico",
+    "tipos": "Tipo",
+    "clientes": "Cliente",
+    "versoes": "Versão Internews",
+    "os": "O.S",
+}
+
+
+@dataclass(frozen=True)
+class ModeloVisao:
+    """Agregados imutáveis consumidos pela camada de renderização"""
+    total_registros: int
+    os_unicas: int
+    tecnicos: Tuple[Tuple[str, int], ...]
+    tipos: Tuple[Tuple[str, int], ...]
+    clientes: Tuple[Tuple[str, int], ...]
+    versoes: Tuple[Tuple[str, int], ...]
+    # (técnico, O.S únicas, clientes únicos, erros), ordenado por técnico
+    resumo_tecnicos: Tuple[Tuple[str, int, int, int], ...]
+
+    def quantidade_tipo(self, tipo: str) -> int:
+        """Quantidade de registros de um tipo de atendimento"""
+        return dict(self.tipos).get(tipo, 0)
+
+    def serie(self, dimensao: str, limite: int = None) -> pd.Series:
+        """Contagens de uma dimensão em ordem decrescente, como value_counts()"""
+        pares = getattr(self, dimensao)
+        if limite is not None:
+            pares = pares[:limite]
+        return pd.Series(
+            [qtd for _, qtd in pares],
+            index=[nome for nome, _ in pares],
+            name="count",
+            dtype="int64"
+        )
+
+    def resumo_tecnicos_df(self) -> pd.DataFrame:
+        """Tabela de resumo por técnico"""
+        return pd.DataFrame(
+            [linha[1:] for linha in self.resumo_tecnicos],
+            index=pd.Index([linha[0] for linha in self.resumo_tecnicos], name="Técnico"),
+            columns=["O.S Únicas", "Clientes", "Erros"]
+        )
+
+
+def _contagens(codigos: np.ndarray, pesos: np.ndarray, categorias: np.ndarray) -> Tuple[Tuple[str, int], ...]:
+    """Soma os pesos por código e devolve pares (categoria, total) decrescentes"""
+    validos = codigos >= 0
+    totais = np.bincount(codigos[validos], weights=pesos[validos], minlength=len(categorias))
+    ordem = np.argsort(-totais, kind="stable")
+    return tuple(
+        (categorias[i], int(totais[i]))
+        for i in ordem
+        if totais[i] > 0
+    )
+
+
+def _distintos_por_tecnico(cod_tecnico: np.ndarray, cod_outro: np.ndarray, n_tecnicos: int, n_outro: int) -> np.ndarray:
+    """Quantidade de valores distintos de outra dimensão para cada técnico"""
+    validos = (cod_tecnico >= 0) & (cod_outro >= 0)
+    pares = np.unique(cod_tecnico[validos].astype(np.int64) * max(n_outro, 1) + cod_outro[validos])
+    return np.bincount(pares // max(n_outro, 1), minlength=n_tecnicos)
+
+
+def calcular_modelo_visao(df: pd.DataFrame) -> ModeloVisao:
+    """Calcula todos os agregados do dashboard a partir de df em uma única passada"""
+    if df.empty:
+        return ModeloVisao(0, 0, (), (), (), (), ())
+
+    # Codificação categórica de cada dimensão (NaN vira -1)
+    codigos = {}
+    categorias = {}
+    for dimensao, coluna in DIMENSOES.items():
+        codigos[dimensao], categorias[dimensao] = pd.factorize(df[coluna], sort=False)
+        categorias[dimensao] = np.asarray(categorias[dimensao], dtype=object)
+
+    # Única passada sobre as linhas: frequência de cada combinação de códigos
+    grupos = pd.DataFrame(codigos).value_counts(sort=False)
+    combinacoes = grupos.index.to_frame(index=False)
+    pesos = grupos.to_numpy()
+
+    g = {dimensao: combinacoes[dimensao].to_numpy() for dimensao in DIMENSOES}
+
+    # Demais agregados derivam das combinações, bem menores que df
+    n_tecnicos = len(categorias["tecnicos"])
+    cod_erro = np.flatnonzero(categorias["tipos"] == "Erro")
+    tec_validos = g["tecnicos"] >= 0
+    if len(cod_erro):
+        mascara_erro = tec_validos & (g["tipos"] == cod_erro[0])
+        erros = np.bincount(g["tecnicos"][mascara_erro], weights=pesos[mascara_erro], minlength=n_tecnicos)
+    else:
+        erros = np.zeros(n_tecnicos)
+    os_por_tecnico = _distintos_por_tecnico(g["tecnicos"], g["os"], n_tecnicos, len(categorias["os"]))
+    clientes_por_tecnico = _distintos_por_tecnico(g["tecnicos"], g["clientes"], n_tecnicos, len(categorias["clientes"]))
+
+    resumo_tecnicos = tuple(
+        (categorias["tecnicos"][i], int(os_por_tecnico[i]), int(clientes_por_tecnico[i]), int(erros[i]))
+        for i in sorted(range(n_tecnicos), key=lambda i: categorias["tecnicos"][i])
+    )
+
+    return ModeloVisao(
+        total_registros=len(df),
+        os_unicas=len(categorias["os"]),
+        tecnicos=_contagens(g["tecnicos"], pesos, categorias["tecnicos"]),
+        tipos=_contagens(g["tipos"], pesos, categorias["tipos"]),
+        clientes=_contagens(g["clientes"], pesos, categorias["clientes"]),
+        versoes=_contagens(g["versoes"], pesos, categorias["versoes"]),
+        resumo_tecnicos=resumo_tecnicos,
+    )
+
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Arquivo frio (Parquet) dos registros de análises antigas
+Os registros saem do banco para arquivos Parquet comprimidos, particionados
+por mês do atendimento e por análise (hive: mes=2025-01/analise_id=12/).
+As leituras usam poda de colunas e de partições, de modo que consultar uma
+análise ou um mês só abre os arquivos correspondentes.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+DIRETORIO_ARQUIVO = os.getenv("INTERNEWS_ARQUIVO_DIR", "arquivo")
+COMPRESSAO = "zstd"
+MES_SEM_DATA = "sem-data"
+
+# Colunas gravadas (mesmos nomes da tabela registros)
+ESQUEMA = pa.schema([
+    ("id", pa.int64()),
+    ("analise_id", pa.int64()),
+    ("data", pa.string()),
+    ("os", pa.string()),
+    ("cliente", pa.string()),
+    ("tecnico", pa.string()),
+    ("tipo", pa.string()),
+    ("versao_internews", pa.string()),
+    ("detalhe_atendimento", pa.string()),
+    ("suporte_original", pa.string()),
+    ("data_criacao", pa.timestamp("us")),
+    ("mes", pa.string()),
+])
+PARTICIONAMENTO = ds.partitioning(
+    pa.schema([("mes", pa.string()), ("analise_id", pa.int64())]),
+    flavor="hive"
+)
+
+
+def mes_dos_atendimentos(datas: pd.Series) -> pd.Series:
+    """'DD/MM/AAAA' -> 'AAAA-MM' (datas inválidas ficam em 'sem-data')"""
+    partes = datas.astype(str).str.extract(r"^\d{2}/(\d{2})/(\d{4})$")
+    meses = partes[1] + "-" + partes[0]
+    return meses.fillna(MES_SEM_DATA)
+
+
+def _diretorios_da_analise(analise_id: int, raiz: str) -> List[Path]:
+    return sorted(Path(raiz).glob(f"mes=*/analise_id={analise_id}"))
+
+
+def remover_analise(analise_id: int, raiz: str = DIRETORIO_ARQUIVO) -> int:
+    """Apaga as partições de uma análise; retorna quantas foram removidas"""
+    diretorios = _diretorios_da_analise(analise_id, raiz)
+    for diretorio in diretorios:
+        shutil.rmtree(diretorio, ignore_errors=True)
+        try:
+            diretorio.parent.rmdir()  # mês vazio
+        except OSError:
+            pass
+    return len(diretorios)
+
+
+def remover_orfas(manter: Iterable[int], raiz: str = DIRETORIO_ARQUIVO) -> int:
+    """Apaga as partições de análises fora de `manter`; retorna quantas foram removidas"""
+    manter = {int(analise_id) for analise_id in manter}
+    orfas = {
+        int(diretorio.name.split("=", 1)[1])
+        for diretorio in Path(raiz).glob("mes=*/analise_id=*")
+    } - manter
+    return sum(remover_analise(analise_id, raiz) for analise_id in sorted(orfas))
+
+
+def gravar_analise(analise_id: int, registros: pd.DataFrame, raiz: str = DIRETORIO_ARQUIVO) -> int:
+    """
+    Grava os registros de uma análise (colunas da tabela registros) e
+    retorna a quantidade de linhas gravadas. Regravar substitui a anterior.
+    """
+    df = registros.copy()
+    df["analise_id"] = analise_id
+    df["mes"] = mes_dos_atendimentos(df["data"])
+    tabela = pa.Table.from_pandas(df[ESQUEMA.names], schema=ESQUEMA, preserve_index=False)
+
+    remover_analise(analise_id, raiz)
+    ds.write_dataset(
+        tabela,
+        raiz,
+        format="parquet",
+        partitioning=PARTICIONAMENTO,
+        basename_template=f"analise-{analise_id}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        file_options=ds.ParquetFileFormat().make_write_options(compression=COMPRESSAO),
+    )
+    return contar_registros([analise_id], raiz)
+
+
+def _conjunto(raiz: str) -> Optional[ds.Dataset]:
+    if not Path(raiz).is_dir():
+        return None
+    return ds.dataset(raiz, format="parquet", partitioning=PARTICIONAMENTO)
+
+
+def _filtro_particoes(analise_ids: Iterable[int] = None, meses: Iterable[str] = None, filtro=None):
+    expressao = filtro
+    if analise_ids is not None:
+        condicao = ds.field("analise_id").isin(list(analise_ids))
+        expressao = condicao if expressao is None else expressao & condicao
+    if meses is not None:
+        condicao = ds.field("mes").isin(list(meses))
+        expressao = condicao if expressao is None else expressao & condicao
+    return expressao
+
+
+def ler_registros(
+    analise_ids: Iterable[int] = None,
+    colunas: List[str] = None,
+    filtro=None,
+    meses: Iterable[str] = None,
+    raiz: str = DIRETORIO_ARQUIVO
+) -> pa.Table:
+    """
+    Lê registros arquivados. `analise_ids` e `meses` podam partições,
+    `colunas` poda colunas e `filtro` (expressão pyarrow.dataset) é
+    aplicado durante a leitura.
+    """
+    colunas = colunas or [nome for nome in ESQUEMA.names if nome != "mes"]
+    analise_ids = None if analise_ids is None else list(analise_ids)
+    conjunto = _conjunto(raiz)
+    if conjunto is None or analise_ids == []:
+        return ESQUEMA.empty_table().select(colunas)
+    return conjunto.to_table(columns=colunas, filter=_filtro_particoes(analise_ids, meses, filtro))
+
+
+def contar_registros(analise_ids: Iterable[int] = None, raiz: str = DIRETORIO_ARQUIVO, filtro=None) -> int:
+    """Quantidade de registros arquivados (usa os metadados quando possível)"""
+    analise_ids = None if analise_ids is None else list(analise_ids)
+    conjunto = _conjunto(raiz)
+    if conjunto is None or analise_ids == []:
+        return 0
+    return conjunto.count_rows(filter=_filtro_particoes(analise_ids, None, filtro))
+
+
+def valores_distintos(colunas: List[str], analise_ids: Iterable[int] = None, raiz: str = DIRETORIO_ARQUIVO) -> Tuple[int, Dict[str, set]]:
+    """(total de linhas, valores distintos por coluna), lendo só essas colunas"""
+    tabela = ler_registros(analise_ids, colunas=colunas, raiz=raiz)
+    return tabela.num_rows, {coluna: set(pc.unique(tabela[coluna]).to_pylist()) for coluna in colunas}
+
+
+def contar_por(colunas: List[str], analise_ids: Iterable[int] = None, filtro=None, raiz: str = DIRETORIO_ARQUIVO) -> pd.DataFrame:
+    """Quantidade de registros por combinação de `colunas` (agregado no Arrow, coluna "quantidade")"""
+    tabela = ler_registros(analise_ids, colunas=colunas, filtro=filtro, raiz=raiz)
+    agregado = tabela.group_by(colunas).aggregate([([], "count_all")])
+    nomes = ["quantidade" if nome == "count_all" else nome for nome in agregado.column_names]
+    return agregado.rename_columns(nomes).to_pandas()
+
+
+def filtro_igual(coluna: str, valor):
+    """Equivalente a coluna = valor como expressão de filtro"""
+    return ds.field(coluna) == valor
+
+
+def filtro_contem(coluna: str, trecho: str):
+    """Equivalente a ILIKE '%trecho%' como expressão de filtro"""
+    return pc.match_substring(ds.field(coluna), trecho, ignore_case=True)
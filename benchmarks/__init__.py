@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""
+Ferramentas de benchmark da aplicação InterNews
+Executar a partir da raiz do repositório, por exemplo:
+    python -m benchmarks.benchmark_parser --tamanhos 1MB 10MB
+"""
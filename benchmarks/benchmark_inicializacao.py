@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de inicialização do dashboard InterNews
+Mede, sempre em um interpretador novo, o tempo de import dos módulos da
+aplicação e o tempo até a primeira renderização (AppTest do Streamlit) de
+uma sessão fria e de uma segunda sessão no mesmo processo.
+
+Uso:
+    python -m benchmarks.benchmark_inicializacao
+    python -m benchmarks.benchmark_inicializacao --salvar base.json
+    python -m benchmarks.benchmark_inicializacao --comparar base.json --tolerancia 0.20
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+
+ARQUIVO_APP = "internews_com_db.py"
+
+# Módulos importados pela primeira página (e os carregados sob demanda)
+MODULOS = [
+    "pandas", "streamlit", "sqlalchemy", "models", "database_manager", "log_parser",
+    "ingestao", "agregacao", "cache_visoes", "tabela_paginada",
+    "plotly.express", "exportacao",
+]
+
+
+def _medir_import(modulo: str) -> float:
+    """Executado no processo filho: tempo de import (com dependências)"""
+    import importlib
+
+    inicio = time.perf_counter()
+    importlib.import_module(modulo)
+    return time.perf_counter() - inicio
+
+
+def _medir_renderizacao(timeout: float) -> Dict:
+    """Executado no processo filho: primeira sessão (fria) e segunda sessão"""
+    inicio = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    tempo_import = time.perf_counter() - inicio
+
+    tempos = []
+    for _ in range(2):
+        inicio = time.perf_counter()
+        app = AppTest.from_file(ARQUIVO_APP, default_timeout=timeout).run()
+        tempos.append(time.perf_counter() - inicio)
+
+    return {
+        "import_apptest": round(tempo_import, 4),
+        "primeira_renderizacao": round(tempos[0], 4),
+        "segunda_sessao": round(tempos[1], 4),
+        "erros_app": [e.value for e in app.error],
+    }
+
+
+def _processo_novo(funcao, *argumentos):
+    # spawn garante um interpretador sem nada importado
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+        return executor.submit(funcao, *argumentos).result()
+
+
+def executar_benchmark(repeticoes: int = 3, timeout: float = 60) -> Dict:
+    """Menor tempo de `repeticoes` execuções de cada medição"""
+    imports = {}
+    for modulo in MODULOS:
+        imports[modulo] = round(min(_processo_novo(_medir_import, modulo) for _ in range(repeticoes)), 4)
+        print(f"import {modulo:<18} {imports[modulo]:>8.3f}s")
+
+    renderizacoes = [_processo_novo(_medir_renderizacao, timeout) for _ in range(repeticoes)]
+    renderizacao = {
+        chave: min(r[chave] for r in renderizacoes)
+        for chave in ("import_apptest", "primeira_renderizacao", "segunda_sessao")
+    }
+    for chave, segundos in renderizacao.items():
+        print(f"{chave:<25} {segundos:>8.3f}s")
+    if renderizacoes[-1]["erros_app"]:
+        print("Avisos da aplicação: " + "; ".join(renderizacoes[-1]["erros_app"]))
+
+    return {
+        "meta": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "repeticoes": repeticoes,
+        },
+        "resultados": {"imports": imports, "renderizacao": renderizacao},
+    }
+
+
+def comparar(atual: Dict, base: Dict, tolerancia: float) -> List[str]:
+    """Lista as medições que ficaram mais lentas que a base além da tolerância"""
+    regressoes = []
+    for grupo, medicoes in atual["resultados"].items():
+        for nome, segundos in medicoes.items():
+            referencia = base.get("resultados", {}).get(grupo, {}).get(nome)
+            if not referencia or not segundos:
+                continue
+            razao = segundos / referencia
+            situacao = "REGRESSÃO" if razao > 1 + tolerancia else "ok"
+            print(f"{grupo:>12} {nome:<25} {razao:>6.2f}x da base  {situacao}")
+            if situacao != "ok":
+                regressoes.append(f"{grupo}/{nome}: {razao:.2f}x")
+    return regressoes
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Benchmark de inicialização do dashboard InterNews")
+    argumentos.add_argument("--repeticoes", type=int, default=3)
+    argumentos.add_argument("--timeout", type=float, default=60, help="Timeout do AppTest (s)")
+    argumentos.add_argument("--salvar", help="Grava os resultados em JSON")
+    argumentos.add_argument("--comparar", help="JSON de base para comparação")
+    argumentos.add_argument("--tolerancia", type=float, default=0.20, help="Aumento de tempo tolerado (fração)")
+    args = argumentos.parse_args()
+
+    resultado = executar_benchmark(args.repeticoes, args.timeout)
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+        print(f"Resultados gravados em {args.salvar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        regressoes = comparar(resultado, base, args.tolerancia)
+        if regressoes:
+            print("Regressões encontradas: " + "; ".join(regressoes))
+            sys.exit(1)
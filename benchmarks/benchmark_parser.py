@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do LogParser com logs sintéticos
+Mede validar_arquivo, processar_arquivo, extrair_tecnicos e, opcionalmente,
+a ingestão completa (parser + banco) em MB/s, blocos/s e pico de RSS.
+Cada medição roda em um processo separado para isolar o pico de memória.
+
+Uso:
+    python -m benchmarks.benchmark_parser --tamanhos 1MB 10MB 100MB
+    python -m benchmarks.benchmark_parser --salvar base.json
+    python -m benchmarks.benchmark_parser --comparar base.json --tolerancia 0.10
+    python -m benchmarks.benchmark_parser --ingestao   (usa DATABASE_URL)
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+
+from benchmarks.gerador_logs import gerar_texto, interpretar_tamanho
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ESTAGIOS = ["validar_arquivo", "processar_arquivo", "extrair_tecnicos"]
+
+
+def _pico_rss_mb() -> float:
+    """Pico de memória residente do processo atual (MB)"""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return pico / 1024 / 1024 if sys.platform == "darwin" else pico / 1024
+
+
+def _medir_estagio(estagio: str, tamanho_bytes: int, semente: int, repeticoes: int) -> Dict:
+    """Executado no processo filho: gera o log e mede um estágio"""
+    from log_parser import LogParser
+
+    texto = gerar_texto(tamanho_bytes, semente)
+    parser = LogParser()
+    blocos = sum(1 for _ in parser.iterar_blocos(texto))
+    megabytes = len(texto.encode("utf-8")) / 1024 / 1024
+    rss_base = _pico_rss_mb()
+
+    if estagio == "validar_arquivo":
+        def executar():
+            parser.validar_arquivo(texto)
+    elif estagio == "processar_arquivo":
+        def executar():
+            parser.processar_arquivo(texto)
+    elif estagio == "extrair_tecnicos":
+        linhas_suporte = [m.group(1).strip(" .") for m in parser.re_suporte.finditer(texto)]
+
+        def executar():
+            for linha in linhas_suporte:
+                parser.extrair_tecnicos(linha)
+    elif estagio == "ingestao":
+        from ingestao import PipelineIngestao
+        from database_manager import GerenciadorBancoDados
+
+        GerenciadorBancoDados.inicializar()
+        pipeline = PipelineIngestao(parser)
+
+        def executar():
+            resultado = pipeline.executar(texto, f"benchmark_{tamanho_bytes}.txt", usuario="benchmark")
+            if resultado.analise_id is not None:
+                GerenciadorBancoDados.deletar_analise(resultado.analise_id)
+    else:
+        raise ValueError(f"Estágio desconhecido: {estagio}")
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        executar()
+        tempos.append(time.perf_counter() - inicio)
+
+    segundos = min(tempos)
+    return {
+        "segundos": round(segundos, 6),
+        "mb_s": round(megabytes / segundos, 3) if segundos else None,
+        "blocos_s": round(blocos / segundos, 1) if segundos else None,
+        "blocos": blocos,
+        "megabytes": round(megabytes, 3),
+        "repeticoes": repeticoes,
+        "pico_rss_mb": round(_pico_rss_mb(), 1) if resource else None,
+        "rss_apos_gerar_mb": round(rss_base, 1) if resource else None,
+    }
+
+
+def executar_benchmark(tamanhos: List[str], estagios: List[str], semente: int = 42, repeticoes: int = None) -> Dict:
+    """Roda os estágios para cada tamanho, cada um em um processo novo"""
+    resultados = {}
+    for rotulo in tamanhos:
+        tamanho_bytes = interpretar_tamanho(rotulo)
+        # Arquivos grandes: uma repetição basta e evita horas de execução
+        n = repeticoes or (3 if tamanho_bytes <= 10 * 1024 ** 2 else 1)
+        resultados[rotulo] = {}
+        for estagio in estagios:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                medicao = executor.submit(_medir_estagio, estagio, tamanho_bytes, semente, n).result()
+            resultados[rotulo][estagio] = medicao
+            print(
+                f"{rotulo:>8} {estagio:<18} {medicao['segundos']:>9.3f}s "
+                f"{medicao['mb_s'] or 0:>9.2f} MB/s {medicao['blocos_s'] or 0:>11.0f} blocos/s "
+                f"RSS {medicao['pico_rss_mb'] or 0:>8.1f} MB"
+            )
+
+    return {
+        "meta": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "semente": semente,
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(atual: Dict, base: Dict, tolerancia: float) -> List[str]:
+    """Lista as regressões de vazão (MB/s) acima da tolerância"""
+    regressoes = []
+    for rotulo, estagios in atual["resultados"].items():
+        for estagio, medicao in estagios.items():
+            referencia = base.get("resultados", {}).get(rotulo, {}).get(estagio)
+            if not referencia or not referencia.get("mb_s") or not medicao.get("mb_s"):
+                continue
+            razao = medicao["mb_s"] / referencia["mb_s"]
+            situacao = "REGRESSÃO" if razao < 1 - tolerancia else "ok"
+            print(f"{rotulo:>8} {estagio:<18} {razao:>6.2f}x da base  {situacao}")
+            if situacao != "ok":
+                regressoes.append(f"{rotulo}/{estagio}: {razao:.2f}x")
+    return regressoes
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Benchmark do parser InterNews")
+    argumentos.add_argument("--tamanhos", nargs="+", default=["1MB", "10MB"], help="Ex.: 1MB 10MB 100MB 1GB")
+    argumentos.add_argument("--estagios", nargs="+", default=ESTAGIOS, choices=ESTAGIOS + ["ingestao"])
+    argumentos.add_argument("--ingestao", action="store_true", help="Inclui a ingestão completa (requer banco)")
+    argumentos.add_argument("--semente", type=int, default=42)
+    argumentos.add_argument("--repeticoes", type=int, default=None)
+    argumentos.add_argument("--salvar", help="Grava os resultados em JSON")
+    argumentos.add_argument("--comparar", help="JSON de base para comparação")
+    argumentos.add_argument("--tolerancia", type=float, default=0.10, help="Queda de vazão tolerada (fração)")
+    args = argumentos.parse_args()
+
+    estagios = list(args.estagios)
+    if args.ingestao and "ingestao" not in estagios:
+        estagios.append("ingestao")
+
+    resultado = executar_benchmark(args.tamanhos, estagios, args.semente, args.repeticoes)
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+        print(f"Resultados gravados em {args.salvar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        regressoes = comparar(resultado, base, args.tolerancia)
+        if regressoes:
+            print("Regressões encontradas: " + "; ".join(regressoes))
+            sys.exit(1)
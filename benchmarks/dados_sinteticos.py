@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Registros sintéticos já processados (linhas da tabela registros)
+Gera os atendimentos direto em DataFrame, sem passar pelo parser, com
+cardinalidades próximas das reais: poucos técnicos com carga desigual,
+clientes com distribuição de cauda longa, uma OS por bloco (dividida entre
+os técnicos do atendimento), dezenas de versões e textos repetidos.
+Usado pelo `reset_database.py --popular` para montar bases de teste.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.gerador_logs import CLIENTES, COMPLEMENTOS, FRASES
+
+# Proporção de cada tipo (soma 1); o restante das regras é raro
+TIPOS = {
+    "Erro": 0.30,
+    "Treinamento": 0.16,
+    "Rotina": 0.14,
+    "Fiscal": 0.10,
+    "Instalação": 0.07,
+    "Backup": 0.05,
+    "Não Identificado": 0.18,
+}
+SOBRENOMES_CLIENTES = [
+    "SILVA", "SANTOS", "OLIVEIRA", "SOUZA", "LIMA", "PEREIRA", "COSTA", "RODRIGUES",
+    "ALMEIDA", "NASCIMENTO", "CARVALHO", "ARAUJO", "RIBEIRO", "MARTINS", "ROCHA",
+    "CENTRO", "NORTE", "SUL", "AVENIDA", "BAIRRO NOVO", "MATRIZ", "FILIAL 2",
+]
+# Fração de atendimentos sem linha "Internews:"
+SEM_VERSAO = 0.3
+
+
+def nomes_clientes(quantidade: int, semente: int = 42) -> List[str]:
+    """Nomes de clientes distintos no formato dos logs (ramo + complemento + número)"""
+    aleatorio = np.random.default_rng(semente)
+    ramos = [cliente.split()[0] for cliente in CLIENTES]
+    nomes = []
+    for i in range(quantidade):
+        ramo = ramos[aleatorio.integers(len(ramos))]
+        sobrenome = SOBRENOMES_CLIENTES[aleatorio.integers(len(SOBRENOMES_CLIENTES))]
+        nomes.append(f"{ramo} {sobrenome} {i + 1:04d}")
+    return nomes
+
+
+def _pesos_zipf(quantidade: int, expoente: float) -> np.ndarray:
+    pesos = 1.0 / np.arange(1, quantidade + 1) ** expoente
+    return pesos / pesos.sum()
+
+
+def gerar_registros(
+    quantidade: int,
+    clientes: List[str],
+    tecnicos: List[str],
+    mes: date,
+    aleatorio: np.random.Generator,
+    versoes: int = 60
+) -> pd.DataFrame:
+    """
+    `quantidade` registros de atendimentos de um mês, com as colunas da
+    tabela registros (menos id e analise_id)
+    """
+    # Blocos com 1-3 técnicos: cada bloco vira 1-3 registros com a mesma OS
+    tecnicos_por_bloco = aleatorio.choice([1, 2, 3], size=quantidade, p=[0.70, 0.25, 0.05])
+    bloco = np.repeat(np.arange(quantidade), tecnicos_por_bloco)[:quantidade]
+    blocos = bloco[-1] + 1
+
+    os_bloco = aleatorio.integers(100000, 1000000, size=blocos)
+    cliente_bloco = aleatorio.choice(len(clientes), size=blocos, p=_pesos_zipf(len(clientes), 1.1))
+    dia_bloco = aleatorio.integers(1, 29, size=blocos)
+    tipo_bloco = aleatorio.choice(len(TIPOS), size=blocos, p=list(TIPOS.values()))
+    versao_bloco = aleatorio.choice(versoes, size=blocos, p=_pesos_zipf(versoes, 0.8))
+    sem_versao = aleatorio.random(blocos) < SEM_VERSAO
+
+    tecnico = aleatorio.choice(len(tecnicos), size=quantidade, p=_pesos_zipf(len(tecnicos), 0.6))
+
+    # Textos: frase da categoria + complemento (poucos textos distintos, como nos logs)
+    frases = [frase for lista in FRASES.values() for frase in lista]
+    textos = np.array([f"{frase} {complemento}" for frase in frases for complemento in COMPLEMENTOS], dtype=object)
+    texto_bloco = aleatorio.integers(len(textos), size=blocos)
+
+    nomes_versoes = np.array([f"{4 + i // 30}.{(i // 10) % 3}.{i % 10}" for i in range(versoes)], dtype=object)
+    versao = nomes_versoes[versao_bloco].copy()
+    versao[sem_versao] = ""
+
+    datas = np.array([f"{dia:02d}/{mes.month:02d}/{mes.year}" for dia in range(1, 29)], dtype=object)
+    nomes_tecnicos = np.array(tecnicos, dtype=object)
+
+    return pd.DataFrame({
+        "data": datas[dia_bloco - 1][bloco],
+        "os": pd.Series(os_bloco[bloco]).map("{:06d}".format).to_numpy(dtype=object),
+        "cliente": np.asarray(clientes, dtype=object)[cliente_bloco][bloco],
+        "tecnico": nomes_tecnicos[tecnico],
+        "tipo": np.array(list(TIPOS), dtype=object)[tipo_bloco][bloco],
+        "versao_internews": versao[bloco],
+        "detalhe_atendimento": textos[texto_bloco][bloco],
+        "suporte_original": nomes_tecnicos[tecnico],
+        "data_criacao": datetime.now(),
+    })
+
+
+def meses_anteriores(quantidade: int, referencia: date = None) -> List[date]:
+    """Primeiro dia dos `quantidade` meses até o mês de referência (mais antigo primeiro)"""
+    mes = (referencia or date.today()).replace(day=1)
+    meses = []
+    for _ in range(quantidade):
+        meses.append(mes)
+        mes = (mes - timedelta(days=1)).replace(day=1)
+    return meses[::-1]
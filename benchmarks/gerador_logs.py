@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Gerador determinístico de logs sintéticos no formato InterNews
+Produz blocos "XXXXXX XXXXXX" com cliente [SAMUEL, linha de Suporte com um
+ou mais técnicos (incluindo apelidos e erros de digitação), textos longos de
+Atendimento e versão "Internews:" opcional
+
+Uso:
+    python -m benchmarks.gerador_logs 100MB saida.txt [--semente 42]
+"""
+
+import argparse
+import random
+import re
+from typing import Iterator, TextIO
+
+# Fragmentos de técnicos como aparecem nos logs reais
+TECNICOS_LOG = [
+    "Claudia", "Liliane", "Gustavo Almeida", "Gustavo Kauan", "gutavo", "Alcelio",
+    "Jarbas", "Fred", "Daniela", "Eulis", "Gabriel", "Gilvan", "Luiz", "Luis",
+    "Eduardo", "Ricardo", "Lucas", "Correa", "Ludmilla",
+]
+# Nomes fora do mapa (viram técnicos "fantasmas" no parser)
+TECNICOS_DESCONHECIDOS = ["Fulano", "Beltrano", "Ciclano Souza"]
+SEPARADORES = [" e ", "/", " & ", ", "]
+
+CLIENTES = [
+    "MERCADO BOM PRECO", "FARMACIA SAO JOSE", "AUTO PECAS CENTRAL", "PADARIA PAO QUENTE",
+    "LOJA DAS TINTAS", "DISTRIBUIDORA NORTE", "POSTO AVENIDA", "CLINICA VIDA",
+    "MATERIAIS DE CONSTRUCAO SILVA", "RESTAURANTE SABOR", "OTICA VISAO", "PET SHOP AMIGO",
+]
+
+FRASES = {
+    "Erro": [
+        "Cliente relatou erro ao emitir nota fiscal eletrônica",
+        "Erro de conexão com o servidor ao abrir o caixa",
+        "Sistema apresentou erro na importação do XML",
+    ],
+    "Treinamento": [
+        "Realizado treinamento do módulo financeiro com a equipe",
+        "Treinamento de cadastro de produtos e tabelas de preço",
+    ],
+    "Rotina": [
+        "Rotina de backup configurada e validada",
+        "Executada rotina de fechamento mensal",
+    ],
+    "Outro": [
+        "Ajuste de configuração da impressora fiscal",
+        "Dúvida sobre relatório de vendas esclarecida",
+        "Atualização de cadastro do cliente",
+    ],
+}
+COMPLEMENTOS = [
+    "Verificado o ambiente do cliente e orientado o usuário.",
+    "Acessado remotamente para conferir as configurações.",
+    "Cliente retornará caso o problema persista.",
+    "Conferidos os parâmetros do sistema e reiniciado o serviço.",
+]
+
+# Texto gerado não pode conter a sequência que inicia um novo bloco
+_RE_INICIO_BLOCO = re.compile(r"\d{6}\s+\d{6}")
+
+
+def gerar_bloco(aleatorio: random.Random, sequencia: int, texto_longo: float = 0.2, com_versao: float = 0.7) -> str:
+    """Gera um bloco de atendimento"""
+    os_numero = aleatorio.randint(100000, 999999)
+    data = f"{aleatorio.randint(1, 28):02d}/{aleatorio.randint(1, 12):02d}/{aleatorio.choice([2024, 2025])}"
+    cliente = aleatorio.choice(CLIENTES)
+
+    quantidade = aleatorio.choices([1, 2, 3], weights=[70, 25, 5])[0]
+    nomes = [
+        aleatorio.choice(TECNICOS_DESCONHECIDOS if aleatorio.random() < 0.03 else TECNICOS_LOG)
+        for _ in range(quantidade)
+    ]
+    suporte = nomes[0]
+    for nome in nomes[1:]:
+        suporte += aleatorio.choice(SEPARADORES) + nome
+
+    categoria = aleatorio.choices(list(FRASES), weights=[35, 20, 20, 25])[0]
+    texto = aleatorio.choice(FRASES[categoria])
+    repeticoes = aleatorio.randint(5, 40) if aleatorio.random() < texto_longo else aleatorio.randint(0, 2)
+    texto += " " + " ".join(aleatorio.choice(COMPLEMENTOS) for _ in range(repeticoes))
+
+    linhas = [
+        f"{os_numero:06d} {sequencia % 1000000:06d} {data}",
+        f"[SAMUEL {cliente}",
+        f"Suporte: {suporte}",
+        f"Atendimento realizado: {_RE_INICIO_BLOCO.sub('', texto)}",
+    ]
+    if aleatorio.random() < com_versao:
+        linhas.append(f"Internews: {aleatorio.randint(3, 5)}.{aleatorio.randint(0, 9)}.{aleatorio.randint(0, 20)}")
+    return "\n".join(linhas) + "\n\n"
+
+
+def iterar_blocos(tamanho_bytes: int, semente: int = 42, **opcoes) -> Iterator[str]:
+    """Gera blocos até atingir aproximadamente `tamanho_bytes` (UTF-8)"""
+    aleatorio = random.Random(semente)
+    total = 0
+    sequencia = 0
+    while total < tamanho_bytes:
+        sequencia += 1
+        bloco = gerar_bloco(aleatorio, sequencia, **opcoes)
+        total += len(bloco.encode("utf-8"))
+        yield bloco
+
+
+def gerar_texto(tamanho_bytes: int, semente: int = 42, **opcoes) -> str:
+    """Log sintético completo em memória"""
+    return "".join(iterar_blocos(tamanho_bytes, semente, **opcoes))
+
+
+def gravar_log(destino: TextIO, tamanho_bytes: int, semente: int = 42, **opcoes) -> int:
+    """Grava o log em `destino` em partes e retorna a quantidade de blocos"""
+    quantidade = 0
+    buffer = []
+    for bloco in iterar_blocos(tamanho_bytes, semente, **opcoes):
+        buffer.append(bloco)
+        quantidade += 1
+        if len(buffer) >= 10_000:
+            destino.write("".join(buffer))
+            buffer = []
+    destino.write("".join(buffer))
+    return quantidade
+
+
+def interpretar_tamanho(texto: str) -> int:
+    """Converte "512KB", "10MB", "1GB" ou um número de bytes"""
+    texto = texto.strip().upper()
+    for sufixo, fator in (("GB", 1024 ** 3), ("MB", 1024 ** 2), ("KB", 1024), ("B", 1)):
+        if texto.endswith(sufixo):
+            return int(float(texto[:-len(sufixo)]) * fator)
+    return int(texto)
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Gera logs InterNews sintéticos")
+    argumentos.add_argument("tamanho", help="Tamanho aproximado (ex.: 1MB, 100MB, 1GB)")
+    argumentos.add_argument("saida", help="Arquivo de saída")
+    argumentos.add_argument("--semente", type=int, default=42)
+    argumentos.add_argument("--texto-longo", type=float, default=0.2, help="Fração de atendimentos com texto longo")
+    argumentos.add_argument("--com-versao", type=float, default=0.7, help="Fração de blocos com linha Internews:")
+    args = argumentos.parse_args()
+
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        blocos = gravar_log(
+            arquivo,
+            interpretar_tamanho(args.tamanho),
+            args.semente,
+            texto_longo=args.texto_longo,
+            com_versao=args.com_versao
+        )
+    print(f"{blocos} blocos gravados em {args.saida}")
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de leitura das consultas do GerenciadorBancoDados
+Cache por processo (cachetools.TTLCache) na frente dos métodos de leitura,
+com TTL e tamanho por método. Cada gravação incrementa a geração das tabelas
+que altera; a geração faz parte da chave, então as entradas dependentes
+deixam de ser usadas na hora. Outros processos só enxergam a mudança
+quando o TTL expira. O cache guarda e devolve cópias dos resultados, para
+que uma sessão que altere o que recebeu não afete as outras.
+"""
+
+import functools
+import inspect
+import os
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Tuple
+
+import pandas as pd
+from cachetools import TTLCache
+from sqlalchemy import inspect as inspecionar
+
+# Multiplicador global dos TTLs (0 desliga o cache)
+ESCALA_TTL = float(os.getenv("INTERNEWS_CACHE_CONSULTAS_TTL", "1"))
+
+# Leitura -> (tabelas das quais depende, TTL em segundos, máximo de entradas)
+LEITURAS = {
+    "obter_analises": (("analises",), 300, 16),
+    "obter_analise_por_id": (("analises",), 300, 256),
+    "obter_historico_completo": (("analises",), 300, 4),
+    "filtrar_analises": (("analises",), 300, 64),
+    "obter_estatisticas_gerais": (("analises", "registros"), 120, 4),
+    "obter_registros_por_analise": (("registros",), 120, 32),
+    "obter_registros_por_tecnico": (("registros",), 120, 128),
+    "obter_registros_por_cliente": (("registros",), 120, 128),
+    "obter_tendencia_tecnicos": (("resumos_mensais",), 300, 8),
+    "obter_tendencia_clientes": (("resumos_mensais",), 300, 8),
+    "comparar_analises": (("analises", "registros", "resumos_mensais"), 300, 16),
+}
+
+# Gravação -> tabelas que altera
+GRAVACOES = {
+    "salvar_analise": ("analises",),
+    "atualizar_analise": ("analises",),
+    "atualizar_resumo_analise": ("analises", "resumos_mensais"),
+    "salvar_registros": ("registros",),
+    "aplicar_alteracoes_registros": ("analises", "registros", "resumos_mensais"),
+    "reclassificar_analise": ("analises", "registros", "resumos_mensais"),
+    "deletar_analise": ("analises", "registros", "resumos_mensais"),
+    "limpar_analises_antigas": ("analises", "registros", "resumos_mensais"),
+    "arquivar_analise": ("analises", "registros"),
+    "restaurar_analise": ("analises", "registros"),
+    "atualizar_resumos_mensais": ("resumos_mensais",),
+    "reconstruir_resumos_mensais": ("resumos_mensais",),
+}
+
+
+def _congelar(valor):
+    """Versão hashable de argumentos em lista/conjunto/dicionário (ex.: filtro de versões)"""
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(item) for item in valor)
+    if isinstance(valor, (set, frozenset)):
+        return frozenset(_congelar(item) for item in valor)
+    if isinstance(valor, dict):
+        return tuple(sorted((chave, _congelar(item)) for chave, item in valor.items()))
+    return valor
+
+
+# Valores devolvidos sem cópia
+_IMUTAVEIS = (str, int, float, bool, bytes, date, datetime, Decimal, type(None))
+
+
+def _copiar(valor):
+    """
+    Cópia independente de um resultado: listas, tuplas, dicionários,
+    DataFrames e objetos do ORM (como instâncias transientes só com as
+    colunas carregadas). Valores imutáveis são devolvidos como estão.
+    """
+    if isinstance(valor, _IMUTAVEIS):
+        return valor
+    if isinstance(valor, list):
+        return [_copiar(item) for item in valor]
+    if isinstance(valor, tuple):
+        return tuple(_copiar(item) for item in valor)
+    if isinstance(valor, dict):
+        return {chave: _copiar(item) for chave, item in valor.items()}
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        return valor.copy()
+    estado = inspecionar(valor, raiseerr=False)
+    if estado is not None and hasattr(estado, "mapper"):
+        # Como o carregamento do ORM: preenche o __dict__ sem eventos de atributo
+        copia = estado.mapper.class_manager.new_instance()
+        copia.__dict__.update({
+            chave: item if isinstance(item, _IMUTAVEIS) else _copiar(item)
+            for chave, item in estado.dict.items()
+            if chave != "_sa_instance_state"
+        })
+        return copia
+    return valor
+
+
+class CacheConsultas:
+    """TTLCache por método de leitura, com gerações por tabela e contadores"""
+
+    def __init__(self, leituras: Dict = LEITURAS, escala_ttl: float = ESCALA_TTL):
+        self._lock = threading.Lock()
+        self._dependencias = {nome: tabelas for nome, (tabelas, _, _) in leituras.items()}
+        self._caches = {
+            nome: TTLCache(maxsize=tamanho, ttl=ttl * escala_ttl)
+            for nome, (_, ttl, tamanho) in leituras.items()
+            if ttl * escala_ttl > 0
+        }
+        self._geracoes = {}
+        self.acertos = {nome: 0 for nome in leituras}
+        self.falhas = {nome: 0 for nome in leituras}
+
+    def _geracao(self, metodo: str) -> Tuple[int, ...]:
+        return tuple(self._geracoes.get(t, 0) for t in self._dependencias[metodo])
+
+    def _chave(self, metodo: str, args: Tuple, kwargs: Dict) -> Tuple:
+        return (
+            self._geracao(metodo),
+            tuple(_congelar(valor) for valor in args),
+            tuple(sorted((nome, _congelar(valor)) for nome, valor in kwargs.items())),
+        )
+
+    def buscar(self, metodo: str, args: Tuple, kwargs: Dict):
+        """Retorna (encontrado, valor, chave); a chave é usada em `guardar`"""
+        with self._lock:
+            chave = self._chave(metodo, args, kwargs)
+            cache = self._caches.get(metodo)
+            if cache is not None and chave in cache:
+                self.acertos[metodo] += 1
+                valor = cache[chave]
+            else:
+                self.falhas[metodo] += 1
+                return False, None, chave
+        return True, _copiar(valor), chave
+
+    def guardar(self, metodo: str, chave: Tuple, resultado):
+        """Guarda (uma cópia de) resultados bem-sucedidos (sucesso, ...)"""
+        if not (isinstance(resultado, tuple) and resultado and resultado[0] is True):
+            return
+        if metodo not in self._caches:
+            return
+        copia = _copiar(resultado)
+        with self._lock:
+            cache = self._caches.get(metodo)
+            # Chave de uma geração antiga: uma gravação terminou durante a consulta
+            if cache is not None and chave[0] == self._geracao(metodo):
+                cache[chave] = copia
+
+    def invalidar(self, tabelas: Iterable[str]):
+        """Incrementa a geração das tabelas e descarta as entradas dependentes"""
+        tabelas = set(tabelas)
+        with self._lock:
+            for tabela in tabelas:
+                self._geracoes[tabela] = self._geracoes.get(tabela, 0) + 1
+            for metodo, dependencias in self._dependencias.items():
+                if metodo in self._caches and tabelas & set(dependencias):
+                    self._caches[metodo].clear()
+
+    def limpar(self):
+        """Remove todas as entradas (os contadores são mantidos)"""
+        with self._lock:
+            for cache in self._caches.values():
+                cache.clear()
+
+    def estatisticas(self) -> Dict[str, Dict]:
+        """Contadores por método para exibição"""
+        with self._lock:
+            saida = {}
+            for metodo in self._dependencias:
+                consultas = self.acertos[metodo] + self.falhas[metodo]
+                cache = self._caches.get(metodo)
+                saida[metodo] = {
+                    "itens": len(cache) if cache is not None else 0,
+                    "maximo": cache.maxsize if cache is not None else 0,
+                    "ttl": cache.ttl if cache is not None else 0,
+                    "acertos": self.acertos[metodo],
+                    "falhas": self.falhas[metodo],
+                    "taxa_acerto": self.acertos[metodo] / consultas if consultas else 0.0,
+                }
+            return saida
+
+
+CACHE_CONSULTAS = CacheConsultas()
+
+
+def _leitura(metodo: str, funcao, cache: CacheConsultas):
+    if inspect.iscoroutinefunction(funcao):
+        @functools.wraps(funcao)
+        async def envoltorio_async(*args, **kwargs):
+            encontrado, valor, chave = cache.buscar(metodo, args, kwargs)
+            if encontrado:
+                return valor
+            resultado = await funcao(*args, **kwargs)
+            cache.guardar(metodo, chave, resultado)
+            return resultado
+        return envoltorio_async
+
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        encontrado, valor, chave = cache.buscar(metodo, args, kwargs)
+        if encontrado:
+            return valor
+        resultado = funcao(*args, **kwargs)
+        cache.guardar(metodo, chave, resultado)
+        return resultado
+    return envoltorio
+
+
+def _gravacao(tabelas: Tuple[str, ...], funcao, cache: CacheConsultas):
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            cache.invalidar(tabelas)
+    return envoltorio
+
+
+def aplicar_cache(cls, cache: CacheConsultas = CACHE_CONSULTAS):
+    """Coloca o cache na frente das leituras e a invalidação nas gravações da classe"""
+    for nome, atributo in list(vars(cls).items()):
+        if not isinstance(atributo, staticmethod):
+            continue
+        funcao = atributo.__func__
+        if nome in LEITURAS:
+            setattr(cls, nome, staticmethod(_leitura(nome, funcao, cache)))
+        elif nome in GRAVACOES:
+            setattr(cls, nome, staticmethod(_gravacao(GRAVACOES[nome], funcao, cache)))
+    return cls
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Cache de visões derivadas da aplicação InterNews
+Memoiza DataFrames filtrados, agregados e figuras por (hash do upload, filtros)
+com remoção LRU limitada por memória
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable
+
+import pandas as pd
+
+# Limite padrão de memória do cache (MB)
+LIMITE_CACHE_MB = int(os.getenv("INTERNEWS_CACHE_MB", "256"))
+
+
+def hash_uploads(arquivos: Iterable) -> str:
+    """Hash do conteúdo (e nome) de todos os arquivos enviados"""
+    h = hashlib.sha256()
+    for arquivo in arquivos:
+        h.update(arquivo.name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(arquivo.getvalue())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def hash_dataframe(df: pd.DataFrame) -> str:
+    """Hash do conteúdo de um DataFrame (colunas e valores)"""
+    h = hashlib.sha256()
+    h.update("\0".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def estimar_tamanho(valor: Any) -> int:
+    """Estimativa em bytes do espaço ocupado por um valor do cache"""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(deep=True))
+    if isinstance(valor, (bytes, bytearray, str)):
+        return sys.getsizeof(valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(estimar_tamanho(v) for v in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(estimar_tamanho(v) for v in valor)
+    if hasattr(valor, "to_plotly_json"):
+        return estimar_tamanho(valor.to_plotly_json())
+    return sys.getsizeof(valor)
+
+
+class CacheVisoes:
+    """Cache LRU thread-safe limitado por bytes, com contadores de acerto/falha"""
+
+    def __init__(self, limite_bytes: int = LIMITE_CACHE_MB * 1024 * 1024):
+        self.limite_bytes = limite_bytes
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def obter_ou_calcular(self, chave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """Retorna o valor em cache para a chave ou o calcula e armazena"""
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave][0]
+            self.falhas += 1
+
+        valor = calcular()
+        self.armazenar(chave, valor)
+        return valor
+
+    def armazenar(self, chave: Hashable, valor: Any):
+        """Armazena um valor, removendo os menos usados se exceder o limite"""
+        tamanho = estimar_tamanho(valor)
+        if tamanho > self.limite_bytes:
+            return
+
+        with self._lock:
+            if chave in self._itens:
+                self.bytes_usados -= self._itens.pop(chave)[1]
+            self._itens[chave] = (valor, tamanho)
+            self.bytes_usados += tamanho
+
+            while self.bytes_usados > self.limite_bytes and self._itens:
+                _, (_, tamanho_removido) = self._itens.popitem(last=False)
+                self.bytes_usados -= tamanho_removido
+                self.remocoes += 1
+
+    def invalidar(self, predicado: Callable[[Hashable], bool]) -> int:
+        """Remove as entradas cujas chaves satisfazem o predicado"""
+        with self._lock:
+            chaves = [chave for chave in self._itens if predicado(chave)]
+            for chave in chaves:
+                self.bytes_usados -= self._itens.pop(chave)[1]
+            return len(chaves)
+
+    def limpar(self):
+        """Remove todas as entradas (os contadores são mantidos)"""
+        with self._lock:
+            self._itens.clear()
+            self.bytes_usados = 0
+
+    def estatisticas(self) -> Dict:
+        """Contadores do cache para exibição"""
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "bytes_usados": self.bytes_usados,
+                "limite_bytes": self.limite_bytes,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "remocoes": self.remocoes,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            }
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Classificação de atendimentos por regras configuráveis
+Regras de palavras-chave/regex com prioridade, lidas de um arquivo JSON.
+Classifica um texto ou uma Series inteira de uma vez, com o RE2 do
+pyarrow em vez de um loop Python por atendimento. Os dois caminhos veem o
+texto em NFC e a mesma fronteira de palavra, então dão o mesmo tipo.
+
+Reclassificar análises gravadas com as regras atuais:
+    python classificacao.py 12 15        (IDs das análises)
+    python classificacao.py --todas [--regras outro.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+ARQUIVO_REGRAS = os.getenv(
+    "INTERNEWS_REGRAS_CLASSIFICACAO",
+    str(Path(__file__).with_name("regras_classificacao.json"))
+)
+TIPO_PADRAO = "Não Identificado"
+
+
+def _variantes_acentuadas() -> Dict[str, str]:
+    """Letra sem acento -> letras latinas acentuadas que se reduzem a ela"""
+    variantes = {}
+    for codigo in range(0xC0, 0x180):
+        letra = chr(codigo).lower()
+        base = unicodedata.normalize('NFKD', letra).encode('ascii', 'ignore').decode('ascii')
+        if len(letra) == 1 and len(base) == 1 and base.isalpha() and letra != base:
+            variantes[base] = variantes.get(base, "") + letra
+    return variantes
+
+
+_VARIANTES = _variantes_acentuadas()
+
+# Caracteres de palavra explícitos: o \w do RE2 é só ASCII, o do `re` é Unicode
+_CARACTERES_PALAVRA = "0-9A-Za-z_\u00C0-\u00D6\u00D8-\u00F6\u00F8-\u017F"
+# \b portátil (sem lookaround, que o RE2 não tem): início/fim do texto ou um não-letra
+FRONTEIRA = f"(?:^|$|[^{_CARACTERES_PALAVRA}])"
+_RE_FRONTEIRA = re.compile(r"\\\\|\\b")
+
+
+def trocar_fronteiras(regex: str) -> str:
+    """Troca \\b pela FRONTEIRA, que casa igual no `re` e no RE2 (ex.: "\\bsat\\b")"""
+    return _RE_FRONTEIRA.sub(lambda m: m.group() if m.group() == "\\\\" else FRONTEIRA, regex)
+
+
+def padrao_palavra(palavra: str) -> str:
+    """
+    Expressão que encontra a palavra com ou sem acentos (ex.: "instalacao"
+    casa "Instalação"); combinada com ignore_case dispensa normalizar o texto
+    """
+    palavra = unicodedata.normalize('NFKD', palavra).encode('ascii', 'ignore').decode('ascii').lower()
+    return "".join(
+        f"[{letra}{_VARIANTES[letra]}]" if letra in _VARIANTES else re.escape(letra)
+        for letra in palavra
+    )
+
+
+@dataclass(frozen=True)
+class Regra:
+    """
+    Tipo atribuído quando o texto contém uma das palavras ou casa uma das
+    regex. Regex são aplicadas ao texto (em NFC) sem diferenciar maiúsculas
+    e devem usar a sintaxe comum ao `re` e ao RE2 (sem lookaround); \\b só
+    pode marcar o início ou o fim de uma palavra.
+    """
+    tipo: str
+    prioridade: int
+    palavras: Tuple[str, ...] = ()
+    regex: Tuple[str, ...] = ()
+
+    def padrao(self) -> str:
+        return "|".join([padrao_palavra(p) for p in self.palavras] + [trocar_fronteiras(r) for r in self.regex])
+
+
+class ClassificadorTipos:
+    """
+    Compila cada regra em uma única expressão (palavras e regex em
+    alternância) e aplica as regras em ordem de prioridade. Em uma Series,
+    cada regra é uma passada do RE2 (pyarrow.compute) só sobre os textos
+    distintos que ainda não foram classificados.
+    """
+
+    def __init__(self, regras: List[Regra], padrao: str = TIPO_PADRAO):
+        self.regras = sorted((r for r in regras if r.palavras or r.regex), key=lambda r: -r.prioridade)
+        self.padrao = padrao
+        self.expressoes = [r.padrao() for r in self.regras]
+        self._compiladas = [re.compile(e, re.IGNORECASE) for e in self.expressoes]
+
+    @classmethod
+    def carregar(cls, caminho: str = ARQUIVO_REGRAS) -> "ClassificadorTipos":
+        """Lê as regras de um arquivo JSON"""
+        with open(caminho, encoding="utf-8") as arquivo:
+            config = json.load(arquivo)
+        regras = [
+            Regra(
+                tipo=item["tipo"],
+                prioridade=int(item.get("prioridade", 0)),
+                palavras=tuple(item.get("palavras", ())),
+                regex=tuple(item.get("regex", ())),
+            )
+            for item in config.get("regras", [])
+        ]
+        return cls(regras, config.get("padrao", TIPO_PADRAO))
+
+    def classificar(self, texto: str) -> str:
+        """Tipo de um único texto"""
+        if not isinstance(texto, str):
+            return self.padrao
+        texto = unicodedata.normalize("NFC", texto)
+        for regra, expressao in zip(self.regras, self._compiladas):
+            if expressao.search(texto):
+                return regra.tipo
+        return self.padrao
+
+    def classificar_serie(self, textos: pd.Series) -> pd.Series:
+        """Tipo de cada texto da Series, com o mesmo índice"""
+        # Técnicos do mesmo bloco repetem o texto: cada texto distinto é avaliado uma vez
+        codigos, distintos = pd.factorize(textos.fillna(""), sort=False)
+        # Texto copiado em NFD ("c" + cedilha combinante) passa a casar os acentos;
+        # pc.utf8_normalize não serve: no pyarrow 22 devolve NFD para qualquer forma
+        distintos = [unicodedata.normalize("NFC", texto) for texto in distintos]
+        valores = pa.array(distintos, type=pa.large_string())
+
+        tipos = np.full(len(distintos), self.padrao, dtype=object)
+        pendentes = np.arange(len(distintos))
+        for regra, expressao in zip(self.regras, self.expressoes):
+            if len(pendentes) == 0:
+                break
+            casou = pc.match_substring_regex(
+                valores.take(pendentes), expressao, ignore_case=True
+            ).to_numpy(zero_copy_only=False)
+            tipos[pendentes[casou]] = regra.tipo
+            pendentes = pendentes[~casou]
+
+        return pd.Series(tipos[codigos], index=textos.index)
+
+
+_carregado = {}
+
+
+def obter_classificador(caminho: str = ARQUIVO_REGRAS) -> ClassificadorTipos:
+    """Classificador do arquivo de regras, recarregado quando o arquivo muda"""
+    versao = os.stat(caminho).st_mtime_ns
+    if _carregado.get(caminho, (None,))[0] != versao:
+        _carregado[caminho] = (versao, ClassificadorTipos.carregar(caminho))
+    return _carregado[caminho][1]
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Reclassifica análises gravadas com as regras atuais")
+    argumentos.add_argument("analises", nargs="*", type=int, help="IDs das análises")
+    argumentos.add_argument("--todas", action="store_true", help="Reclassifica todas as análises")
+    argumentos.add_argument("--regras", default=ARQUIVO_REGRAS, help="Arquivo JSON de regras")
+    args = argumentos.parse_args()
+
+    from database_manager import GerenciadorBancoDados
+
+    classificador = ClassificadorTipos.carregar(args.regras)
+    ids = args.analises
+    if args.todas:
+        sucesso, analises = GerenciadorBancoDados.obter_analises(limite=None)
+        if not sucesso:
+            print(analises)
+            sys.exit(1)
+        ids = [analise.id for analise in analises]
+
+    falhas = 0
+    for analise_id in ids:
+        sucesso, msg, _ = GerenciadorBancoDados.reclassificar_analise(analise_id, classificador)
+        print(f"Análise {analise_id}: {msg}")
+        falhas += not sucesso
+    sys.exit(1 if falhas else 0)
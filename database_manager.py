@@ -4,10 +4,27 @@ Gerenciador de banco de dados para a aplicação InterNews
 Fornece métodos para CRUD de análises e registros
 """
 
-from models import obter_sessao, Analise, Registro, criar_tabelas
+from models import obter_sessao, Analise, Registro, ResumoMensalCliente, ResumoMensalTecnico, garantir_esquema
+from sqlalchemy import Boolean, String, and_, case, cast, delete, insert, literal, or_, select, update, func, distinct
+from instrumentacao import instrumentar_classe
+from cache_consultas import aplicar_cache
+import arquivamento
 from datetime import datetime
 from typing import List, Dict, Optional
 import json
+import pandas as pd
+
+# Colunas do DataFrame do parser -> campos da tabela registros
+COLUNAS_REGISTRO = {
+    "Data": "data",
+    "O.S": "os",
+    "Cliente": "cliente",
+    "Técnico": "tecnico",
+    "Tipo": "tipo",
+    "Versão Internews": "versao_internews",
+    "Detalhe Atendimento": "detalhe_atendimento",
+    "Suporte Original (Log)": "suporte_original",
+}
 
 
 class GerenciadorBancoDados:
@@ -15,9 +32,13 @@ class GerenciadorBancoDados:
     
     @staticmethod
     def inicializar():
-        """Inicializa o banco de dados criando as tabelas"""
+        """Inicializa o banco de dados criando as tabelas que faltarem (uma vez por processo)"""
         try:
-            criar_tabelas()
+            criou = garantir_esquema()
+            # Os resumos são mantidos a cada gravação; a reconstrução completa só
+            # roda quando as tabelas acabaram de ser criadas ou estão vazias
+            if criou or GerenciadorBancoDados._resumos_mensais_vazios():
+                GerenciadorBancoDados.reconstruir_resumos_mensais()
             return True, "Banco de dados inicializado com sucesso"
         except Exception as e:
             return False, f"Erro ao inicializar banco de dados: {str(e)}"
@@ -90,6 +111,24 @@ class GerenciadorBancoDados:
         except Exception as e:
             return False, f"Erro ao obter análise: {str(e)}"
     
+    @staticmethod
+    def _formatar_historico(analise: Analise) -> Dict:
+        """Item do histórico exibido na barra lateral"""
+        return {
+            "id": analise.id,
+            "timestamp": analise.timestamp.isoformat(),
+            "arquivo": analise.nome_arquivo,
+            "registros": analise.total_registros,
+            "tecnicos_unicos": analise.tecnicos_unicos,
+            "clientes_unicos": analise.clientes_unicos,
+            "os_unicas": analise.os_unicas,
+            "tipos": analise.tipos_distribuicao or {},
+            "versoes": analise.versoes_utilizadas or {},
+            "usuario": analise.usuario,
+            "notas": analise.notas,
+            "arquivada": bool(analise.arquivo_parquet)
+        }
+    
     @staticmethod
     def obter_historico_completo() -> tuple:
         """Obtém o histórico completo de análises formatado para exibição"""
@@ -99,26 +138,89 @@ class GerenciadorBancoDados:
             if not sucesso:
                 return False, analises
             
-            historico = []
-            for analise in analises:
-                historico.append({
-                    "id": analise.id,
-                    "timestamp": analise.timestamp.isoformat(),
-                    "arquivo": analise.nome_arquivo,
-                    "registros": analise.total_registros,
-                    "tecnicos_unicos": analise.tecnicos_unicos,
-                    "clientes_unicos": analise.clientes_unicos,
-                    "os_unicas": analise.os_unicas,
-                    "tipos": analise.tipos_distribuicao or {},
-                    "versoes": analise.versoes_utilizadas or {},
-                    "usuario": analise.usuario,
-                    "notas": analise.notas
-                })
+            historico = [GerenciadorBancoDados._formatar_historico(analise) for analise in analises]
             
             return True, historico
         except Exception as e:
             return False, f"Erro ao obter histórico: {str(e)}"
     
+    @staticmethod
+    def _caminho_chave(chave: str) -> str:
+        """Caminho JSON de uma chave qualquer ("4.2.0", "Não Identificado"...)"""
+        return "$." + json.dumps(chave, ensure_ascii=False)
+    
+    @staticmethod
+    def _condicao_distribuicao(dialeto: str, coluna, chave: str, minimo: int = None, maximo: int = None):
+        """
+        Condição "a chave existe na distribuição [com quantidade entre minimo
+        e maximo]". No PostgreSQL usa os operadores JSONB ? e @? (atendidos
+        pelo índice GIN); no SQLite, EXISTS sobre json_each, que decodifica as
+        chaves (o serializador grava "Não" como "N\\u00e3o", e os caminhos
+        de json_extract comparam o texto cru).
+        """
+        if dialeto == "postgresql":
+            from sqlalchemy.dialects.postgresql import JSONPATH
+            limites = []
+            if minimo is not None:
+                limites.append(f"@ >= {int(minimo)}")
+            if maximo is not None:
+                limites.append(f"@ <= {int(maximo)}")
+            if not limites:
+                return coluna.op("?", return_type=Boolean)(chave)
+            caminho = GerenciadorBancoDados._caminho_chave(chave)
+            return coluna.op("@?", return_type=Boolean)(
+                cast(f"{caminho} ? ({' && '.join(limites)})", JSONPATH)
+            )
+        
+        itens = func.json_each(coluna).table_valued("key", "value")
+        condicoes = [itens.c.key == chave]
+        if minimo is not None:
+            condicoes.append(itens.c.value >= int(minimo))
+        if maximo is not None:
+            condicoes.append(itens.c.value <= int(maximo))
+        return select(literal(1)).select_from(itens).where(and_(*condicoes)).exists()
+    
+    @staticmethod
+    def filtrar_analises(
+        tipo: str = None,
+        minimo: int = None,
+        maximo: int = None,
+        versoes: List[str] = None,
+        limite: int = 1000
+    ) -> tuple:
+        """
+        Histórico (mesmo formato de obter_historico_completo) só das análises
+        que atendem aos filtros, avaliados no banco sobre as distribuições:
+        - tipo: o tipo aparece em tipos_distribuicao, com quantidade entre
+          minimo e maximo quando informados (ex.: mais de 50 erros)
+        - versoes: alguma das versões aparece em versoes_utilizadas
+        """
+        sessao = obter_sessao()
+        try:
+            dialeto = sessao.get_bind().dialect.name
+            condicao = GerenciadorBancoDados._condicao_distribuicao
+            consulta = select(Analise)
+            
+            if tipo:
+                consulta = consulta.where(condicao(dialeto, Analise.tipos_distribuicao, tipo, minimo, maximo))
+            if versoes:
+                if dialeto == "postgresql":
+                    from sqlalchemy.dialects.postgresql import array
+                    consulta = consulta.where(
+                        Analise.versoes_utilizadas.op("?|", return_type=Boolean)(array(list(versoes)))
+                    )
+                else:
+                    consulta = consulta.where(or_(*[
+                        condicao(dialeto, Analise.versoes_utilizadas, versao) for versao in versoes
+                    ]))
+            
+            analises = sessao.scalars(consulta.order_by(Analise.timestamp.desc()).limit(limite)).all()
+            return True, [GerenciadorBancoDados._formatar_historico(analise) for analise in analises]
+        except Exception as e:
+            return False, f"Erro ao filtrar análises: {str(e)}"
+        finally:
+            sessao.close()
+    
     @staticmethod
     def atualizar_analise(analise_id: int, notas: str = None) -> tuple:
         """Atualiza informações de uma análise existente"""
@@ -139,6 +241,34 @@ class GerenciadorBancoDados:
         except Exception as e:
             return False, f"Erro ao atualizar análise: {str(e)}"
     
+    @staticmethod
+    def atualizar_resumo_analise(analise_id: int, resumo: Dict) -> tuple:
+        """Atualiza os totais agregados de uma análise (usado pela ingestão em lotes)"""
+        campos_permitidos = {
+            "total_registros", "tecnicos_unicos", "clientes_unicos",
+            "os_unicas", "tipos_distribuicao", "versoes_utilizadas"
+        }
+        try:
+            sessao = obter_sessao()
+            analise = sessao.query(Analise).filter(Analise.id == analise_id).first()
+            
+            if not analise:
+                sessao.close()
+                return False, "Análise não encontrada"
+            
+            for campo, valor in resumo.items():
+                if campo in campos_permitidos:
+                    setattr(analise, campo, valor)
+            
+            # Chamado ao fim da ingestão: registros completos, resumos mensais também
+            GerenciadorBancoDados._recalcular_resumos_mensais(sessao, analise_id)
+            
+            sessao.commit()
+            sessao.close()
+            return True, "Resumo da análise atualizado com sucesso"
+        except Exception as e:
+            return False, f"Erro ao atualizar resumo da análise: {str(e)}"
+    
     @staticmethod
     def deletar_analise(analise_id: int) -> tuple:
         """Deleta uma análise e seus registros associados"""
@@ -147,13 +277,17 @@ class GerenciadorBancoDados:
             
             # Deletar registros associados
             sessao.query(Registro).filter(Registro.analise_id == analise_id).delete()
+            GerenciadorBancoDados._remover_resumos_mensais(sessao, [analise_id])
             
-            # Deletar análise
+            # Deletar análise (e o arquivo Parquet, se arquivada)
             analise = sessao.query(Analise).filter(Analise.id == analise_id).first()
             if analise:
+                raiz = analise.arquivo_parquet
                 sessao.delete(analise)
                 sessao.commit()
                 sessao.close()
+                if raiz:
+                    arquivamento.remover_analise(analise_id, raiz)
                 return True, "Análise deletada com sucesso"
             else:
                 sessao.close()
@@ -165,37 +299,208 @@ class GerenciadorBancoDados:
     # OPERAÇÕES COM REGISTROS
     # ==========================================
     
+    @staticmethod
+    def _registro_para_linha(analise_id: int, reg: Dict) -> Dict:
+        """Converte um registro do parser em uma linha da tabela registros"""
+        linha = {"analise_id": analise_id}
+        for coluna, campo in COLUNAS_REGISTRO.items():
+            valor = reg.get(coluna, "")
+            linha[campo] = "" if valor is None else valor
+        return linha
+    
+    @staticmethod
+    def _inserir_registros(sessao, linhas: List[Dict]) -> List[int]:
+        """INSERT em lote das linhas; retorna os IDs gerados na ordem das linhas"""
+        if sessao.get_bind().dialect.name != "sqlite":
+            return list(sessao.scalars(
+                insert(Registro).returning(Registro.id, sort_by_parameter_order=True),
+                linhas
+            ).all())
+        
+        # SQLite executaria o INSERT ... RETURNING linha a linha: executemany
+        # direto no driver. A transação segura a trava de escrita e a tabela
+        # não usa AUTOINCREMENT, então os rowids novos são max(id)+1, +2, ...
+        colunas = list(linhas[0]) + ["data_criacao"]
+        agora = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        conexao = sessao.connection()
+        conexao.exec_driver_sql(
+            f"INSERT INTO registros ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})",
+            [tuple(linha[c] for c in colunas[:-1]) + (agora,) for linha in linhas]
+        )
+        ultimo = conexao.exec_driver_sql("SELECT last_insert_rowid()").scalar()
+        return list(range(ultimo - len(linhas) + 1, ultimo + 1))
+    
     @staticmethod
     def salvar_registros(analise_id: int, registros: List[Dict]) -> tuple:
-        """Salva múltiplos registros de atendimentos"""
+        """Salva múltiplos registros em um único INSERT em lote e retorna os IDs gerados"""
         try:
+            if not registros:
+                return True, "0 registros salvos com sucesso", []
+            
             sessao = obter_sessao()
             
-            for reg in registros:
-                registro = Registro(
-                    analise_id=analise_id,
-                    data=reg.get("Data", ""),
-                    os=reg.get("O.S", ""),
-                    cliente=reg.get("Cliente", ""),
-                    tecnico=reg.get("Técnico", ""),
-                    tipo=reg.get("Tipo", ""),
-                    versao_internews=reg.get("Versão Internews", ""),
-                    detalhe_atendimento=reg.get("Detalhe Atendimento", ""),
-                    suporte_original=reg.get("Suporte Original (Log)", "")
-                )
-                sessao.add(registro)
+            linhas = [
+                GerenciadorBancoDados._registro_para_linha(analise_id, reg)
+                for reg in registros
+            ]
+            ids = GerenciadorBancoDados._inserir_registros(sessao, linhas)
             
             sessao.commit()
             sessao.close()
-            return True, f"{len(registros)} registros salvos com sucesso"
+            return True, f"{len(registros)} registros salvos com sucesso", list(ids)
         except Exception as e:
-            return False, f"Erro ao salvar registros: {str(e)}"
+            return False, f"Erro ao salvar registros: {str(e)}", None
+    
+    @staticmethod
+    def aplicar_alteracoes_registros(
+        atualizados: Dict[int, Dict],
+        inseridos: List[Dict],
+        removidos: List[int],
+        analise_id_novos: int = None
+    ) -> tuple:
+        """
+        Aplica em uma única transação as alterações feitas no editor:
+        UPDATE por chave primária, INSERT dos novos e DELETE dos removidos.
+        Os totais das análises afetadas são recalculados na mesma transação.
+        Retorna (sucesso, mensagem, ids dos registros inseridos).
+        """
+        if inseridos and analise_id_novos is None:
+            return False, "Informe a análise que receberá os registros novos", None
+        
+        sessao = obter_sessao()
+        try:
+            ids_afetados = set(atualizados) | set(removidos)
+            analises_afetadas = {
+                a for (a,) in sessao.query(Registro.analise_id).filter(
+                    Registro.id.in_(ids_afetados)
+                ).distinct()
+            } if ids_afetados else set()
+            
+            # UPDATE em lote agrupado pelo conjunto de colunas alteradas
+            lotes_update = {}
+            for registro_id, campos in atualizados.items():
+                valores = {
+                    COLUNAS_REGISTRO[coluna]: ("" if valor is None else valor)
+                    for coluna, valor in campos.items()
+                    if coluna in COLUNAS_REGISTRO
+                }
+                if valores:
+                    lotes_update.setdefault(frozenset(valores), []).append({"id": registro_id, **valores})
+            for parametros in lotes_update.values():
+                sessao.execute(update(Registro), parametros)
+            
+            if removidos:
+                sessao.query(Registro).filter(Registro.id.in_(removidos)).delete(synchronize_session=False)
+            
+            ids_inseridos = []
+            if inseridos:
+                linhas = [
+                    GerenciadorBancoDados._registro_para_linha(analise_id_novos, reg)
+                    for reg in inseridos
+                ]
+                ids_inseridos = GerenciadorBancoDados._inserir_registros(sessao, linhas)
+                analises_afetadas.add(analise_id_novos)
+            
+            for analise_id in analises_afetadas:
+                GerenciadorBancoDados._recalcular_resumo(sessao, analise_id)
+            
+            sessao.commit()
+            return True, (
+                f"{len(atualizados)} registro(s) atualizado(s), "
+                f"{len(inseridos)} inserido(s), {len(removidos)} removido(s)"
+            ), ids_inseridos
+        except Exception as e:
+            sessao.rollback()
+            return False, f"Erro ao salvar alterações: {str(e)}", None
+        finally:
+            sessao.close()
+    
+    @staticmethod
+    def reclassificar_analise(analise_id: int, classificador=None, tamanho_lote: int = 10_000) -> tuple:
+        """
+        Reclassifica os registros de uma análise gravada com as regras atuais.
+        Os textos são classificados de uma vez e só os tipos que mudaram são
+        gravados, com um UPDATE ... WHERE id IN (...) por tipo e lote.
+        Retorna (sucesso, mensagem, quantidade de registros alterados).
+        """
+        from classificacao import obter_classificador
+        
+        classificador = classificador or obter_classificador()
+        sessao = obter_sessao()
+        try:
+            linhas = sessao.execute(
+                select(Registro.id, Registro.detalhe_atendimento, Registro.tipo)
+                .where(Registro.analise_id == analise_id)
+            ).all()
+            if not linhas:
+                analise = sessao.query(Analise).filter(Analise.id == analise_id).first()
+                if analise is not None and analise.arquivo_parquet:
+                    return False, "Análise arquivada: restaure-a antes de reclassificar", 0
+                return False, "Análise sem registros", 0
+            
+            df = pd.DataFrame(linhas, columns=["id", "texto", "tipo"])
+            df["novo"] = classificador.classificar_serie(df["texto"])
+            alterados = df[df["novo"] != df["tipo"]]
+            
+            for tipo, grupo in alterados.groupby("novo"):
+                ids = grupo["id"].tolist()
+                for inicio in range(0, len(ids), tamanho_lote):
+                    sessao.execute(
+                        update(Registro)
+                        .where(Registro.id.in_(ids[inicio:inicio + tamanho_lote]))
+                        .values(tipo=tipo)
+                        .execution_options(synchronize_session=False)
+                    )
+            
+            if len(alterados):
+                GerenciadorBancoDados._recalcular_resumo(sessao, analise_id)
+            sessao.commit()
+            return True, f"{len(alterados)} de {len(df)} registro(s) reclassificado(s)", len(alterados)
+        except Exception as e:
+            sessao.rollback()
+            return False, f"Erro ao reclassificar análise: {str(e)}", 0
+        finally:
+            sessao.close()
+    
+    @staticmethod
+    def _recalcular_resumo(sessao, analise_id: int):
+        """Recalcula no banco os totais agregados de uma análise"""
+        totais = sessao.query(
+            func.count(Registro.id),
+            func.count(distinct(Registro.tecnico)),
+            func.count(distinct(Registro.cliente)),
+            func.count(distinct(Registro.os))
+        ).filter(Registro.analise_id == analise_id).one()
+        
+        def distribuicao(coluna):
+            return dict(
+                sessao.query(coluna, func.count(Registro.id))
+                .filter(Registro.analise_id == analise_id)
+                .group_by(coluna)
+                .order_by(func.count(Registro.id).desc())
+                .all()
+            )
+        
+        sessao.query(Analise).filter(Analise.id == analise_id).update({
+            Analise.total_registros: totais[0],
+            Analise.tecnicos_unicos: totais[1],
+            Analise.clientes_unicos: totais[2],
+            Analise.os_unicas: totais[3],
+            Analise.tipos_distribuicao: distribuicao(Registro.tipo),
+            Analise.versoes_utilizadas: distribuicao(Registro.versao_internews),
+        }, synchronize_session=False)
+        GerenciadorBancoDados._recalcular_resumos_mensais(sessao, analise_id)
     
     @staticmethod
     def obter_registros_por_analise(analise_id: int) -> tuple:
-        """Obtém todos os registros de uma análise específica"""
+        """Obtém todos os registros de uma análise específica (do banco ou do arquivo Parquet)"""
         try:
             sessao = obter_sessao()
+            analise = sessao.query(Analise).filter(Analise.id == analise_id).first()
+            if analise is not None and analise.arquivo_parquet:
+                sessao.close()
+                tabela = arquivamento.ler_registros([analise_id], raiz=analise.arquivo_parquet)
+                return True, GerenciadorBancoDados._registros_do_arquivo(tabela)
             registros = sessao.query(Registro).filter(Registro.analise_id == analise_id).all()
             sessao.close()
             return True, registros
@@ -210,7 +515,11 @@ class GerenciadorBancoDados:
             registros = sessao.query(Registro).filter(
                 Registro.tecnico == tecnico
             ).order_by(Registro.data_criacao.desc()).limit(limite).all()
+            arquivadas = GerenciadorBancoDados._analises_arquivadas(sessao)
             sessao.close()
+            registros = GerenciadorBancoDados._mesclar_arquivo(
+                registros, arquivadas, arquivamento.filtro_igual("tecnico", tecnico), limite
+            )
             return True, registros
         except Exception as e:
             return False, f"Erro ao obter registros: {str(e)}"
@@ -223,21 +532,37 @@ class GerenciadorBancoDados:
             registros = sessao.query(Registro).filter(
                 Registro.cliente.ilike(f"%{cliente}%")
             ).order_by(Registro.data_criacao.desc()).limit(limite).all()
+            arquivadas = GerenciadorBancoDados._analises_arquivadas(sessao)
             sessao.close()
+            registros = GerenciadorBancoDados._mesclar_arquivo(
+                registros, arquivadas, arquivamento.filtro_contem("cliente", cliente), limite
+            )
             return True, registros
         except Exception as e:
             return False, f"Erro ao obter registros: {str(e)}"
     
     @staticmethod
     def obter_estatisticas_gerais() -> tuple:
-        """Obtém estatísticas gerais do banco de dados"""
+        """Obtém estatísticas gerais do banco de dados (incluindo análises arquivadas)"""
         try:
             sessao = obter_sessao()
             
             total_analises = sessao.query(Analise).count()
             total_registros = sessao.query(Registro).count()
-            tecnicos_unicos = sessao.query(Registro.tecnico).distinct().count()
-            clientes_unicos = sessao.query(Registro.cliente).distinct().count()
+            arquivadas = GerenciadorBancoDados._analises_arquivadas(sessao)
+            
+            if arquivadas:
+                # Distintos precisam da união banco + arquivo
+                tecnicos = {t for (t,) in sessao.query(Registro.tecnico).distinct()}
+                clientes = {c for (c,) in sessao.query(Registro.cliente).distinct()}
+                total_arquivo, tecnicos_arquivo, clientes_arquivo = \
+                    GerenciadorBancoDados._estatisticas_arquivo(arquivadas)
+                total_registros += total_arquivo
+                tecnicos_unicos = len(tecnicos | tecnicos_arquivo)
+                clientes_unicos = len(clientes | clientes_arquivo)
+            else:
+                tecnicos_unicos = sessao.query(Registro.tecnico).distinct().count()
+                clientes_unicos = sessao.query(Registro.cliente).distinct().count()
             
             sessao.close()
             
@@ -252,13 +577,428 @@ class GerenciadorBancoDados:
         except Exception as e:
             return False, f"Erro ao obter estatísticas: {str(e)}"
     
+    # ==========================================
+    # ARQUIVO FRIO (PARQUET)
+    # ==========================================
+    
+    @staticmethod
+    def arquivar_analise(analise_id: int, raiz: str = None) -> tuple:
+        """
+        Move os registros de uma análise para o arquivo Parquet e mantém a
+        análise no banco com o ponteiro para o arquivo. Os arquivos são
+        gravados e conferidos antes de os registros saírem do banco.
+        """
+        raiz = raiz or arquivamento.DIRETORIO_ARQUIVO
+        sessao = obter_sessao()
+        try:
+            analise = sessao.query(Analise).filter(Analise.id == analise_id).first()
+            if analise is None:
+                return False, "Análise não encontrada"
+            if analise.arquivo_parquet:
+                return True, f"Análise {analise_id} já está arquivada em {analise.arquivo_parquet}"
+            
+            colunas = [c for c in arquivamento.ESQUEMA.names if c != "mes"]
+            df = pd.read_sql(
+                select(*[getattr(Registro, c) for c in colunas]).where(Registro.analise_id == analise_id),
+                sessao.connection()
+            )
+            gravados = arquivamento.gravar_analise(analise_id, df, raiz)
+            if gravados != len(df):
+                arquivamento.remover_analise(analise_id, raiz)
+                return False, f"Arquivo incompleto: {gravados} de {len(df)} registros gravados"
+            
+            sessao.query(Registro).filter(Registro.analise_id == analise_id).delete(synchronize_session=False)
+            analise.arquivo_parquet = raiz
+            analise.arquivada_em = datetime.now()
+            sessao.commit()
+            return True, f"{gravados} registros da análise {analise_id} arquivados em {raiz}"
+        except Exception as e:
+            sessao.rollback()
+            return False, f"Erro ao arquivar análise: {str(e)}"
+        finally:
+            sessao.close()
+    
+    @staticmethod
+    def restaurar_analise(analise_id: int) -> tuple:
+        """Traz os registros de uma análise arquivada de volta para o banco (mesmos IDs)"""
+        sessao = obter_sessao()
+        try:
+            analise = sessao.query(Analise).filter(Analise.id == analise_id).first()
+            if analise is None:
+                return False, "Análise não encontrada"
+            if not analise.arquivo_parquet:
+                return True, f"Análise {analise_id} não está arquivada"
+            
+            raiz = analise.arquivo_parquet
+            linhas = arquivamento.ler_registros([analise_id], raiz=raiz).to_pylist()
+            if linhas:
+                sessao.execute(insert(Registro), linhas)
+            analise.arquivo_parquet = None
+            analise.arquivada_em = None
+            sessao.commit()
+            arquivamento.remover_analise(analise_id, raiz)
+            return True, f"{len(linhas)} registros da análise {analise_id} restaurados"
+        except Exception as e:
+            sessao.rollback()
+            return False, f"Erro ao restaurar análise: {str(e)}"
+        finally:
+            sessao.close()
+    
+    @staticmethod
+    def _analises_arquivadas(sessao) -> Dict[str, List[int]]:
+        """Raiz do arquivo -> IDs das análises arquivadas nela"""
+        arquivadas = {}
+        for analise_id, raiz in sessao.query(Analise.id, Analise.arquivo_parquet).filter(
+            Analise.arquivo_parquet.isnot(None)
+        ):
+            arquivadas.setdefault(raiz, []).append(analise_id)
+        return arquivadas
+    
+    @staticmethod
+    def _registros_do_arquivo(tabela) -> List[Registro]:
+        """Linhas do Parquet como objetos Registro (transientes, fora da sessão)"""
+        return [Registro(**linha) for linha in tabela.to_pylist()]
+    
+    @staticmethod
+    def _mesclar_arquivo(registros: List[Registro], arquivadas: Dict[str, List[int]], filtro, limite: int) -> List[Registro]:
+        """Junta os registros arquivados que satisfazem o filtro, mantendo a ordem e o limite"""
+        if not arquivadas:
+            return registros
+        for raiz, ids in arquivadas.items():
+            tabela = arquivamento.ler_registros(ids, filtro=filtro, raiz=raiz)
+            registros = list(registros) + GerenciadorBancoDados._registros_do_arquivo(tabela)
+        registros.sort(key=lambda r: r.data_criacao, reverse=True)
+        return registros[:limite]
+    
+    @staticmethod
+    def _estatisticas_arquivo(arquivadas: Dict[str, List[int]]) -> tuple:
+        """(total de registros, técnicos, clientes) das análises arquivadas"""
+        total, tecnicos, clientes = 0, set(), set()
+        for raiz, ids in arquivadas.items():
+            linhas, distintos = arquivamento.valores_distintos(["tecnico", "cliente"], ids, raiz)
+            total += linhas
+            tecnicos |= distintos["tecnico"]
+            clientes |= distintos["cliente"]
+        return total, tecnicos, clientes
+    
+    # ==========================================
+    # RESUMOS MENSAIS (TENDÊNCIAS)
+    # ==========================================
+    
+    @staticmethod
+    def _expressao_mes():
+        """'DD/MM/AAAA' -> 'AAAA-MM' em SQL (mesma regra de arquivamento.mes_dos_atendimentos)"""
+        return case(
+            (
+                Registro.data.like("__/__/____"),
+                func.substr(Registro.data, 7, 4, type_=String)
+                .concat("-")
+                .concat(func.substr(Registro.data, 4, 2, type_=String))
+            ),
+            else_=arquivamento.MES_SEM_DATA
+        )
+    
+    @staticmethod
+    def _remover_resumos_mensais(sessao, analise_ids: List[int]):
+        if not analise_ids:
+            return
+        for modelo in (ResumoMensalTecnico, ResumoMensalCliente):
+            sessao.execute(delete(modelo).where(modelo.analise_id.in_(analise_ids)))
+    
+    @staticmethod
+    def _recalcular_resumos_mensais(sessao, analise_id: int):
+        """
+        Refaz as linhas de resumo de uma análise com INSERT ... SELECT GROUP BY
+        sobre os registros dela; as demais análises não são tocadas
+        """
+        GerenciadorBancoDados._remover_resumos_mensais(sessao, [analise_id])
+        mes = GerenciadorBancoDados._expressao_mes()
+        
+        sessao.execute(insert(ResumoMensalTecnico).from_select(
+            ["analise_id", "mes", "tecnico", "tipo", "atendimentos"],
+            select(Registro.analise_id, mes, Registro.tecnico, Registro.tipo, func.count(Registro.id))
+            .where(Registro.analise_id == analise_id)
+            .group_by(Registro.analise_id, mes, Registro.tecnico, Registro.tipo)
+        ))
+        sessao.execute(insert(ResumoMensalCliente).from_select(
+            ["analise_id", "mes", "cliente", "atendimentos", "os_unicas"],
+            select(Registro.analise_id, mes, Registro.cliente, func.count(Registro.id), func.count(distinct(Registro.os)))
+            .where(Registro.analise_id == analise_id)
+            .group_by(Registro.analise_id, mes, Registro.cliente)
+        ))
+    
+    @staticmethod
+    def _resumos_mensais_do_arquivo(sessao, analise_id: int, raiz: str):
+        """Resumos de uma análise arquivada, agregados a partir do Parquet"""
+        df = arquivamento.ler_registros(
+            [analise_id], colunas=["mes", "tecnico", "tipo", "cliente", "os"], raiz=raiz
+        ).to_pandas()
+        GerenciadorBancoDados._remover_resumos_mensais(sessao, [analise_id])
+        if df.empty:
+            return
+        por_tecnico = df.groupby(["mes", "tecnico", "tipo"]).size().rename("atendimentos").reset_index()
+        por_cliente = df.groupby(["mes", "cliente"]).agg(
+            atendimentos=("os", "size"), os_unicas=("os", "nunique")
+        ).reset_index()
+        for modelo, tabela in ((ResumoMensalTecnico, por_tecnico), (ResumoMensalCliente, por_cliente)):
+            tabela["analise_id"] = analise_id
+            sessao.execute(insert(modelo), tabela.to_dict("records"))
+    
+    @staticmethod
+    def atualizar_resumos_mensais(analise_id: int) -> tuple:
+        """Recalcula os resumos mensais de uma análise (do banco ou do arquivo Parquet)"""
+        sessao = obter_sessao()
+        try:
+            analise = sessao.get(Analise, analise_id)
+            if analise is None:
+                return False, "Análise não encontrada"
+            if analise.arquivo_parquet:
+                GerenciadorBancoDados._resumos_mensais_do_arquivo(sessao, analise_id, analise.arquivo_parquet)
+            else:
+                GerenciadorBancoDados._recalcular_resumos_mensais(sessao, analise_id)
+            sessao.commit()
+            return True, f"Resumos mensais da análise {analise_id} atualizados"
+        except Exception as e:
+            sessao.rollback()
+            return False, f"Erro ao atualizar resumos mensais: {str(e)}"
+        finally:
+            sessao.close()
+    
+    @staticmethod
+    def _resumos_mensais_vazios() -> bool:
+        """Indica se ainda não há nenhum resumo mensal gravado"""
+        sessao = obter_sessao()
+        try:
+            return sessao.scalar(select(ResumoMensalTecnico.analise_id).limit(1)) is None
+        finally:
+            sessao.close()
+    
+    @staticmethod
+    def reconstruir_resumos_mensais(todas: bool = False) -> tuple:
+        """
+        Gera os resumos das análises que ainda não têm nenhum (ou de todas,
+        com todas=True). Retorna (sucesso, mensagem, IDs processados).
+        """
+        try:
+            sessao = obter_sessao()
+            consulta = select(Analise.id).where(Analise.total_registros > 0)
+            if not todas:
+                consulta = consulta.where(Analise.id.notin_(
+                    select(ResumoMensalTecnico.analise_id).distinct()
+                ))
+            ids = list(sessao.scalars(consulta.order_by(Analise.id)).all())
+            sessao.close()
+        except Exception as e:
+            return False, f"Erro ao reconstruir resumos mensais: {str(e)}", []
+        
+        for analise_id in ids:
+            sucesso, msg = GerenciadorBancoDados.atualizar_resumos_mensais(analise_id)
+            if not sucesso:
+                return False, msg, ids
+        return True, f"Resumos mensais de {len(ids)} análise(s) gerados", ids
+    
+    @staticmethod
+    def _ultimos_meses(sessao, coluna, meses: int) -> List[str]:
+        return list(sessao.scalars(
+            select(coluna).where(coluna != arquivamento.MES_SEM_DATA)
+            .distinct().order_by(coluna.desc()).limit(meses)
+        ).all())
+    
+    @staticmethod
+    def obter_tendencia_tecnicos(meses: int = 12) -> tuple:
+        """
+        Atendimentos por mês, técnico e tipo nos últimos `meses` meses com
+        dados (somando as análises). DataFrame: mes, tecnico, tipo, atendimentos
+        """
+        try:
+            sessao = obter_sessao()
+            periodo = GerenciadorBancoDados._ultimos_meses(sessao, ResumoMensalTecnico.mes, meses)
+            consulta = (
+                select(
+                    ResumoMensalTecnico.mes, ResumoMensalTecnico.tecnico, ResumoMensalTecnico.tipo,
+                    func.sum(ResumoMensalTecnico.atendimentos).label("atendimentos")
+                )
+                .where(ResumoMensalTecnico.mes.in_(periodo))
+                .group_by(ResumoMensalTecnico.mes, ResumoMensalTecnico.tecnico, ResumoMensalTecnico.tipo)
+                .order_by(ResumoMensalTecnico.mes)
+            )
+            df = pd.read_sql(consulta, sessao.connection())
+            sessao.close()
+            return True, df
+        except Exception as e:
+            return False, f"Erro ao obter tendência por técnico: {str(e)}"
+    
+    @staticmethod
+    def obter_tendencia_clientes(meses: int = 12, limite: int = 10) -> tuple:
+        """
+        Atendimentos e O.S por mês dos `limite` clientes com mais atendimentos
+        no período. DataFrame: mes, cliente, atendimentos, os_unicas
+        """
+        try:
+            sessao = obter_sessao()
+            periodo = GerenciadorBancoDados._ultimos_meses(sessao, ResumoMensalCliente.mes, meses)
+            principais = (
+                select(ResumoMensalCliente.cliente)
+                .where(ResumoMensalCliente.mes.in_(periodo))
+                .group_by(ResumoMensalCliente.cliente)
+                .order_by(func.sum(ResumoMensalCliente.atendimentos).desc())
+                .limit(limite)
+            )
+            consulta = (
+                select(
+                    ResumoMensalCliente.mes, ResumoMensalCliente.cliente,
+                    func.sum(ResumoMensalCliente.atendimentos).label("atendimentos"),
+                    func.sum(ResumoMensalCliente.os_unicas).label("os_unicas")
+                )
+                .where(ResumoMensalCliente.mes.in_(periodo))
+                .where(ResumoMensalCliente.cliente.in_(principais.scalar_subquery()))
+                .group_by(ResumoMensalCliente.mes, ResumoMensalCliente.cliente)
+                .order_by(ResumoMensalCliente.mes)
+            )
+            df = pd.read_sql(consulta, sessao.connection())
+            sessao.close()
+            return True, df
+        except Exception as e:
+            return False, f"Erro ao obter tendência por cliente: {str(e)}"
+    
+    # ==========================================
+    # COMPARAÇÃO ENTRE ANÁLISES
+    # ==========================================
+    
+    @staticmethod
+    def _contagens_comparadas(sessao, coluna, valor, analise_a: int, analise_b: int) -> pd.DataFrame:
+        """
+        Soma de `valor` por `coluna` nas duas análises, lado a lado, com a
+        diferença (agregação condicional sobre a tabela de resumo)
+        """
+        modelo = coluna.class_
+        soma_a = func.sum(case((modelo.analise_id == analise_a, valor), else_=0))
+        soma_b = func.sum(case((modelo.analise_id == analise_b, valor), else_=0))
+        consulta = (
+            select(coluna, soma_a.label("a"), soma_b.label("b"), (soma_b - soma_a).label("delta"))
+            .where(modelo.analise_id.in_([analise_a, analise_b]))
+            .group_by(coluna)
+            .order_by((soma_b - soma_a).desc(), coluna)
+        )
+        return pd.read_sql(consulta, sessao.connection())
+    
+    @staticmethod
+    def _versao_por_cliente(sessao, analise: Analise) -> pd.DataFrame:
+        """Versão mais frequente de cada cliente na análise (cliente, versao)"""
+        if analise.arquivo_parquet:
+            import pyarrow.dataset as ds
+            
+            contagem = arquivamento.contar_por(
+                ["cliente", "versao_internews"], [analise.id],
+                filtro=ds.field("versao_internews") != "", raiz=analise.arquivo_parquet
+            )
+            contagem = contagem.sort_values(["quantidade", "versao_internews"], ascending=False)
+            return (
+                contagem.drop_duplicates("cliente")
+                .rename(columns={"versao_internews": "versao"})[["cliente", "versao"]]
+            )
+        
+        quantidade = func.count(Registro.id)
+        ranking = (
+            select(
+                Registro.cliente,
+                Registro.versao_internews.label("versao"),
+                func.row_number().over(
+                    partition_by=Registro.cliente,
+                    order_by=(quantidade.desc(), Registro.versao_internews.desc())
+                ).label("ordem")
+            )
+            .where(Registro.analise_id == analise.id)
+            .where(Registro.versao_internews.isnot(None), Registro.versao_internews != "")
+            .group_by(Registro.cliente, Registro.versao_internews)
+            .subquery()
+        )
+        return pd.read_sql(
+            select(ranking.c.cliente, ranking.c.versao).where(ranking.c.ordem == 1),
+            sessao.connection()
+        )
+    
+    @staticmethod
+    def comparar_analises(analise_a: int, analise_b: int) -> tuple:
+        """
+        Compara a análise B com a análise A (base) sem carregar registros:
+        totais, contagens e diferenças por técnico, tipo e cliente (dos
+        resumos mensais), clientes novos/perdidos e a migração de versões dos
+        clientes presentes nas duas (versão mais frequente de cada lado).
+        Retorna (sucesso, dicionário de DataFrames e listas).
+        """
+        sessao = obter_sessao()
+        try:
+            analises = {a.id: a for a in sessao.scalars(
+                select(Analise).where(Analise.id.in_([analise_a, analise_b]))
+            )}
+            faltando = [i for i in (analise_a, analise_b) if i not in analises]
+            if faltando:
+                return False, f"Análise não encontrada: {', '.join(map(str, faltando))}"
+            
+            # Análises gravadas por fora do gerenciador podem estar sem resumo
+            com_resumo = set(sessao.scalars(
+                select(ResumoMensalTecnico.analise_id).distinct()
+                .where(ResumoMensalTecnico.analise_id.in_([analise_a, analise_b]))
+            ))
+            for analise_id, analise in analises.items():
+                if analise_id not in com_resumo and analise.total_registros:
+                    GerenciadorBancoDados.atualizar_resumos_mensais(analise_id)
+            
+            a, b = analises[analise_a], analises[analise_b]
+            totais = pd.DataFrame(
+                [
+                    (rotulo, getattr(a, campo), getattr(b, campo))
+                    for rotulo, campo in (
+                        ("Registros", "total_registros"), ("Técnicos", "tecnicos_unicos"),
+                        ("Clientes", "clientes_unicos"), ("O.S", "os_unicas"),
+                    )
+                ],
+                columns=["metrica", "a", "b"]
+            )
+            totais["delta"] = totais["b"] - totais["a"]
+            
+            comparar = GerenciadorBancoDados._contagens_comparadas
+            tecnicos = comparar(sessao, ResumoMensalTecnico.tecnico, ResumoMensalTecnico.atendimentos, analise_a, analise_b)
+            tipos = comparar(sessao, ResumoMensalTecnico.tipo, ResumoMensalTecnico.atendimentos, analise_a, analise_b)
+            clientes = comparar(sessao, ResumoMensalCliente.cliente, ResumoMensalCliente.atendimentos, analise_a, analise_b)
+            
+            versoes_a = GerenciadorBancoDados._versao_por_cliente(sessao, a)
+            versoes_b = GerenciadorBancoDados._versao_por_cliente(sessao, b)
+            sessao.close()
+            
+            migracao = (
+                versoes_a.merge(versoes_b, on="cliente", suffixes=("_a", "_b"))
+                .groupby(["versao_a", "versao_b"]).size().rename("clientes")
+                .reset_index().sort_values("clientes", ascending=False, ignore_index=True)
+            )
+            
+            return True, {
+                "analise_a": GerenciadorBancoDados._formatar_historico(a),
+                "analise_b": GerenciadorBancoDados._formatar_historico(b),
+                "totais": totais,
+                "tecnicos": tecnicos,
+                "tipos": tipos,
+                "clientes": clientes,
+                "clientes_novos": clientes.loc[clientes["a"] == 0, "cliente"].tolist(),
+                "clientes_perdidos": clientes.loc[clientes["b"] == 0, "cliente"].tolist(),
+                "migracao_versoes": migracao,
+            }
+        except Exception as e:
+            return False, f"Erro ao comparar análises: {str(e)}"
+        finally:
+            sessao.close()
+    
     # ==========================================
     # OPERAÇÕES DE LIMPEZA E MANUTENÇÃO
     # ==========================================
     
     @staticmethod
-    def limpar_analises_antigas(dias: int = 30) -> tuple:
-        """Remove análises mais antigas que X dias"""
+    def limpar_analises_antigas(dias: int = 30, arquivar: bool = True) -> tuple:
+        """
+        Trata análises mais antigas que X dias: por padrão move os registros
+        para o arquivo Parquet; com arquivar=False remove tudo de vez.
+        """
         try:
             from datetime import timedelta
             
@@ -266,15 +1006,28 @@ class GerenciadorBancoDados:
             data_limite = datetime.now() - timedelta(days=dias)
             
             # Obter IDs das análises antigas
-            analises_antigas = sessao.query(Analise.id).filter(
+            analises_antigas = sessao.query(Analise.id, Analise.arquivo_parquet).filter(
                 Analise.timestamp < data_limite
             ).all()
             
+            if arquivar:
+                sessao.close()
+                pendentes = [analise_id for analise_id, raiz in analises_antigas if not raiz]
+                falhas = []
+                for analise_id in pendentes:
+                    sucesso, msg = GerenciadorBancoDados.arquivar_analise(analise_id)
+                    if not sucesso:
+                        falhas.append(f"{analise_id}: {msg}")
+                if falhas:
+                    return False, f"{len(pendentes) - len(falhas)} análises arquivadas; falhas: {'; '.join(falhas)}"
+                return True, f"{len(pendentes)} análises antigas arquivadas"
+            
             ids_para_deletar = [a[0] for a in analises_antigas]
             
             # Deletar registros associados
             for analise_id in ids_para_deletar:
                 sessao.query(Registro).filter(Registro.analise_id == analise_id).delete()
+            GerenciadorBancoDados._remover_resumos_mensais(sessao, ids_para_deletar)
             
             # Deletar análises
             sessao.query(Analise).filter(Analise.timestamp < data_limite).delete()
@@ -282,6 +1035,10 @@ class GerenciadorBancoDados:
             sessao.commit()
             sessao.close()
             
+            for analise_id, raiz in analises_antigas:
+                if raiz:
+                    arquivamento.remover_analise(analise_id, raiz)
+            
             return True, f"{len(ids_para_deletar)} análises antigas removidas"
         except Exception as e:
             return False, f"Erro ao limpar análises: {str(e)}"
@@ -333,6 +1090,13 @@ class GerenciadorBancoDados:
             return False, f"Erro ao exportar para JSON: {str(e)}"
 
 
+# Leituras passam pelo cache do processo; gravações invalidam as dependentes
+aplicar_cache(GerenciadorBancoDados)
+
+# Cada chamada do gerenciador é medida (duração, linhas e comandos SQL)
+instrumentar_classe(GerenciadorBancoDados, "db")
+
+
 if __name__ == "__main__":
     # Teste de inicialização
     sucesso, msg = GerenciadorBancoDados.inicializar()
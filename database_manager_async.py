@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Gerenciador de banco de dados assíncrono para a aplicação InterNews
+Consultas de leitura sobre o engine assíncrono do SQLAlchemy (asyncpg), para
+que as consultas independentes de um rerun do dashboard sejam disparadas ao
+mesmo tempo. A API síncrona (GerenciadorBancoDados) continua valendo para
+scripts e para as gravações.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+from typing import Dict
+
+from sqlalchemy import distinct, func, select
+
+import arquivamento
+from cache_consultas import aplicar_cache
+from database_manager import GerenciadorBancoDados
+from instrumentacao import medir
+from models import Analise, Registro, obter_engine_async, obter_sessao_async
+
+_log = logging.getLogger(__name__)
+
+
+class GerenciadorBancoDadosAsync:
+    """Versão assíncrona das consultas de leitura do GerenciadorBancoDados"""
+
+    @staticmethod
+    async def obter_analises(limite: int = 50) -> tuple:
+        """Obtém as últimas análises do banco de dados"""
+        try:
+            async with obter_sessao_async() as sessao:
+                resultado = await sessao.execute(
+                    select(Analise).order_by(Analise.timestamp.desc()).limit(limite)
+                )
+                return True, resultado.scalars().all()
+        except Exception as e:
+            return False, f"Erro ao obter análises: {str(e)}"
+
+    @staticmethod
+    async def obter_analise_por_id(analise_id: int) -> tuple:
+        """Obtém uma análise específica pelo ID"""
+        try:
+            async with obter_sessao_async() as sessao:
+                analise = await sessao.get(Analise, analise_id)
+            if analise:
+                return True, analise
+            return False, "Análise não encontrada"
+        except Exception as e:
+            return False, f"Erro ao obter análise: {str(e)}"
+
+    @staticmethod
+    async def obter_historico_completo() -> tuple:
+        """Obtém o histórico completo de análises formatado para exibição"""
+        sucesso, analises = await GerenciadorBancoDadosAsync.obter_analises(limite=1000)
+        if not sucesso:
+            return False, analises
+        return True, [GerenciadorBancoDados._formatar_historico(analise) for analise in analises]
+
+    @staticmethod
+    async def _escalar(consulta):
+        # Cada contagem usa a própria conexão para poder correr em paralelo
+        async with obter_sessao_async() as sessao:
+            return (await sessao.execute(consulta)).scalar_one()
+
+    @staticmethod
+    async def _distintos(coluna) -> set:
+        async with obter_sessao_async() as sessao:
+            return set((await sessao.execute(select(coluna).distinct())).scalars().all())
+
+    @staticmethod
+    async def _analises_arquivadas() -> Dict[str, list]:
+        """Raiz do arquivo -> IDs das análises arquivadas nela"""
+        async with obter_sessao_async() as sessao:
+            linhas = (await sessao.execute(
+                select(Analise.id, Analise.arquivo_parquet).where(Analise.arquivo_parquet.isnot(None))
+            )).all()
+        arquivadas = {}
+        for analise_id, raiz in linhas:
+            arquivadas.setdefault(raiz, []).append(analise_id)
+        return arquivadas
+
+    @staticmethod
+    async def _estatisticas_arquivo() -> tuple:
+        """(total, técnicos, clientes) das análises arquivadas; None se não houver"""
+        arquivadas = await GerenciadorBancoDadosAsync._analises_arquivadas()
+        if not arquivadas:
+            return None
+        # Leitura do Parquet é bloqueante: roda fora do event loop
+        return await asyncio.to_thread(GerenciadorBancoDados._estatisticas_arquivo, arquivadas)
+
+    @staticmethod
+    async def obter_estatisticas_gerais() -> tuple:
+        """Obtém estatísticas gerais do banco de dados (contagens em paralelo, com o arquivo)"""
+        try:
+            escalar = GerenciadorBancoDadosAsync._escalar
+            total_analises, total_registros, tecnicos_unicos, clientes_unicos, arquivo = await asyncio.gather(
+                escalar(select(func.count(Analise.id))),
+                escalar(select(func.count(Registro.id))),
+                escalar(select(func.count(distinct(Registro.tecnico)))),
+                escalar(select(func.count(distinct(Registro.cliente)))),
+                GerenciadorBancoDadosAsync._estatisticas_arquivo(),
+            )
+            if arquivo is not None:
+                # Distintos precisam da união banco + arquivo
+                total_arquivo, tecnicos_arquivo, clientes_arquivo = arquivo
+                tecnicos, clientes = await asyncio.gather(
+                    GerenciadorBancoDadosAsync._distintos(Registro.tecnico),
+                    GerenciadorBancoDadosAsync._distintos(Registro.cliente),
+                )
+                total_registros += total_arquivo
+                tecnicos_unicos = len(tecnicos | tecnicos_arquivo)
+                clientes_unicos = len(clientes | clientes_arquivo)
+            return True, {
+                "total_analises": total_analises,
+                "total_registros": total_registros,
+                "tecnicos_unicos": tecnicos_unicos,
+                "clientes_unicos": clientes_unicos
+            }
+        except Exception as e:
+            return False, f"Erro ao obter estatísticas: {str(e)}"
+
+    @staticmethod
+    async def obter_registros_por_analise(analise_id: int) -> tuple:
+        """Obtém todos os registros de uma análise específica (do banco ou do arquivo Parquet)"""
+        try:
+            async with obter_sessao_async() as sessao:
+                analise = await sessao.get(Analise, analise_id)
+                if analise is None or not analise.arquivo_parquet:
+                    resultado = await sessao.execute(select(Registro).where(Registro.analise_id == analise_id))
+                    return True, resultado.scalars().all()
+            tabela = await asyncio.to_thread(arquivamento.ler_registros, [analise_id], raiz=analise.arquivo_parquet)
+            return True, GerenciadorBancoDados._registros_do_arquivo(tabela)
+        except Exception as e:
+            return False, f"Erro ao obter registros: {str(e)}"
+
+    @staticmethod
+    async def obter_registros_por_tecnico(tecnico: str, limite: int = 100) -> tuple:
+        """Obtém registros de um técnico específico"""
+        try:
+            async with obter_sessao_async() as sessao:
+                resultado = await sessao.execute(
+                    select(Registro).where(Registro.tecnico == tecnico)
+                    .order_by(Registro.data_criacao.desc()).limit(limite)
+                )
+                registros = resultado.scalars().all()
+            arquivadas = await GerenciadorBancoDadosAsync._analises_arquivadas()
+            return True, await asyncio.to_thread(
+                GerenciadorBancoDados._mesclar_arquivo,
+                registros, arquivadas, arquivamento.filtro_igual("tecnico", tecnico), limite
+            )
+        except Exception as e:
+            return False, f"Erro ao obter registros: {str(e)}"
+
+    @staticmethod
+    async def obter_registros_por_cliente(cliente: str, limite: int = 100) -> tuple:
+        """Obtém registros de um cliente específico"""
+        try:
+            async with obter_sessao_async() as sessao:
+                resultado = await sessao.execute(
+                    select(Registro).where(Registro.cliente.ilike(f"%{cliente}%"))
+                    .order_by(Registro.data_criacao.desc()).limit(limite)
+                )
+                registros = resultado.scalars().all()
+            arquivadas = await GerenciadorBancoDadosAsync._analises_arquivadas()
+            return True, await asyncio.to_thread(
+                GerenciadorBancoDados._mesclar_arquivo,
+                registros, arquivadas, arquivamento.filtro_contem("cliente", cliente), limite
+            )
+        except Exception as e:
+            return False, f"Erro ao obter registros: {str(e)}"
+
+    @staticmethod
+    async def carregar_barra_lateral() -> Dict[str, tuple]:
+        """Consultas independentes de um rerun da barra lateral, aguardadas juntas"""
+        historico, estatisticas = await asyncio.gather(
+            GerenciadorBancoDadosAsync.obter_historico_completo(),
+            GerenciadorBancoDadosAsync.obter_estatisticas_gerais(),
+        )
+        return {"historico": historico, "estatisticas": estatisticas}
+
+
+# Mesmo cache (e mesmas chaves) das leituras síncronas
+aplicar_cache(GerenciadorBancoDadosAsync)
+
+
+# ==========================================
+# PONTE COM CÓDIGO SÍNCRONO (STREAMLIT)
+# ==========================================
+
+# Um único event loop por processo, em thread própria: o pool do engine
+# assíncrono fica preso ao loop em que as conexões foram abertas
+_laco = None
+_trava = threading.Lock()
+
+
+def _obter_laco() -> asyncio.AbstractEventLoop:
+    global _laco
+    if _laco is None:
+        with _trava:
+            if _laco is None:
+                laco = asyncio.new_event_loop()
+                threading.Thread(target=laco.run_forever, name="internews-db-async", daemon=True).start()
+                _laco = laco
+    return _laco
+
+
+def executar(corrotina, timeout: float = None):
+    """Executa a corrotina no loop do processo e devolve o resultado (bloqueante)"""
+    with medir(f"db_async.{corrotina.__name__}"):
+        # A tarefa é criada dentro de uma cópia do contexto do chamador, para
+        # que o SQL das consultas seja atribuído ao coletor da execução
+        futuro = contextvars.copy_context().run(
+            asyncio.run_coroutine_threadsafe, corrotina, _obter_laco()
+        )
+        return futuro.result(timeout)
+
+
+# O aviso de falta do driver assíncrono sai uma vez por processo
+_aviso_sem_driver = False
+
+
+def carregar_barra_lateral() -> Dict[str, tuple]:
+    """
+    Histórico e estatísticas da barra lateral em paralelo. Sem driver
+    assíncrono instalado, cai para as consultas síncronas em sequência.
+    """
+    global _aviso_sem_driver
+    try:
+        obter_engine_async()
+    except ImportError as e:
+        if not _aviso_sem_driver:
+            _aviso_sem_driver = True
+            _log.warning("Driver assíncrono indisponível (%s); barra lateral usando consultas síncronas", e)
+        return {
+            "historico": GerenciadorBancoDados.obter_historico_completo(),
+            "estatisticas": GerenciadorBancoDados.obter_estatisticas_gerais(),
+        }
+    return executar(GerenciadorBancoDadosAsync.carregar_barra_lateral())
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Exportadores da aplicação InterNews
+Geram Excel, CSV, JSON e NDJSON em lotes, sem montar o arquivo inteiro
+como texto intermediário. O arquivo é escrito em um temporário que passa
+para o disco acima de LIMITE_MEMORIA_MB, e só é lido (uma vez) no final.
+"""
+
+import os
+import tempfile
+from typing import BinaryIO, Iterator
+
+import pandas as pd
+import xlsxwriter
+from xlsxwriter.utility import xl_col_to_name
+
+# Linhas por lote na escrita dos arquivos
+TAMANHO_LOTE = 10_000
+
+# Linhas amostradas para estimar a largura das colunas do Excel
+TAMANHO_AMOSTRA = 1_000
+LARGURA_MAXIMA_COLUNA = 80
+
+# Acima deste tamanho o arquivo em geração vai para o disco (MB)
+LIMITE_MEMORIA_MB = int(os.getenv("INTERNEWS_EXPORTACAO_MEMORIA_MB", "16"))
+
+# Destaques condicionais do Excel: coluna -> (valor, formato)
+DESTAQUES_EXCEL = {
+    "Tipo": ("Não Identificado", {'bg_color': '#FFC7CE', 'font_color': '#9C0006'}),
+    "Técnico": ("Nao Informado", {'bg_color': '#FFEB9C', 'font_color': '#9C6500'}),
+}
+
+
+def _lotes(df: pd.DataFrame, tamanho_lote: int = TAMANHO_LOTE) -> Iterator[pd.DataFrame]:
+    """Fatias consecutivas de df com até `tamanho_lote` linhas"""
+    for inicio in range(0, len(df), tamanho_lote):
+        yield df.iloc[inicio:inicio + tamanho_lote]
+
+
+def _estimar_larguras(df: pd.DataFrame) -> list:
+    """Estima a largura de cada coluna a partir de uma amostra das linhas"""
+    amostra = df.sample(n=TAMANHO_AMOSTRA, random_state=0) if len(df) > TAMANHO_AMOSTRA else df
+    larguras = []
+    for coluna in df.columns:
+        maior = amostra[coluna].astype(str).str.len().max() if len(amostra) else 0
+        larguras.append(min(max(int(maior or 0), len(str(coluna))) + 2, LARGURA_MAXIMA_COLUNA))
+    return larguras
+
+
+def _gerar(escrever, df: pd.DataFrame) -> bytes:
+    """Escreve df com `escrever` em um arquivo temporário e devolve o conteúdo"""
+    with tempfile.SpooledTemporaryFile(max_size=LIMITE_MEMORIA_MB * 1024 * 1024) as arquivo:
+        escrever(df, arquivo)
+        arquivo.seek(0)
+        return arquivo.read()
+
+
+class ExportadorDados:
+    @staticmethod
+    def escrever_excel(df: pd.DataFrame, destino: BinaryIO):
+        """Escreve o Excel formatado em modo de memória constante."""
+        workbook = xlsxwriter.Workbook(destino, {'constant_memory': True})
+        worksheet = workbook.add_worksheet('Dados')
+
+        formato_cabecalho = workbook.add_format({'bold': True, 'border': 1})
+        for indice, largura in enumerate(_estimar_larguras(df)):
+            worksheet.set_column(indice, indice, largura)
+
+        # Destaques cobrem exatamente as linhas exportadas
+        ultima_linha = len(df) + 1
+        for coluna, (valor, propriedades) in DESTAQUES_EXCEL.items():
+            if coluna not in df.columns or len(df) == 0:
+                continue
+            letra = xl_col_to_name(df.columns.get_loc(coluna))
+            worksheet.conditional_format(f'{letra}2:{letra}{ultima_linha}', {
+                'type': 'text',
+                'criteria': 'containing',
+                'value': valor,
+                'format': workbook.add_format(propriedades)
+            })
+
+        # Em memória constante as linhas precisam ser escritas em ordem
+        worksheet.write_row(0, 0, [str(c) for c in df.columns], formato_cabecalho)
+        linha = 1
+        for lote in _lotes(df):
+            valores = lote.astype(object).where(lote.notna(), None)
+            for registro in valores.itertuples(index=False, name=None):
+                worksheet.write_row(linha, 0, registro)
+                linha += 1
+
+        workbook.close()
+
+    @staticmethod
+    def escrever_csv(df: pd.DataFrame, destino: BinaryIO):
+        """Escreve o CSV em lotes."""
+        for numero, lote in enumerate(_lotes(df)):
+            destino.write(lote.to_csv(index=False, header=(numero == 0)).encode('utf-8'))
+        if len(df) == 0:
+            destino.write(df.to_csv(index=False).encode('utf-8'))
+
+    @staticmethod
+    def escrever_json(df: pd.DataFrame, destino: BinaryIO):
+        """Escreve um array JSON indentado em lotes, um objeto por registro."""
+        if len(df) == 0:
+            destino.write(df.to_json(orient='records', indent=2, force_ascii=False).encode('utf-8'))
+            return
+        destino.write(b'[')
+        for numero, lote in enumerate(_lotes(df)):
+            if numero > 0:
+                destino.write(b',')
+            # Remove "[" e "\n]" do array de cada lote para concatená-los
+            texto = lote.to_json(orient='records', indent=2, force_ascii=False)
+            destino.write(texto[1:-2].encode('utf-8'))
+        destino.write(b'\n]')
+
+    @staticmethod
+    def escrever_ndjson(df: pd.DataFrame, destino: BinaryIO):
+        """Escreve NDJSON (um registro JSON por linha) em lotes."""
+        for lote in _lotes(df):
+            texto = lote.to_json(orient='records', lines=True, force_ascii=False)
+            destino.write(texto.encode('utf-8'))
+            if texto and not texto.endswith('\n'):
+                destino.write(b'\n')
+
+    @staticmethod
+    def exportar_excel(df: pd.DataFrame) -> bytes:
+        """Exporta para Excel com formatação."""
+        return _gerar(ExportadorDados.escrever_excel, df)
+
+    @staticmethod
+    def exportar_csv(df: pd.DataFrame) -> bytes:
+        """Exporta para CSV."""
+        return _gerar(ExportadorDados.escrever_csv, df)
+
+    @staticmethod
+    def exportar_json(df: pd.DataFrame) -> bytes:
+        """Exporta para JSON."""
+        return _gerar(ExportadorDados.escrever_json, df)
+
+    @staticmethod
+    def exportar_ndjson(df: pd.DataFrame) -> bytes:
+        """Exporta para NDJSON."""
+        return _gerar(ExportadorDados.escrever_ndjson, df)
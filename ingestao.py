@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Pipeline de ingestão da aplicação InterNews
+Sobrepõe o parsing dos blocos com a gravação em lote no banco de dados
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from database_manager import GerenciadorBancoDados
+from instrumentacao import Medicao, medir, registrar
+from log_parser import LogParser
+
+# Marcador de fim de fluxo enviado ao escritor
+_FIM = object()
+
+
+class AgregadorIncremental:
+    """Acumula os totais de uma análise a partir do fluxo de lotes"""
+
+    def __init__(self):
+        self.total_registros = 0
+        self.tecnicos = set()
+        self.clientes = set()
+        self.os = set()
+        self.tipos = Counter()
+        self.versoes = Counter()
+
+    def adicionar_lote(self, lote: List[Dict]):
+        """Incorpora um lote de registros aos agregados"""
+        self.total_registros += len(lote)
+        for reg in lote:
+            self.tecnicos.add(reg["Técnico"])
+            self.clientes.add(reg["Cliente"])
+            self.os.add(reg["O.S"])
+            self.tipos[reg["Tipo"]] += 1
+            self.versoes[reg["Versão Internews"]] += 1
+
+    def resumo(self) -> Dict:
+        """Retorna os agregados no formato esperado por salvar_analise"""
+        return {
+            "total_registros": self.total_registros,
+            "tecnicos_unicos": len(self.tecnicos),
+            "clientes_unicos": len(self.clientes),
+            "os_unicas": len(self.os),
+            "tipos_distribuicao": dict(self.tipos.most_common()),
+            "versoes_utilizadas": dict(self.versoes.most_common()),
+        }
+
+
+@dataclass
+class ResultadoIngestao:
+    """Resultado da ingestão de um arquivo"""
+    df: pd.DataFrame
+    resumo: Dict = field(default_factory=dict)
+    analise_id: Optional[int] = None
+    sucesso_analise: bool = False
+    msg_analise: str = ""
+    sucesso_registros: bool = False
+    msg_registros: str = ""
+    # Nomes de técnicos não reconhecidos -> ocorrências
+    tecnicos_nao_resolvidos: Dict[str, int] = field(default_factory=dict)
+
+
+class PipelineIngestao:
+    """
+    Ingestão produtor/consumidor: a thread chamadora faz o parsing e a
+    agregação dos lotes enquanto uma thread escritora grava o lote anterior.
+    A fila limitada aplica contrapressão quando o banco fica para trás.
+    """
+
+    def __init__(self, parser: LogParser = None, tamanho_lote: int = 500, profundidade_fila: int = 4):
+        self.parser = parser or LogParser()
+        self.tamanho_lote = tamanho_lote
+        self.profundidade_fila = profundidade_fila
+
+    @staticmethod
+    def _escrever(fila: queue.Queue, analise_id: int, estado: Dict):
+        """Consome lotes da fila e grava cada um em um INSERT em lote"""
+        while True:
+            lote = fila.get()
+            if lote is _FIM:
+                return
+
+            # Após um erro continua drenando a fila para não travar o produtor
+            if estado["erro"] is not None:
+                estado["ids"].extend([None] * len(lote))
+                continue
+
+            sucesso, msg, ids = GerenciadorBancoDados.salvar_registros(analise_id, lote)
+            if sucesso:
+                estado["gravados"] += len(lote)
+                estado["ids"].extend(ids)
+            else:
+                estado["erro"] = msg
+                estado["ids"].extend([None] * len(lote))
+
+    def executar(self, conteudo_texto: str, nome_arquivo: str, usuario: str = "admin") -> ResultadoIngestao:
+        """Processa, agrega e grava um arquivo de log em estágios sobrepostos"""
+        agregador = AgregadorIncremental()
+        registros = []
+        resultado = ResultadoIngestao(df=pd.DataFrame())
+
+        # A análise é criada antes para que os registros tenham a quem apontar;
+        # os totais são preenchidos ao final, a partir dos agregados incrementais.
+        sucesso, msg, analise_id = GerenciadorBancoDados.salvar_analise(
+            nome_arquivo=nome_arquivo,
+            total_registros=0,
+            tecnicos_unicos=0,
+            clientes_unicos=0,
+            os_unicas=0,
+            tipos_distribuicao={},
+            versoes_utilizadas={},
+            usuario=usuario
+        )
+        resultado.sucesso_analise = sucesso
+        resultado.msg_analise = msg
+        resultado.analise_id = analise_id
+
+        fila = None
+        escritor = None
+        estado = {"gravados": 0, "erro": None, "ids": []}
+
+        if sucesso:
+            fila = queue.Queue(maxsize=self.profundidade_fila)
+            # O contexto é copiado para que o SQL do escritor seja atribuído à ingestão
+            escritor = threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(self._escrever, fila, analise_id, estado),
+                daemon=True
+            )
+            escritor.start()
+
+        tempo_parser = 0.0
+        tempo_espera_fila = 0.0
+        self.parser.nao_resolvidos.clear()
+        try:
+            try:
+                lotes = self.parser.iterar_lotes(conteudo_texto, self.tamanho_lote)
+                while True:
+                    inicio = time.perf_counter()
+                    lote = next(lotes, None)
+                    tempo_parser += time.perf_counter() - inicio
+                    if lote is None:
+                        break
+
+                    agregador.adicionar_lote(lote)
+                    registros.extend(lote)
+                    if fila is not None:
+                        inicio = time.perf_counter()
+                        fila.put(lote)
+                        tempo_espera_fila += time.perf_counter() - inicio
+            finally:
+                if fila is not None:
+                    with medir("ingestao.aguardar_escritor"):
+                        fila.put(_FIM)
+                        escritor.join()
+        except Exception:
+            # Falha no parser: a análise zerada e os lotes já gravados não ficam no banco
+            if sucesso:
+                GerenciadorBancoDados.deletar_analise(analise_id)
+            raise
+
+        registrar(Medicao("ingestao.parser", duracao=tempo_parser, linhas=len(registros)))
+        registrar(Medicao("ingestao.espera_fila", duracao=tempo_espera_fila))
+
+        resultado.resumo = agregador.resumo()
+        resultado.tecnicos_nao_resolvidos = dict(self.parser.nao_resolvidos.most_common())
+
+        # Os totais só são gravados quando todos os registros foram salvos;
+        # gravação parcial descarta a análise para o histórico não divergir da tabela
+        completo = sucesso and estado["erro"] is None and estado["gravados"] == len(registros)
+        if sucesso and not completo:
+            GerenciadorBancoDados.deletar_analise(analise_id)
+            resultado.sucesso_analise = False
+            resultado.analise_id = None
+            if not registros:
+                resultado.msg_analise = "Nenhum registro encontrado"
+            else:
+                resultado.msg_registros = estado["erro"] or (
+                    f"{estado['gravados']} de {len(registros)} registros gravados"
+                )
+                resultado.msg_analise = f"Análise descartada ({resultado.msg_registros})"
+
+        # O índice do DataFrame é a chave primária do registro no banco
+        # (nulo quando o registro não foi gravado)
+        ids = estado["ids"] if completo else [None] * len(registros)
+        resultado.df = pd.DataFrame(registros, index=pd.Index(ids, dtype="Int64", name="ID"))
+
+        if not completo:
+            return resultado
+
+        sucesso_resumo, msg_resumo = GerenciadorBancoDados.atualizar_resumo_analise(
+            analise_id, resultado.resumo
+        )
+        if not sucesso_resumo:
+            resultado.sucesso_analise = False
+            resultado.msg_analise = msg_resumo
+
+        resultado.sucesso_registros = True
+        resultado.msg_registros = f"{estado['gravados']} registros salvos com sucesso"
+        return resultado
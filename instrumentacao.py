@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentação leve da aplicação InterNews
+Mede duração, linhas e comandos SQL de estágios do parser, métodos do
+gerenciador de banco e seções do dashboard, por execução e no processo
+"""
+
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Arquivo opcional de métricas no formato texto do Prometheus
+ARQUIVO_METRICAS = os.getenv("INTERNEWS_METRICAS_ARQUIVO")
+
+
+@dataclass
+class Medicao:
+    """Uma operação medida"""
+    nome: str
+    duracao: float = 0.0
+    linhas: Optional[int] = None
+    sql_comandos: int = 0
+    sql_tempo: float = 0.0
+    erro: Optional[str] = None
+
+
+@dataclass
+class ColetorExecucao:
+    """Medições de uma execução (rerun) do dashboard"""
+    inicio: float = field(default_factory=time.perf_counter)
+    duracao: float = 0.0
+    medicoes: List[Medicao] = field(default_factory=list)
+    sql_comandos: int = 0
+    sql_tempo: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def adicionar(self, medicao: Medicao):
+        with self._lock:
+            self.medicoes.append(medicao)
+
+
+class RegistroMetricas:
+    """Totais acumulados no processo, por nome de operação"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.operacoes: Dict[str, Dict] = {}
+
+    def registrar(self, medicao: Medicao):
+        with self._lock:
+            op = self.operacoes.setdefault(medicao.nome, {
+                "contagem": 0, "soma": 0.0, "maximo": 0.0,
+                "linhas": 0, "sql_comandos": 0, "sql_tempo": 0.0, "erros": 0
+            })
+            op["contagem"] += 1
+            op["soma"] += medicao.duracao
+            op["maximo"] = max(op["maximo"], medicao.duracao)
+            op["linhas"] += medicao.linhas or 0
+            op["sql_comandos"] += medicao.sql_comandos
+            op["sql_tempo"] += medicao.sql_tempo
+            op["erros"] += 1 if medicao.erro else 0
+
+    def instantaneo(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {nome: dict(op) for nome, op in self.operacoes.items()}
+
+    def formato_prometheus(self) -> str:
+        """Métricas no formato de exposição texto do Prometheus"""
+        metricas = [
+            ("internews_operacao_duracao_segundos", "summary", "Duração das operações", None),
+            ("internews_operacao_duracao_maxima_segundos", "gauge", "Maior duração observada", "maximo"),
+            ("internews_operacao_linhas_total", "counter", "Linhas processadas", "linhas"),
+            ("internews_operacao_sql_comandos_total", "counter", "Comandos SQL executados", "sql_comandos"),
+            ("internews_operacao_sql_segundos_total", "counter", "Tempo gasto em SQL", "sql_tempo"),
+            ("internews_operacao_erros_total", "counter", "Operações com erro", "erros"),
+        ]
+        operacoes = self.instantaneo()
+        linhas = []
+        for nome_metrica, tipo, ajuda, chave in metricas:
+            linhas.append(f"# HELP {nome_metrica} {ajuda}")
+            linhas.append(f"# TYPE {nome_metrica} {tipo}")
+            for nome, op in sorted(operacoes.items()):
+                rotulo = '{operacao="%s"}' % nome.replace("\\", "\\\\").replace('"', '\\"')
+                if chave is None:
+                    linhas.append(f"{nome_metrica}_sum{rotulo} {op['soma']:.6f}")
+                    linhas.append(f"{nome_metrica}_count{rotulo} {op['contagem']}")
+                else:
+                    linhas.append(f"{nome_metrica}{rotulo} {op[chave]}")
+        return "\n".join(linhas) + "\n"
+
+    def escrever_prometheus(self, caminho: str):
+        """Grava as métricas de forma atômica (para coleta por arquivo)"""
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(self.formato_prometheus())
+        os.replace(temporario, caminho)
+
+
+REGISTRO = RegistroMetricas()
+
+_execucao: ContextVar[Optional[ColetorExecucao]] = ContextVar("execucao", default=None)
+_pilha: ContextVar[tuple] = ContextVar("pilha_medicoes", default=())
+
+
+def iniciar_execucao() -> ColetorExecucao:
+    """Inicia a coleta de uma nova execução no contexto atual"""
+    coletor = ColetorExecucao()
+    _execucao.set(coletor)
+    return coletor
+
+
+def finalizar_execucao(coletor: ColetorExecucao) -> ColetorExecucao:
+    """Encerra a coleta e, se configurado, grava o arquivo de métricas"""
+    coletor.duracao = time.perf_counter() - coletor.inicio
+    if ARQUIVO_METRICAS:
+        try:
+            REGISTRO.escrever_prometheus(ARQUIVO_METRICAS)
+        except OSError:
+            pass
+    return coletor
+
+
+def registrar(medicao: Medicao):
+    """Registra uma medição na execução atual e nos totais do processo"""
+    coletor = _execucao.get()
+    if coletor is not None:
+        coletor.adicionar(medicao)
+    REGISTRO.registrar(medicao)
+
+
+@contextmanager
+def medir(nome: str, linhas: Optional[int] = None):
+    """Mede o bloco; comandos SQL executados dentro dele são atribuídos à medição"""
+    medicao = Medicao(nome=nome, linhas=linhas)
+    token = _pilha.set(_pilha.get() + (medicao,))
+    inicio = time.perf_counter()
+    try:
+        yield medicao
+    except Exception as e:
+        medicao.erro = type(e).__name__
+        raise
+    finally:
+        medicao.duracao = time.perf_counter() - inicio
+        _pilha.reset(token)
+        registrar(medicao)
+
+
+def _contar_linhas(resultado) -> Optional[int]:
+    """Número de linhas de um retorno comum (DataFrame, lista, tupla de status)"""
+    if hasattr(resultado, "shape"):
+        return int(resultado.shape[0])
+    if isinstance(resultado, list):
+        return len(resultado)
+    if isinstance(resultado, tuple) and len(resultado) >= 2 and isinstance(resultado[0], bool):
+        return _contar_linhas(resultado[-1])
+    return None
+
+
+def cronometrado(nome: str) -> Callable:
+    """Decorador que mede cada chamada da função"""
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            with medir(nome) as medicao:
+                resultado = funcao(*args, **kwargs)
+                medicao.linhas = _contar_linhas(resultado)
+                # Os métodos do gerenciador devolvem (False, mensagem) em vez de levantar
+                if isinstance(resultado, tuple) and resultado and resultado[0] is False:
+                    medicao.erro = str(resultado[1])
+                return resultado
+        envoltorio.__wrapped_instrumentacao__ = True
+        return envoltorio
+    return decorador
+
+
+def instrumentar_classe(cls, prefixo: str, metodos: List[str] = None):
+    """Aplica `cronometrado` aos métodos públicos (ou aos listados) da classe"""
+    for nome, atributo in list(vars(cls).items()):
+        if metodos is not None and nome not in metodos:
+            continue
+        if metodos is None and nome.startswith("_"):
+            continue
+
+        if isinstance(atributo, staticmethod):
+            funcao = atributo.__func__
+            if not getattr(funcao, "__wrapped_instrumentacao__", False):
+                setattr(cls, nome, staticmethod(cronometrado(f"{prefixo}.{nome}")(funcao)))
+        elif callable(atributo) and not getattr(atributo, "__wrapped_instrumentacao__", False):
+            setattr(cls, nome, cronometrado(f"{prefixo}.{nome}")(atributo))
+    return cls
+
+
+class CronometroSecoes:
+    """Mede seções consecutivas de um script sem reindentar o código"""
+
+    def __init__(self, prefixo: str):
+        self.prefixo = prefixo
+        self._atual = None
+
+    def marcar(self, nome: str):
+        """Encerra a seção anterior (se houver) e inicia a próxima"""
+        self.encerrar()
+        self._atual = medir(f"{self.prefixo}.{nome}")
+        self._atual.__enter__()
+
+    def encerrar(self):
+        if self._atual is not None:
+            atual, self._atual = self._atual, None
+            atual.__exit__(None, None, None)
+
+
+# ==========================================
+# CONTAGEM DE COMANDOS SQL
+# ==========================================
+
+# O início fica no contexto de execução de cada comando (e não por thread):
+# o gerenciador assíncrono roda várias consultas ao mesmo tempo na thread do loop
+_ATRIBUTO_INICIO = "_internews_inicio"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_sql(conn, cursor, statement, parameters, context, executemany):
+    inicio = time.perf_counter()
+    if context is not None:
+        setattr(context, _ATRIBUTO_INICIO, inicio)
+    else:
+        conn.info.setdefault(_ATRIBUTO_INICIO, {})[id(cursor)] = inicio
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _depois_sql(conn, cursor, statement, parameters, context, executemany):
+    fim = time.perf_counter()
+    if context is not None:
+        inicio = getattr(context, _ATRIBUTO_INICIO, fim)
+    else:
+        inicio = conn.info.get(_ATRIBUTO_INICIO, {}).pop(id(cursor), fim)
+    duracao = fim - inicio
+
+    coletor = _execucao.get()
+    if coletor is not None:
+        with coletor._lock:
+            coletor.sql_comandos += 1
+            coletor.sql_tempo += duracao
+
+    # Atribui ao bloco medido mais interno (e aos que o envolvem)
+    for medicao in _pilha.get():
+        medicao.sql_comandos += 1
+        medicao.sql_tempo += duracao
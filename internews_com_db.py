@@ -1,18 +1,31 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
 import pandas as pd
-import re
+import numpy as np
 import io
-import unicodedata
-from dataclasses import dataclass
+import uuid
 from typing import List, Dict, Tuple
 from datetime import datetime
-import plotly.express as px
-import plotly.graph_objects as go
-from pathlib import Path
 
 # Importar gerenciador de banco de dados
 from database_manager import GerenciadorBancoDados
+from database_manager_async import carregar_barra_lateral
+from models import nome_backend
+
+# Importar parser de logs e pipeline de ingestão
+from log_parser import LogParser, TECNICOS_PADRAO
+from ingestao import PipelineIngestao
+from instrumentacao import CronometroSecoes, REGISTRO, finalizar_execucao, iniciar_execucao
+from perfilamento import perfilamento_ativo, perfilar
+from agregacao import ModeloVisao, calcular_modelo_visao
+from cache_visoes import CacheVisoes, hash_dataframe, hash_uploads
+from cache_consultas import CACHE_CONSULTAS
+from tabela_paginada import (
+    aplicar_alteracoes,
+    limpar_editor,
+    renderizar_editor_paginado,
+    renderizar_tabela_paginada,
+)
 
 # ==========================================
 # 1. CONFIGURAÇÕES E DADOS PADRONIZADOS
@@ -25,241 +38,46 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Inicializar banco de dados na primeira execução
+# Inicializar banco de dados uma vez por processo (e não a cada nova sessão)
+@st.cache_resource(show_spinner=False)
+def inicializar_banco() -> Tuple[bool, str]:
+    return GerenciadorBancoDados.inicializar()
+
+
 if 'db_inicializado' not in st.session_state:
-    sucesso, msg = GerenciadorBancoDados.inicializar()
+    sucesso, msg = inicializar_banco()
     st.session_state.db_inicializado = sucesso
     if not sucesso:
+        # Falha não fica em cache: a próxima sessão tenta de novo
+        inicializar_banco.clear()
         st.error(f"❌ Erro ao inicializar banco de dados: {msg}")
 
-# LISTA OFICIAL DE TÉCNICOS (Destino Final)
-TECNICOS_PADRAO = [
-    "Claudia Liliane", 
-    "Gustavo Almeida", 
-    "Gustavo Kauan", 
-    "Alcelio Santos", 
-    "Jarbas Fred", 
-    "Daniela Nogueira", 
-    "Eulis Gaudencio", 
-    "Gabriel Gilvan", 
-    "Luiz Eduardo", 
-    "Ricardo", 
-    "Lucas Correa"
-]
-
-# MAPA DE NORMALIZAÇÃO
-MAPA_TECNICOS = {
-    "claudia": "Claudia Liliane",
-    "liliane": "Claudia Liliane",
-    
-    "gustavo almeida": "Gustavo Almeida",
-    "gustavo kauan": "Gustavo Kauan",
-    "gutavo": "Gustavo Kauan",
-    "gustavo": "Gustavo Kauan",
-    
-    "alcelio": "Alcelio Santos",
-    "santos": "Alcelio Santos",
-    
-    "jarbas": "Jarbas Fred",
-    "fred": "Jarbas Fred",
-    
-    "daniela": "Daniela Nogueira",
-    "nogueira": "Daniela Nogueira",
-    
-    "eulis": "Eulis Gaudencio",
-    "gaudencio": "Eulis Gaudencio",
-    
-    "gabriel": "Gabriel Gilvan",
-    "gilvan": "Gabriel Gilvan",
-    
-    "luiz": "Luiz Eduardo",
-    "eduardo": "Luiz Eduardo",
-    "luis": "Luiz Eduardo",
-    
-    "ricardo": "Ricardo",
-    
-    "lucas": "Lucas Correa",
-    "correa": "Lucas Correa",
-    
-    "ludmilla": "Ludmilla Oliveira",
-}
-
 # ==========================================
 # 2. MOTOR DE PROCESSAMENTO (BACKEND)
 # ==========================================
-
-class LogParser:
-    def __init__(self):
-        self.re_bloco = re.compile(r"(\d{6}\s+\d{6}.*?)(?=\d{6}\s+\d{6}|\Z)", re.DOTALL)
-        self.re_data = re.compile(r"(\d{2}/\d{2}/\d{4})")
-        self.re_cliente = re.compile(r"\[SAMUEL\s+(.*?)(?:\n|$)", re.IGNORECASE)
-        self.re_suporte = re.compile(r"Suporte[\s:.-]*([^\n\r]+)", re.IGNORECASE)
-        self.re_texto_atendimento = re.compile(r"Atendiment.*?\s+(.*?)(?:Internews:|$)", re.DOTALL | re.IGNORECASE)
-        self.re_versao = re.compile(r"Internews:\s*([\d\.]+)", re.IGNORECASE)
-
-    def normalizar_texto_base(self, texto: str) -> str:
-        """Remove acentos e coloca em minúsculas para busca no dicionário."""
-        if not isinstance(texto, str): 
-            return ""
-        texto = unicodedata.normalize('NFKD', texto).encode('ASCII', 'ignore').decode('utf-8')
-        return texto.strip(" .-:").lower()
-
-    def identificar_tecnico_por_nome(self, nome_bruto: str) -> str:
-        """Recebe um fragmento de nome e retorna o nome Padronizado."""
-        nome_limpo = self.normalizar_texto_base(nome_bruto)
-        
-        for chave, valor_padrao in MAPA_TECNICOS.items():
-            if chave in nome_limpo:
-                return valor_padrao
-        
-        return nome_bruto.title()
-
-    def extrair_tecnicos(self, texto_bruto: str) -> List[str]:
-        """Divide a string de suporte em múltiplos técnicos e normaliza cada um."""
-        if not texto_bruto:
-            return ["Nao Informado"]
-        
-        texto_norm = self.normalizar_texto_base(texto_bruto)
-        texto_limpo = re.sub(r"(\s+e\s+|\s*/\s*|\s*&\s*|\s*,\s*)", "|", texto_norm)
-        
-        nomes_encontrados = []
-        partes = texto_limpo.split('|')
-        
-        for parte in partes:
-            nome_fragmento = parte.strip()
-            if not nome_fragmento: 
-                continue
-            
-            nome_padronizado = self.identificar_tecnico_por_nome(nome_fragmento)
-            
-            if nome_padronizado:
-                nomes_encontrados.append(nome_padronizado)
-            
-        return nomes_encontrados if nomes_encontrados else ["Nao Informado"]
-
-    def classificar_tipo(self, texto: str) -> str:
-        """Classifica o tipo de atendimento baseado no texto."""
-        texto_lower = self.normalizar_texto_base(texto)
-        if "treinamento" in texto_lower: 
-            return "Treinamento"
-        elif "erro" in texto_lower: 
-            return "Erro"
-        elif "rotina" in texto_lower: 
-            return "Rotina"
-        else: 
-            return "Não Identificado"
-
-    def validar_arquivo(self, conteudo_texto: str) -> Tuple[bool, str]:
-        """Valida se o arquivo tem o formato esperado."""
-        if not conteudo_texto or len(conteudo_texto.strip()) == 0:
-            return False, "Arquivo vazio"
-        
-        if not re.search(r"\d{6}\s+\d{6}", conteudo_texto):
-            return False, "Formato inválido: não encontrado padrão de O.S (XXXXXX XXXXXX)"
-        
-        if not re.search(r"\d{2}/\d{2}/\d{4}", conteudo_texto):
-            return False, "Formato inválido: não encontrada data (DD/MM/YYYY)"
-        
-        blocos = self.re_bloco.findall(conteudo_texto)
-        if len(blocos) == 0:
-            return False, "Nenhum bloco de atendimento encontrado"
-        
-        return True, f"Arquivo válido: {len(blocos)} bloco(s) encontrado(s)"
-
-    def processar_arquivo(self, conteudo_texto: str) -> pd.DataFrame:
-        """Processa o arquivo e retorna um DataFrame com os dados."""
-        registros = []
-        blocos = self.re_bloco.findall(conteudo_texto)
-        
-        for bloco in blocos:
-            data = (self.re_data.search(bloco) or ["N/D", "N/D"])[1] if self.re_data.search(bloco) else "N/D"
-            os = bloco[:6]
-            cliente = (self.re_cliente.search(bloco) or ["", "Cliente Não Identificado"])[1].strip()
-            
-            suporte_match = self.re_suporte.search(bloco)
-            tecnico_raw = suporte_match.group(1) if suporte_match else "Nao Informado"
-            tecnico_raw = tecnico_raw.strip(" .")
-            
-            lista_tecnicos = self.extrair_tecnicos(tecnico_raw)
-            
-            texto_atend_match = self.re_texto_atendimento.search(bloco)
-            texto_atendimento = texto_atend_match.group(1).strip() if texto_atend_match else ""
-            
-            tipo = self.classificar_tipo(texto_atendimento)
-            versao = (self.re_versao.search(bloco) or ["", ""])[1]
-
-            for tech in lista_tecnicos:
-                registros.append({
-                    "Data": data,
-                    "O.S": os,
-                    "Cliente": cliente.upper(),
-                    "Técnico": tech,
-                    "Tipo": tipo,
-                    "Versão Internews": versao,
-                    "Detalhe Atendimento": texto_atendimento,
-                    "Suporte Original (Log)": tecnico_raw
-                })
-            
-        return pd.DataFrame(registros)
+# LogParser e PipelineIngestao ficam em log_parser.py e ingestao.py para
+# poderem ser usados fora do Streamlit.
 
 # ==========================================
 # 3. EXPORTADORES
 # ==========================================
 
-class ExportadorDados:
-    @staticmethod
-    def exportar_excel(df: pd.DataFrame) -> bytes:
-        """Exporta para Excel com formatação."""
-        buffer = io.BytesIO()
-        with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-            df.to_excel(writer, index=False, sheet_name='Dados')
-            
-            workbook = writer.book
-            worksheet = writer.sheets['Dados']
-            
-            format_red = workbook.add_format({'bg_color': '#FFC7CE', 'font_color': '#9C0006'})
-            worksheet.conditional_format('E2:E1000', {
-                'type': 'text',
-                'criteria': 'containing',
-                'value': 'Não Identificado',
-                'format': format_red
-            })
-            
-            format_yellow = workbook.add_format({'bg_color': '#FFEB9C', 'font_color': '#9C6500'})
-            worksheet.conditional_format('D2:D1000', {
-                'type': 'text',
-                'criteria': 'containing',
-                'value': 'Nao Informado',
-                'format': format_yellow
-            })
-            
-            for column in worksheet.table:
-                max_len = max(df[column].astype(str).str.len().max(), len(column))
-                worksheet.set_column(worksheet.table.columns[column], max_len + 2)
-        
-        buffer.seek(0)
-        return buffer.getvalue()
-
-    @staticmethod
-    def exportar_csv(df: pd.DataFrame) -> bytes:
-        """Exporta para CSV."""
-        return df.to_csv(index=False, encoding='utf-8').encode('utf-8')
-
-    @staticmethod
-    def exportar_json(df: pd.DataFrame) -> bytes:
-        """Exporta para JSON."""
-        return df.to_json(orient='records', ensure_ascii=False, indent=2).encode('utf-8')
+# ExportadorDados fica em exportacao.py e só é importado quando o usuário
+# clica no botão de download.
 
 # ==========================================
 # 4. INTERFACE (STREAMLIT)
 # ==========================================
 
-def criar_graficos(df: pd.DataFrame) -> Dict:
-    """Cria gráficos interativos com Plotly."""
+def criar_graficos(modelo: ModeloVisao) -> Dict:
+    """Cria gráficos interativos com Plotly a partir do modelo de visão."""
+    # Import tardio: plotly pesa no tempo de carregamento da primeira página
+    import plotly.express as px
+    
     graficos = {}
     
     # Gráfico 1: Atendimentos por Técnico
-    tech_counts = df['Técnico'].value_counts()
+    tech_counts = modelo.serie('tecnicos')
     fig_tech = px.bar(
         x=tech_counts.index, 
         y=tech_counts.values,
@@ -272,7 +90,7 @@ def criar_graficos(df: pd.DataFrame) -> Dict:
     graficos['tecnicos'] = fig_tech
     
     # Gráfico 2: Distribuição por Tipo
-    tipo_counts = df['Tipo'].value_counts()
+    tipo_counts = modelo.serie('tipos')
     fig_tipo = px.pie(
         values=tipo_counts.values,
         names=tipo_counts.index,
@@ -283,7 +101,7 @@ def criar_graficos(df: pd.DataFrame) -> Dict:
     graficos['tipos'] = fig_tipo
     
     # Gráfico 3: Atendimentos por Cliente (Top 10)
-    cliente_counts = df['Cliente'].value_counts().head(10)
+    cliente_counts = modelo.serie('clientes', limite=10)
     fig_cliente = px.bar(
         x=cliente_counts.values,
         y=cliente_counts.index,
@@ -297,7 +115,7 @@ def criar_graficos(df: pd.DataFrame) -> Dict:
     graficos['clientes'] = fig_cliente
     
     # Gráfico 4: Versões Utilizadas
-    versao_counts = df['Versão Internews'].value_counts()
+    versao_counts = modelo.serie('versoes')
     fig_versao = px.bar(
         x=versao_counts.index,
         y=versao_counts.values,
@@ -311,13 +129,311 @@ def criar_graficos(df: pd.DataFrame) -> Dict:
     
     return graficos
 
-def main():
-    st.title("📊 Relatório Mensal - InterNews PRO (com PostgreSQL)")
+def processar_uploads(uploaded_files) -> Tuple[pd.DataFrame, List[Tuple[str, str]], List[Tuple[int, str]]]:
+    """
+    Valida, processa e grava os arquivos enviados.
+    Retorna o DataFrame combinado (indexado pelo ID do registro), as
+    mensagens de status (nível, texto), que são reexibidas quando o
+    resultado vem do cache, e as análises gravadas (ID, arquivo).
+    """
+    all_dfs = []
+    mensagens = []
+    analises = []
+    parser = LogParser()
+    pipeline = PipelineIngestao(parser)
+    
+    for uploaded_file in uploaded_files:
+        try:
+            with st.spinner(f"Processando {uploaded_file.name}..."):
+                stringio = io.StringIO(uploaded_file.getvalue().decode("utf-8"))
+                conteudo = stringio.read()
+                
+                # Validação
+                is_valid, msg = parser.validar_arquivo(conteudo)
+                
+                if not is_valid:
+                    mensagens.append(("error", f"❌ {uploaded_file.name}: {msg}"))
+                    continue
+                
+                mensagens.append(("success", f"✅ {uploaded_file.name}: {msg}"))
+                
+                # Processamento, agregação e gravação em estágios sobrepostos
+                resultado = pipeline.executar(conteudo, uploaded_file.name, usuario="admin")
+                df = resultado.df
+                
+                if df.empty:
+                    mensagens.append(("warning", f"⚠️ {uploaded_file.name}: Nenhum registro encontrado"))
+                    continue
+                
+                all_dfs.append(df)
+                
+                if resultado.tecnicos_nao_resolvidos:
+                    nomes = ", ".join(
+                        f"{nome} ({quantidade})"
+                        for nome, quantidade in list(resultado.tecnicos_nao_resolvidos.items())[:10]
+                    )
+                    mensagens.append((
+                        "warning",
+                        f"⚠️ {uploaded_file.name}: {len(resultado.tecnicos_nao_resolvidos)} técnico(s) "
+                        f"não reconhecido(s) para revisão: {nomes}"
+                    ))
+                
+                if resultado.sucesso_analise:
+                    mensagens.append(("info", f"✅ Análise salva no banco de dados (ID: {resultado.analise_id})"))
+                    analises.append((resultado.analise_id, uploaded_file.name))
+                    
+                    if resultado.sucesso_registros:
+                        mensagens.append(("success", resultado.msg_registros))
+                    else:
+                        mensagens.append(("error", f"❌ {resultado.msg_registros}"))
+                else:
+                    mensagens.append(("error", f"❌ Erro ao salvar: {resultado.msg_analise}"))
+                
+        except Exception as e:
+            mensagens.append(("error", f"❌ Erro ao processar {uploaded_file.name}: {str(e)}"))
+    
+    # Combinar todos os DataFrames
+    df_completo = pd.concat(all_dfs) if all_dfs else pd.DataFrame()
+    return df_completo, mensagens, analises
+
+def obter_ingestao(uploaded_files, hash_upload: str) -> Dict:
+    """
+    Resultado da ingestão do upload atual, guardado na sessão: cada upload é
+    processado (e gravado no banco) uma única vez por sessão. A chave soma ao
+    hash um identificador da ingestão, para que as visões derivadas no cache
+    compartilhado não se misturem entre sessões que enviem o mesmo arquivo.
+    """
+    ingestao = st.session_state.get('ingestao')
+    if ingestao is not None and ingestao['hash'] == hash_upload:
+        return ingestao
+    
+    if ingestao is not None:
+        anterior = ingestao['chave']
+        obter_cache_visoes().invalidar(lambda chave: anterior in str(chave))
+    
+    df_completo, mensagens, analises = processar_uploads(uploaded_files)
+    ingestao = {
+        'hash': hash_upload,
+        'chave': f"{hash_upload}:{uuid.uuid4().hex}",
+        'df': df_completo,
+        'mensagens': mensagens,
+        'analises': analises,
+    }
+    st.session_state.ingestao = ingestao
+    return ingestao
+
+def filtrar_visao(df: pd.DataFrame, filtro_tecnico: List[str], filtro_tipo: List[str], filtro_cliente: List[str]) -> pd.DataFrame:
+    """Aplica os filtros da tela sem copiar o DataFrame completo."""
+    mascara = np.ones(len(df), dtype=bool)
+    
+    if filtro_tecnico:
+        mascara &= df["Técnico"].isin(filtro_tecnico).to_numpy()
+    if filtro_tipo:
+        mascara &= df["Tipo"].isin(filtro_tipo).to_numpy()
+    if filtro_cliente:
+        mascara &= df["Cliente"].isin(filtro_cliente).to_numpy()
+    
+    return df[mascara]
+
+def renderizar_tendencias():
+    """Séries mensais do histórico a partir dos resumos pré-agregados no banco."""
+    meses = st.select_slider(
+        "Meses de histórico",
+        options=[3, 6, 12, 24, 36],
+        value=12,
+        key="tendencias_meses"
+    )
+    
+    sucesso, por_tecnico = GerenciadorBancoDados.obter_tendencia_tecnicos(meses)
+    if not sucesso:
+        st.error(f"❌ {por_tecnico}")
+        return
+    if por_tecnico.empty:
+        st.info("Nenhum atendimento com data no histórico")
+        return
+    
+    col_t1, col_t2 = st.columns(2)
+    
+    with col_t1:
+        st.markdown("**Atendimentos por Mês e Tipo:**")
+        st.bar_chart(por_tecnico.pivot_table(
+            index="mes", columns="tipo", values="atendimentos", aggfunc="sum", fill_value=0
+        ))
+    
+    with col_t2:
+        st.markdown("**Atendimentos por Técnico:**")
+        st.line_chart(por_tecnico.pivot_table(
+            index="mes", columns="tecnico", values="atendimentos", aggfunc="sum", fill_value=0
+        ))
+    
+    sucesso, por_cliente = GerenciadorBancoDados.obter_tendencia_clientes(meses, limite=10)
+    if sucesso and not por_cliente.empty:
+        st.markdown("**Top 10 Clientes por Mês:**")
+        st.line_chart(por_cliente.pivot_table(
+            index="mes", columns="cliente", values="atendimentos", aggfunc="sum", fill_value=0
+        ))
+
+def renderizar_comparacao(historico: List[Dict]):
+    """Compara duas análises gravadas a partir dos agregados do banco."""
+    if len(historico) < 2:
+        st.info("São necessárias ao menos duas análises no histórico")
+        return
+    
+    rotulos = {item['id']: f"{item['id']} - {item['arquivo']} ({item['timestamp'][:10]})" for item in historico}
+    ids = list(rotulos)
+    col_a, col_b = st.columns(2)
+    with col_a:
+        analise_a = st.selectbox("Análise base (A)", ids, index=1, format_func=rotulos.get, key="comparar_a")
+    with col_b:
+        analise_b = st.selectbox("Comparar com (B)", ids, index=0, format_func=rotulos.get, key="comparar_b")
+    
+    if analise_a == analise_b:
+        st.warning("Selecione duas análises diferentes")
+        return
+    
+    sucesso, comparacao = GerenciadorBancoDados.comparar_analises(analise_a, analise_b)
+    if not sucesso:
+        st.error(f"❌ {comparacao}")
+        return
+    
+    colunas = st.columns(len(comparacao["totais"]))
+    for coluna, linha in zip(colunas, comparacao["totais"].itertuples()):
+        with coluna:
+            st.metric(linha.metrica, linha.b, delta=int(linha.delta))
+    
+    nomes = {"a": "A", "b": "B", "delta": "Δ"}
+    col_t1, col_t2 = st.columns(2)
+    with col_t1:
+        st.markdown("**Por Técnico:**")
+        st.dataframe(comparacao["tecnicos"].rename(columns={**nomes, "tecnico": "Técnico"}), use_container_width=True, hide_index=True)
+    with col_t2:
+        st.markdown("**Por Tipo:**")
+        st.dataframe(comparacao["tipos"].rename(columns={**nomes, "tipo": "Tipo"}), use_container_width=True, hide_index=True)
+    
+    novos, perdidos = comparacao["clientes_novos"], comparacao["clientes_perdidos"]
+    col_c1, col_c2 = st.columns(2)
+    with col_c1:
+        st.markdown(f"**Clientes novos em B:** {len(novos)}")
+        if novos:
+            st.caption(", ".join(novos[:30]) + (" ..." if len(novos) > 30 else ""))
+        st.markdown(f"**Clientes sem atendimento em B:** {len(perdidos)}")
+        if perdidos:
+            st.caption(", ".join(perdidos[:30]) + (" ..." if len(perdidos) > 30 else ""))
+    with col_c2:
+        st.markdown("**Maiores variações por Cliente:**")
+        clientes = comparacao["clientes"]
+        variacoes = clientes.reindex(clientes["delta"].abs().sort_values(ascending=False).index).head(10)
+        st.dataframe(variacoes.rename(columns={**nomes, "cliente": "Cliente"}), use_container_width=True, hide_index=True)
+    
+    migracao = comparacao["migracao_versoes"]
+    if not migracao.empty:
+        st.markdown("**Migração de Versões (clientes por versão predominante A → B):**")
+        st.dataframe(
+            migracao.pivot_table(index="versao_a", columns="versao_b", values="clientes", aggfunc="sum", fill_value=0),
+            use_container_width=True
+        )
+
+@st.cache_resource
+def obter_cache_visoes() -> CacheVisoes:
+    """Cache de visões compartilhado por todas as sessões do processo."""
+    return CacheVisoes()
+
+def renderizar_diagnostico():
+    """Mostra as medições da execução anterior e os totais do processo."""
+    coletor = st.session_state.get('diagnostico')
+    
+    if coletor is None:
+        st.info("As medições aparecem a partir da próxima interação")
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("⏱️ Última execução", f"{coletor.duracao * 1000:.0f} ms")
+        with col2:
+            st.metric("🗄️ Comandos SQL", coletor.sql_comandos, help=f"{coletor.sql_tempo * 1000:.0f} ms em SQL")
+        
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Operação": m.nome,
+                    "ms": round(m.duracao * 1000, 1),
+                    "Linhas": m.linhas,
+                    "SQL": m.sql_comandos,
+                    "SQL ms": round(m.sql_tempo * 1000, 1),
+                    "Erro": m.erro or ""
+                }
+                for m in coletor.medicoes
+            ]),
+            use_container_width=True,
+            hide_index=True
+        )
+    
+    perfil = st.session_state.get('perfil')
+    if perfil is not None and perfil.aviso:
+        st.caption(f"🔬 {perfil.aviso}")
+    if perfil is not None and perfil.resumo:
+        st.caption(f"🔬 Perfil gravado: {', '.join(perfil.arquivos)}")
+        st.download_button(
+            label="🔬 Resumo do perfil",
+            data=perfil.resumo,
+            file_name=f"perfil_{perfil.etiqueta[:16]}.txt",
+            mime="text/plain"
+        )
+    
+    with st.expander("Totais do processo"):
+        totais = REGISTRO.instantaneo()
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Operação": nome,
+                    "Chamadas": op["contagem"],
+                    "Média ms": round(op["soma"] / op["contagem"] * 1000, 1),
+                    "Máx ms": round(op["maximo"] * 1000, 1),
+                    "SQL": op["sql_comandos"],
+                    "Erros": op["erros"]
+                }
+                for nome, op in sorted(totais.items())
+            ]),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.download_button(
+            label="📈 Métricas (Prometheus)",
+            data=REGISTRO.formato_prometheus,
+            file_name="internews_metricas.prom",
+            mime="text/plain"
+        )
+    
+    with st.expander("Cache de consultas"):
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "Consulta": nome,
+                    "Acertos": c["acertos"],
+                    "Falhas": c["falhas"],
+                    "Taxa": f"{c['taxa_acerto']:.0%}",
+                    "Itens": f"{c['itens']}/{c['maximo']}",
+                    "TTL s": c["ttl"]
+                }
+                for nome, c in CACHE_CONSULTAS.estatisticas().items()
+            ]),
+            use_container_width=True,
+            hide_index=True
+        )
+
+def main(secoes: CronometroSecoes = None):
+    secoes = secoes or CronometroSecoes("ui")
+    st.title(f"📊 Relatório Mensal - InterNews PRO (com {nome_backend()})")
+    
+    # Consultas independentes da barra lateral disparadas juntas
+    secoes.marcar("consultas_barra_lateral")
+    barra_lateral = carregar_barra_lateral()
     
     # Sidebar
     with st.sidebar:
         st.header("⚙️ Configurações")
-        tab_upload, tab_historico, tab_stats, tab_info = st.tabs(["Upload", "Histórico", "Estatísticas", "Informações"])
+        tab_upload, tab_historico, tab_stats, tab_info, tab_diag = st.tabs(
+            ["Upload", "Histórico", "Estatísticas", "Informações", "Diagnóstico"]
+        )
         
         with tab_upload:
             st.subheader("Carregar Arquivo")
@@ -329,8 +445,28 @@ def main():
             )
         
         with tab_historico:
+            secoes.marcar("historico")
             st.subheader("Histórico de Análises")
-            sucesso, historico = GerenciadorBancoDados.obter_historico_completo()
+            sucesso, historico = barra_lateral["historico"]
+            
+            # Filtros avaliados no banco sobre as distribuições de tipos/versões
+            if sucesso and historico:
+                with st.expander("🔎 Filtrar"):
+                    tipos_conhecidos = sorted({tipo for item in historico for tipo in item['tipos']})
+                    filtro_tipo_hist = st.selectbox("Tipo", [""] + tipos_conhecidos, key="hist_tipo")
+                    minimo_tipo = st.number_input("Mínimo de atendimentos do tipo", min_value=0, value=0, step=10, key="hist_minimo")
+                    versoes_hist = st.text_input("Versões (separadas por vírgula)", key="hist_versoes")
+                versoes_hist = [v.strip() for v in versoes_hist.split(",") if v.strip()]
+                if filtro_tipo_hist or versoes_hist:
+                    sucesso, historico = GerenciadorBancoDados.filtrar_analises(
+                        tipo=filtro_tipo_hist or None,
+                        minimo=minimo_tipo or None,
+                        versoes=versoes_hist or None
+                    )
+                    if sucesso:
+                        st.caption(f"{len(historico)} análise(s) encontrada(s)")
+                    else:
+                        st.error(f"❌ {historico}")
             
             if sucesso and historico:
                 for i, item in enumerate(historico[:10]):
@@ -340,6 +476,8 @@ def main():
                         st.write(f"**Técnicos:** {item['tecnicos_unicos']}")
                         st.write(f"**Clientes:** {item['clientes_unicos']}")
                         st.write(f"**Tipos:** {item['tipos']}")
+                        if item.get('arquivada'):
+                            st.caption("🗄️ Registros no arquivo Parquet (somente leitura)")
                         
                         # Botão para carregar análise anterior
                         if st.button(f"📂 Carregar Análise {item['id']}", key=f"load_{item['id']}"):
@@ -349,8 +487,9 @@ def main():
                 st.info("Nenhuma análise anterior encontrada")
         
         with tab_stats:
+            secoes.marcar("estatisticas_gerais")
             st.subheader("Estatísticas Gerais")
-            sucesso, stats = GerenciadorBancoDados.obter_estatisticas_gerais()
+            sucesso, stats = barra_lateral["estatisticas"]
             
             if sucesso:
                 col1, col2 = st.columns(2)
@@ -362,92 +501,71 @@ def main():
                     st.metric("🏢 Clientes Únicos", stats['clientes_unicos'])
         
         with tab_info:
+            secoes.marcar("informacoes")
             st.subheader("Sobre")
-            st.markdown("""
-            **Versão:** 2.0 Pro (com PostgreSQL)
+            st.markdown(f"""
+            **Versão:** 2.0 Pro (com {nome_backend()})
             
             **Funcionalidades:**
             - ✅ Validação automática de formato
             - ✅ Edição manual de dados
             - ✅ Múltiplos formatos de exportação
             - ✅ Gráficos interativos
-            - ✅ **Histórico em PostgreSQL**
+            - ✅ **Histórico em {nome_backend()}**
             - ✅ Estatísticas gerais
             - ✅ Busca avançada
             
-            **Banco de Dados:** PostgreSQL
+            **Banco de Dados:** {nome_backend()}
             **Status:** ✅ Conectado
             """)
+            
+            stats_cache = obter_cache_visoes().estatisticas()
+            st.caption(
+                f"Cache de visões: {stats_cache['acertos']} acertos / {stats_cache['falhas']} falhas "
+                f"({stats_cache['taxa_acerto']:.0%}) · "
+                f"{stats_cache['bytes_usados'] / 1024 / 1024:.1f} de "
+                f"{stats_cache['limite_bytes'] / 1024 / 1024:.0f} MB"
+            )
+    
+        with tab_diag:
+            st.subheader("Diagnóstico")
+            renderizar_diagnostico()
+    
+    # Tendências do histórico (aberta quando não há upload)
+    secoes.marcar("tendencias")
+    with st.expander("📈 Tendências", expanded=not uploaded_files):
+        renderizar_tendencias()
+    
+    secoes.marcar("comparacao")
+    with st.expander("⚖️ Comparar Análises"):
+        sucesso, historico = barra_lateral["historico"]
+        if sucesso:
+            renderizar_comparacao(historico)
+        else:
+            st.error(f"❌ {historico}")
     
     # Processamento de arquivos
     if uploaded_files:
-        all_dfs = []
-        parser = LogParser()
-        
-        for uploaded_file in uploaded_files:
-            try:
-                with st.spinner(f"Processando {uploaded_file.name}..."):
-                    stringio = io.StringIO(uploaded_file.getvalue().decode("utf-8"))
-                    conteudo = stringio.read()
-                    
-                    # Validação
-                    is_valid, msg = parser.validar_arquivo(conteudo)
-                    
-                    if not is_valid:
-                        st.error(f"❌ {uploaded_file.name}: {msg}")
-                        continue
-                    
-                    st.success(f"✅ {uploaded_file.name}: {msg}")
-                    
-                    # Processamento
-                    df = parser.processar_arquivo(conteudo)
-                    
-                    if df.empty:
-                        st.warning(f"⚠️ {uploaded_file.name}: Nenhum registro encontrado")
-                        continue
-                    
-                    all_dfs.append(df)
-                    
-                    # Salvar no banco de dados
-                    tipos_dist = df['Tipo'].value_counts().to_dict()
-                    versoes_dist = df['Versão Internews'].value_counts().to_dict()
-                    
-                    sucesso, msg, analise_id = GerenciadorBancoDados.salvar_analise(
-                        nome_arquivo=uploaded_file.name,
-                        total_registros=len(df),
-                        tecnicos_unicos=df['Técnico'].nunique(),
-                        clientes_unicos=df['Cliente'].nunique(),
-                        os_unicas=df['O.S'].nunique(),
-                        tipos_distribuicao=tipos_dist,
-                        versoes_utilizadas=versoes_dist,
-                        usuario="admin"
-                    )
-                    
-                    if sucesso:
-                        st.info(f"✅ Análise salva no banco de dados (ID: {analise_id})")
-                        
-                        # Salvar registros
-                        sucesso_reg, msg_reg = GerenciadorBancoDados.salvar_registros(
-                            analise_id, 
-                            df.to_dict('records')
-                        )
-                        if sucesso_reg:
-                            st.success(msg_reg)
-                    else:
-                        st.error(f"❌ Erro ao salvar: {msg}")
-                    
-            except Exception as e:
-                st.error(f"❌ Erro ao processar {uploaded_file.name}: {str(e)}")
+        secoes.marcar("ingestao")
+        cache = obter_cache_visoes()
+        hash_upload = hash_uploads(uploaded_files)
+        st.session_state.hash_upload_atual = hash_upload
         
-        if not all_dfs:
-            st.stop()
+        # O upload é gravado no banco uma vez por sessão; o cache guarda só as visões
+        ingestao = obter_ingestao(uploaded_files, hash_upload)
+        chave_upload = ingestao['chave']
+        df_completo, mensagens, analises = ingestao['df'], ingestao['mensagens'], ingestao['analises']
+        
+        for nivel, texto in mensagens:
+            getattr(st, nivel)(texto)
         
-        # Combinar todos os DataFrames
-        df_completo = pd.concat(all_dfs, ignore_index=True)
+        if df_completo.empty:
+            st.stop()
         
         # ==========================================
         # SEÇÃO DE FILTROS
         # ==========================================
+        secoes.marcar("filtros")
         st.divider()
         st.subheader("🔍 Filtros")
         
@@ -464,42 +582,55 @@ def main():
         with col_f3:
             filtro_cliente = st.multiselect("🏢 Cliente (Top 10)", options=df_completo['Cliente'].value_counts().head(10).index.tolist())
         
-        # Aplicar filtros
-        df_view = df_completo.copy()
-        
-        if filtro_tecnico:
-            df_view = df_view[df_view["Técnico"].isin(filtro_tecnico)]
-        if filtro_tipo:
-            df_view = df_view[df_view["Tipo"].isin(filtro_tipo)]
-        if filtro_cliente:
-            df_view = df_view[df_view["Cliente"].isin(filtro_cliente)]
+        # Aplicar filtros (memoizado por upload + filtros)
+        chave_filtros = (
+            chave_upload,
+            tuple(sorted(filtro_tecnico)),
+            tuple(sorted(filtro_tipo)),
+            tuple(sorted(filtro_cliente))
+        )
+        df_view = cache.obter_ou_calcular(
+            ("visao",) + chave_filtros,
+            lambda: filtrar_visao(df_completo, filtro_tecnico, filtro_tipo, filtro_cliente)
+        )
+        
+        # Todos os agregados da visão em uma única passada
+        modelo = cache.obter_ou_calcular(
+            ("modelo",) + chave_filtros,
+            lambda: calcular_modelo_visao(df_view)
+        )
         
         # ==========================================
         # SEÇÃO DE KPIs
         # ==========================================
+        secoes.marcar("kpis")
         st.divider()
         st.subheader("📈 Resumo Executivo")
         
         kpi1, kpi2, kpi3, kpi4, kpi5 = st.columns(5)
         
         with kpi1:
-            st.metric("📌 O.S Únicas", df_view["O.S"].nunique())
+            st.metric("📌 O.S Únicas", modelo.os_unicas)
         with kpi2:
-            st.metric("👥 Pontuações", len(df_view))
+            st.metric("👥 Pontuações", modelo.total_registros)
         with kpi3:
-            st.metric("⚠️ Erros", len(df_view[df_view['Tipo'] == 'Erro']))
+            st.metric("⚠️ Erros", modelo.quantidade_tipo('Erro'))
         with kpi4:
-            st.metric("📚 Treinamentos", len(df_view[df_view['Tipo'] == 'Treinamento']))
+            st.metric("📚 Treinamentos", modelo.quantidade_tipo('Treinamento'))
         with kpi5:
-            st.metric("🔧 Rotinas", len(df_view[df_view['Tipo'] == 'Rotina']))
+            st.metric("🔧 Rotinas", modelo.quantidade_tipo('Rotina'))
         
         # ==========================================
         # SEÇÃO DE GRÁFICOS
         # ==========================================
+        secoes.marcar("graficos")
         st.divider()
         st.subheader("📊 Visualizações")
         
-        graficos = criar_graficos(df_view)
+        graficos = cache.obter_ou_calcular(
+            ("graficos",) + chave_filtros,
+            lambda: criar_graficos(modelo)
+        )
         
         col_g1, col_g2 = st.columns(2)
         with col_g1:
@@ -516,81 +647,123 @@ def main():
         # ==========================================
         # SEÇÃO DE EDIÇÃO MANUAL
         # ==========================================
+        secoes.marcar("edicao")
         st.divider()
         st.subheader("✏️ Edição Manual de Dados")
         
+        dados_editados = False
+        
+        if 'msg_edicao' in st.session_state:
+            st.success(st.session_state.pop('msg_edicao'))
+        
         with st.expander("Editar registros antes de exportar"):
-            df_editavel = st.data_editor(
-                df_view,
-                use_container_width=True,
-                num_rows="dynamic",
-                key="editor"
-            )
+            df_editavel, alteracoes = renderizar_editor_paginado(df_view, chave="editor")
             
-            if not df_editavel.equals(df_view):
+            if df_editavel is not df_view:
                 df_view = df_editavel
+                dados_editados = True
+                modelo = calcular_modelo_visao(df_view)
                 st.success("✅ Dados atualizados!")
+            
+            if any(alteracoes.values()):
+                analise_destino = None
+                if alteracoes["inseridos"] and analises:
+                    analise_destino = st.selectbox(
+                        "Análise que receberá os registros novos",
+                        analises,
+                        format_func=lambda a: f"{a[0]} - {a[1]}"
+                    )[0]
+                
+                # Grava só o que mudou, em uma transação, por chave primária
+                if st.button("💾 Salvar alterações no banco de dados"):
+                    sucesso, msg, ids_inseridos = GerenciadorBancoDados.aplicar_alteracoes_registros(
+                        atualizados=alteracoes["atualizados"],
+                        inseridos=alteracoes["inseridos"],
+                        removidos=alteracoes["removidos"],
+                        analise_id_novos=analise_destino
+                    )
+                    
+                    if sucesso:
+                        # Visões, gráficos e exportações derivadas do upload ficam obsoletos
+                        ingestao['df'] = aplicar_alteracoes(df_completo, alteracoes, ids_inseridos)
+                        cache.invalidar(lambda chave: chave_upload in str(chave))
+                        limpar_editor("editor")
+                        st.session_state.msg_edicao = f"✅ {msg}"
+                        st.rerun()
+                    else:
+                        st.error(f"❌ {msg}")
         
         # ==========================================
         # SEÇÃO DE DETALHAMENTO
         # ==========================================
+        secoes.marcar("detalhamento")
         st.divider()
         st.subheader("📋 Detalhamento Completo")
         
-        col_search, col_display = st.columns([1, 2])
-        
-        with col_search:
-            search_term = st.text_input("🔎 Buscar na tabela:", "")
-        
-        if search_term:
-            df_search = df_view[
-                df_view.astype(str).apply(
-                    lambda x: x.str.contains(search_term, case=False, na=False).any(), axis=1
-                )
-            ]
-        else:
-            df_search = df_view
-        
-        st.dataframe(df_search, use_container_width=True, height=400)
+        renderizar_tabela_paginada(
+            df_view,
+            chave="detalhe",
+            memoizar=cache.obter_ou_calcular,
+            chave_base=None if dados_editados else chave_filtros
+        )
         
         # ==========================================
         # SEÇÃO DE EXPORTAÇÃO
         # ==========================================
+        secoes.marcar("exportacao")
         st.divider()
         st.subheader("💾 Exportar Dados")
         
-        col_exp1, col_exp2, col_exp3 = st.columns(3)
+        def exportacao_sob_demanda(formato, metodo, df=df_view):
+            # Executado só no clique; reaproveita o arquivo se os dados não mudaram
+            def gerar():
+                from exportacao import ExportadorDados
+                return getattr(ExportadorDados, metodo)(df)
+            return lambda: cache.obter_ou_calcular(
+                ("exportacao", formato, hash_dataframe(df)),
+                gerar
+            )
+        
+        sufixo_arquivo = f"relatorio_internews_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        
+        col_exp1, col_exp2, col_exp3, col_exp4 = st.columns(4)
         
         with col_exp1:
-            excel_data = ExportadorDados.exportar_excel(df_view)
             st.download_button(
                 label="📊 Excel",
-                data=excel_data,
-                file_name=f"relatorio_internews_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                data=exportacao_sob_demanda("xlsx", "exportar_excel"),
+                file_name=f"{sufixo_arquivo}.xlsx",
                 mime="application/vnd.ms-excel"
             )
         
         with col_exp2:
-            csv_data = ExportadorDados.exportar_csv(df_view)
             st.download_button(
                 label="📄 CSV",
-                data=csv_data,
-                file_name=f"relatorio_internews_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                data=exportacao_sob_demanda("csv", "exportar_csv"),
+                file_name=f"{sufixo_arquivo}.csv",
                 mime="text/csv"
             )
         
         with col_exp3:
-            json_data = ExportadorDados.exportar_json(df_view)
             st.download_button(
                 label="🔗 JSON",
-                data=json_data,
-                file_name=f"relatorio_internews_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                data=exportacao_sob_demanda("json", "exportar_json"),
+                file_name=f"{sufixo_arquivo}.json",
                 mime="application/json"
             )
         
+        with col_exp4:
+            st.download_button(
+                label="📜 NDJSON",
+                data=exportacao_sob_demanda("ndjson", "exportar_ndjson"),
+                file_name=f"{sufixo_arquivo}.ndjson",
+                mime="application/x-ndjson"
+            )
+        
         # ==========================================
         # ESTATÍSTICAS DETALHADAS
         # ==========================================
+        secoes.marcar("estatisticas_detalhadas")
         st.divider()
         st.subheader("📊 Estatísticas Detalhadas")
         
@@ -598,22 +771,29 @@ def main():
         
         with col_stat1:
             st.markdown("**Distribuição por Técnico:**")
-            tech_stats = df_view['Técnico'].value_counts()
+            tech_stats = modelo.serie('tecnicos')
             st.bar_chart(tech_stats)
         
         with col_stat2:
             st.markdown("**Distribuição por Tipo:**")
-            tipo_stats = df_view['Tipo'].value_counts()
+            tipo_stats = modelo.serie('tipos')
             st.bar_chart(tipo_stats)
         
         # Tabela de resumo
         st.markdown("**Resumo por Técnico:**")
-        resumo_tech = df_view.groupby('Técnico').agg({
-            'O.S': 'nunique',
-            'Cliente': 'nunique',
-            'Tipo': lambda x: (x == 'Erro').sum()
-        }).rename(columns={'O.S': 'O.S Únicas', 'Cliente': 'Clientes', 'Tipo': 'Erros'})
+        resumo_tech = modelo.resumo_tecnicos_df()
         st.dataframe(resumo_tech, use_container_width=True)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    coletor = iniciar_execucao()
+    secoes = CronometroSecoes("ui")
+    with perfilar(perfilamento_ativo(st.query_params)) as perfil:
+        try:
+            main(secoes)
+        finally:
+            # Também executa em st.stop()/st.rerun(), que interrompem o script
+            secoes.encerrar()
+            st.session_state.diagnostico = finalizar_execucao(coletor)
+            perfil.etiqueta = st.session_state.get('hash_upload_atual', perfil.etiqueta)
+            # O resumo é preenchido ao sair do perfilamento
+            st.session_state.perfil = perfil
\ No newline at end of file
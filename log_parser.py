@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Parser de logs de atendimento da aplicação InterNews
+Extrai blocos de O.S, normaliza técnicos e classifica atendimentos
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+from classificacao import ClassificadorTipos, obter_classificador
+from instrumentacao import instrumentar_classe
+from resolucao_tecnicos import ResolvedorTecnicos, obter_resolvedor
+
+# ==========================================
+# DADOS PADRONIZADOS
+# ==========================================
+
+# LISTA OFICIAL DE TÉCNICOS (Destino Final)
+TECNICOS_PADRAO = [
+    "Claudia Liliane", 
+    "Gustavo Almeida", 
+    "Gustavo Kauan", 
+    "Alcelio Santos", 
+    "Jarbas Fred", 
+    "Daniela Nogueira", 
+    "Eulis Gaudencio", 
+    "Gabriel Gilvan", 
+    "Luiz Eduardo", 
+    "Ricardo", 
+    "Lucas Correa"
+]
+
+# MAPA DE NORMALIZAÇÃO
+MAPA_TECNICOS = {
+    "claudia": "Claudia Liliane",
+    "liliane": "Claudia Liliane",
+    
+    "gustavo almeida": "Gustavo Almeida",
+    "gustavo kauan": "Gustavo Kauan",
+    "gutavo": "Gustavo Kauan",
+    "gustavo": "Gustavo Kauan",
+    
+    "alcelio": "Alcelio Santos",
+    "santos": "Alcelio Santos",
+    
+    "jarbas": "Jarbas Fred",
+    "fred": "Jarbas Fred",
+    
+    "daniela": "Daniela Nogueira",
+    "nogueira": "Daniela Nogueira",
+    
+    "eulis": "Eulis Gaudencio",
+    "gaudencio": "Eulis Gaudencio",
+    
+    "gabriel": "Gabriel Gilvan",
+    "gilvan": "Gabriel Gilvan",
+    
+    "luiz": "Luiz Eduardo",
+    "eduardo": "Luiz Eduardo",
+    "luis": "Luiz Eduardo",
+    
+    "ricardo": "Ricardo",
+    
+    "lucas": "Lucas Correa",
+    "correa": "Lucas Correa",
+    
+    "ludmilla": "Ludmilla Oliveira",
+}
+
+# ==========================================
+# MOTOR DE PROCESSAMENTO
+# ==========================================
+
+class LogParser:
+    def __init__(self, classificador: ClassificadorTipos = None, resolvedor: ResolvedorTecnicos = None):
+        # Regras de classificação de regras_classificacao.json (ou as informadas)
+        self.classificador = classificador or obter_classificador()
+        # Resolução de nomes memoizada e compartilhada pelo processo
+        self.resolvedor = resolvedor or obter_resolvedor()
+        # Fragmentos sem técnico correspondente -> ocorrências (para revisão)
+        self.nao_resolvidos = Counter()
+        self.re_bloco = re.compile(r"(\d{6}\s+\d{6}.*?)(?=\d{6}\s+\d{6}|\Z)", re.DOTALL)
+        self.re_data = re.compile(r"(\d{2}/\d{2}/\d{4})")
+        self.re_cliente = re.compile(r"\[SAMUEL\s+(.*?)(?:\n|$)", re.IGNORECASE)
+        self.re_suporte = re.compile(r"Suporte[\s:.-]*([^\n\r]+)", re.IGNORECASE)
+        self.re_texto_atendimento = re.compile(r"Atendiment.*?\s+(.*?)(?:Internews:|$)", re.DOTALL | re.IGNORECASE)
+        self.re_versao = re.compile(r"Internews:\s*([\d\.]+)", re.IGNORECASE)
+
+    def normalizar_texto_base(self, texto: str) -> str:
+        """Remove acentos e coloca em minúsculas para busca no dicionário."""
+        if not isinstance(texto, str): 
+            return ""
+        texto = unicodedata.normalize('NFKD', texto).encode('ASCII', 'ignore').decode('utf-8')
+        return texto.strip(" .-:").lower()
+
+    def identificar_tecnico_por_nome(self, nome_bruto: str) -> str:
+        """Recebe um fragmento de nome e retorna o nome Padronizado."""
+        nome, resolvido = self.resolvedor.resolver(nome_bruto)
+        if not resolvido:
+            self.nao_resolvidos[nome] += 1
+        return nome
+
+    def extrair_tecnicos(self, texto_bruto: str) -> List[str]:
+        """Divide a string de suporte em múltiplos técnicos e normaliza cada um."""
+        if not texto_bruto:
+            return ["Nao Informado"]
+        
+        texto_norm = self.normalizar_texto_base(texto_bruto)
+        texto_limpo = re.sub(r"(\s+e\s+|\s*/\s*|\s*&\s*|\s*,\s*)", "|", texto_norm)
+        
+        nomes_encontrados = []
+        partes = texto_limpo.split('|')
+        
+        for parte in partes:
+            nome_fragmento = parte.strip()
+            if not nome_fragmento: 
+                continue
+            
+            nome_padronizado = self.identificar_tecnico_por_nome(nome_fragmento)
+            
+            if nome_padronizado:
+                nomes_encontrados.append(nome_padronizado)
+            
+        return nomes_encontrados if nomes_encontrados else ["Nao Informado"]
+
+    def classificar_tipo(self, texto: str) -> str:
+        """Classifica o tipo de atendimento baseado no texto."""
+        return self.classificador.classificar(texto)
+
+    def classificar_registros(self, registros: List[Dict]) -> List[Dict]:
+        """Preenche o Tipo de uma lista de registros com uma classificação vetorizada."""
+        if registros:
+            textos = pd.Series([reg["Detalhe Atendimento"] for reg in registros], dtype=object)
+            for reg, tipo in zip(registros, self.classificador.classificar_serie(textos)):
+                reg["Tipo"] = tipo
+        return registros
+
+    def validar_arquivo(self, conteudo_texto: str) -> Tuple[bool, str]:
+        """Valida se o arquivo tem o formato esperado."""
+        if not conteudo_texto or len(conteudo_texto.strip()) == 0:
+            return False, "Arquivo vazio"
+        
+        if not re.search(r"\d{6}\s+\d{6}", conteudo_texto):
+            return False, "Formato inválido: não encontrado padrão de O.S (XXXXXX XXXXXX)"
+        
+        if not re.search(r"\d{2}/\d{2}/\d{4}", conteudo_texto):
+            return False, "Formato inválido: não encontrada data (DD/MM/YYYY)"
+        
+        blocos = self.re_bloco.findall(conteudo_texto)
+        if len(blocos) == 0:
+            return False, "Nenhum bloco de atendimento encontrado"
+        
+        return True, f"Arquivo válido: {len(blocos)} bloco(s) encontrado(s)"
+
+    def iterar_blocos(self, conteudo_texto: str) -> Iterator[str]:
+        """Percorre os blocos de atendimento sem materializar a lista inteira."""
+        for match in self.re_bloco.finditer(conteudo_texto):
+            yield match.group(1)
+
+    def iterar_lotes(self, conteudo_texto: str, tamanho_lote: int = 500) -> Iterator[List[Dict]]:
+        """Agrupa os registros processados em lotes de até `tamanho_lote` blocos."""
+        lote = []
+        blocos_no_lote = 0
+        
+        for bloco in self.iterar_blocos(conteudo_texto):
+            lote.extend(self.processar_bloco(bloco, classificar=False))
+            blocos_no_lote += 1
+            
+            if blocos_no_lote >= tamanho_lote:
+                yield self.classificar_registros(lote)
+                lote = []
+                blocos_no_lote = 0
+        
+        if lote:
+            yield self.classificar_registros(lote)
+
+    def processar_bloco(self, bloco: str, classificar: bool = True) -> List[Dict]:
+        """
+        Processa um bloco de atendimento e retorna um registro por técnico.
+        Com classificar=False o Tipo fica vazio para ser preenchido em lote.
+        """
+        data = (self.re_data.search(bloco) or ["N/D", "N/D"])[1] if self.re_data.search(bloco) else "N/D"
+        os = bloco[:6]
+        cliente = (self.re_cliente.search(bloco) or ["", "Cliente Não Identificado"])[1].strip()
+        
+        suporte_match = self.re_suporte.search(bloco)
+        tecnico_raw = suporte_match.group(1) if suporte_match else "Nao Informado"
+        tecnico_raw = tecnico_raw.strip(" .")
+        
+        lista_tecnicos = self.extrair_tecnicos(tecnico_raw)
+        
+        texto_atend_match = self.re_texto_atendimento.search(bloco)
+        texto_atendimento = texto_atend_match.group(1).strip() if texto_atend_match else ""
+        
+        tipo = self.classificar_tipo(texto_atendimento) if classificar else None
+        versao = (self.re_versao.search(bloco) or ["", ""])[1]
+
+        return [
+            {
+                "Data": data,
+                "O.S": os,
+                "Cliente": cliente.upper(),
+                "Técnico": tech,
+                "Tipo": tipo,
+                "Versão Internews": versao,
+                "Detalhe Atendimento": texto_atendimento,
+                "Suporte Original (Log)": tecnico_raw
+            }
+            for tech in lista_tecnicos
+        ]
+
+    def processar_arquivo(self, conteudo_texto: str) -> pd.DataFrame:
+        """Processa o arquivo e retorna um DataFrame com os dados."""
+        registros = []
+        
+        for bloco in self.iterar_blocos(conteudo_texto):
+            registros.extend(self.processar_bloco(bloco, classificar=False))
+        
+        df = pd.DataFrame(registros)
+        if not df.empty:
+            df["Tipo"] = self.classificador.classificar_serie(df["Detalhe Atendimento"])
+        return df
+
+
+# Estágios do parser medidos pela instrumentação (os métodos por bloco ficam
+# de fora para não gerar uma medição por atendimento)
+instrumentar_classe(LogParser, "parser", metodos=["validar_arquivo", "processar_arquivo"])
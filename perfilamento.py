@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Modo de perfilamento da aplicação InterNews
+Captura cProfile e tracemalloc de uma execução completa do dashboard (ou do
+parser isolado) e grava .pstats e o relatório de alocações em disco,
+identificados pelo hash do upload - sem precisar do arquivo de log original
+
+Uso do parser isolado:
+    python perfilamento.py arquivo.txt [--saida perfis]
+"""
+
+import argparse
+import cProfile
+import hashlib
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import List, Mapping
+
+# Ativação por variável de ambiente ou por ?perfil=1 na URL
+VARIAVEL_ATIVACAO = "INTERNEWS_PERFILAMENTO"
+PARAMETRO_URL = "perfil"
+DIRETORIO_PERFIS = os.getenv("INTERNEWS_PERFIL_DIR", "perfis")
+
+TOP_FUNCOES = 30
+TOP_ALOCACOES = 25
+
+# cProfile e tracemalloc valem para o processo todo: uma execução por vez
+_trava_perfil = threading.Lock()
+
+
+def perfilamento_ativo(query_params: Mapping = None) -> bool:
+    """Indica se a execução atual deve ser perfilada"""
+    if os.getenv(VARIAVEL_ATIVACAO, "").lower() in ("1", "true", "sim"):
+        return True
+    if query_params is not None:
+        return str(query_params.get(PARAMETRO_URL, "")).lower() in ("1", "true", "sim")
+    return False
+
+
+@dataclass
+class Perfil:
+    """Resultado de um perfilamento"""
+    etiqueta: str = "sem_upload"
+    arquivos: List[str] = field(default_factory=list)
+    resumo: str = ""
+    # Motivo quando o perfilamento pedido não foi feito
+    aviso: str = ""
+
+
+def _relatorio_funcoes(perfilador: cProfile.Profile) -> str:
+    saida = io.StringIO()
+    estatisticas = pstats.Stats(perfilador, stream=saida)
+    estatisticas.strip_dirs().sort_stats("cumulative").print_stats(TOP_FUNCOES)
+    return saida.getvalue()
+
+
+def _relatorio_alocacoes(instantaneo: tracemalloc.Snapshot, pico: int) -> str:
+    linhas = [f"Pico de memória rastreada: {pico / 1024 / 1024:.1f} MB", ""]
+    for posicao, estatistica in enumerate(instantaneo.statistics("lineno")[:TOP_ALOCACOES], 1):
+        quadro = estatistica.traceback[0]
+        linhas.append(
+            f"{posicao:>2}. {quadro.filename}:{quadro.lineno} - "
+            f"{estatistica.size / 1024:.1f} KiB em {estatistica.count} blocos"
+        )
+    return "\n".join(linhas) + "\n"
+
+
+@contextmanager
+def perfilar(ativo: bool = True, diretorio: str = DIRETORIO_PERFIS, etiqueta: str = "sem_upload"):
+    """
+    Perfila o bloco com cProfile e tracemalloc. A etiqueta (por exemplo o hash
+    do upload) pode ser alterada dentro do bloco via `perfil.etiqueta`.
+    """
+    perfil = Perfil(etiqueta=etiqueta)
+    if not ativo:
+        yield perfil
+        return
+
+    # Outra sessão perfilando: esta execução segue sem perfil
+    if not _trava_perfil.acquire(blocking=False):
+        perfil.aviso = "Perfilamento ignorado: outra execução está sendo perfilada"
+        yield perfil
+        return
+
+    try:
+        perfilador = cProfile.Profile()
+        try:
+            perfilador.enable()
+        except ValueError as e:
+            # Outro profiler do processo (fora deste módulo) já está ativo
+            perfil.aviso = f"Perfilamento ignorado: {e}"
+            yield perfil
+            return
+
+        # tracemalloc só é parado aqui se foi iniciado aqui
+        iniciou_tracemalloc = not tracemalloc.is_tracing()
+        if iniciou_tracemalloc:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+        try:
+            yield perfil
+        finally:
+            perfilador.disable()
+            instantaneo = tracemalloc.take_snapshot()
+            _, pico = tracemalloc.get_traced_memory()
+            if iniciou_tracemalloc:
+                tracemalloc.stop()
+            _gravar_perfil(perfil, perfilador, instantaneo, pico, diretorio)
+    finally:
+        _trava_perfil.release()
+
+
+def _gravar_perfil(
+    perfil: Perfil,
+    perfilador: cProfile.Profile,
+    instantaneo: tracemalloc.Snapshot,
+    pico: int,
+    diretorio: str
+):
+    """Grava .pstats e o relatório de alocações e preenche o resumo do perfil"""
+    Path(diretorio).mkdir(parents=True, exist_ok=True)
+    base = Path(diretorio) / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{perfil.etiqueta[:16]}"
+
+    arquivo_pstats = f"{base}.pstats"
+    perfilador.dump_stats(arquivo_pstats)
+
+    relatorio_alocacoes = _relatorio_alocacoes(instantaneo, pico)
+    arquivo_alocacoes = f"{base}_alocacoes.txt"
+    with open(arquivo_alocacoes, "w", encoding="utf-8") as arquivo:
+        arquivo.write(relatorio_alocacoes)
+
+    perfil.arquivos = [arquivo_pstats, arquivo_alocacoes]
+    perfil.resumo = (
+        f"Perfil {perfil.etiqueta} - {datetime.now().isoformat(timespec='seconds')}\n\n"
+        f"== Funções (tempo acumulado) ==\n{_relatorio_funcoes(perfilador)}\n"
+        f"== Alocações ==\n{relatorio_alocacoes}"
+    )
+
+
+def perfilar_parser(caminho: str, diretorio: str = DIRETORIO_PERFIS) -> Perfil:
+    """Perfila validação e processamento de um arquivo de log, sem banco de dados"""
+    from log_parser import LogParser
+
+    conteudo_bytes = Path(caminho).read_bytes()
+    etiqueta = hashlib.sha256(conteudo_bytes).hexdigest()
+    conteudo = conteudo_bytes.decode("utf-8")
+
+    with perfilar(True, diretorio, etiqueta) as perfil:
+        parser = LogParser()
+        parser.validar_arquivo(conteudo)
+        parser.processar_arquivo(conteudo)
+    return perfil
+
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description="Perfila o parser de logs InterNews")
+    argumentos.add_argument("arquivo", help="Arquivo de log (.txt)")
+    argumentos.add_argument("--saida", default=DIRETORIO_PERFIS, help="Diretório dos perfis")
+    args = argumentos.parse_args()
+
+    perfil = perfilar_parser(args.arquivo, args.saida)
+    print(perfil.resumo)
+    print("Arquivos gerados:")
+    for arquivo in perfil.arquivos:
+        print(f"  {arquivo}")
+    sys.exit(0)
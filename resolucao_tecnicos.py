@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Resolução de nomes de técnicos da aplicação InterNews
+Casa fragmentos da linha "Suporte:" com os técnicos oficiais: primeiro pelo
+MAPA_TECNICOS (apelidos conhecidos) e depois por distância de edição em uma
+árvore BK com os nomes, sobrenomes e apelidos. O resultado de cada fragmento
+distinto é memoizado; o que não for resolvido é devolvido como veio (em
+Title Case) e marcado para revisão. A busca aproximada só decide quando um
+único técnico está ao alcance: variações de terminação (Daniel/Daniela) e
+primeiros nomes exatos de outro técnico ficam para revisão, em vez de
+atribuir o histórico à pessoa errada.
+"""
+
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Fragmentos menores que isso não passam pela busca aproximada ("e", "da"...)
+TAMANHO_MINIMO_APROXIMADO = 4
+
+
+def normalizar_nome(texto: str) -> str:
+    """Remove acentos, pontuação das pontas e coloca em minúsculas"""
+    if not isinstance(texto, str):
+        return ""
+    texto = unicodedata.normalize('NFKD', texto).encode('ASCII', 'ignore').decode('utf-8')
+    return texto.strip(" .-:").lower()
+
+
+def distancia_edicao(a: str, b: str, limite: int = None) -> int:
+    """Distância de Levenshtein; para cedo (retorna limite + 1) se passar do limite"""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if limite is not None and len(a) - len(b) > limite:
+        return limite + 1
+
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        atual = [i]
+        for j, cb in enumerate(b, 1):
+            atual.append(min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + (ca != cb)))
+        if limite is not None and min(atual) > limite:
+            return limite + 1
+        anterior = atual
+    return anterior[-1]
+
+
+def limite_distancia(termo: str) -> int:
+    """Erros tolerados conforme o tamanho: 1 até 6 letras, 2 acima disso"""
+    return 1 if len(termo) <= 6 else 2
+
+
+# Terminações que distinguem nomes (Daniel/Daniela, Paulo/Paula, Mario/Maria)
+VOGAIS = "aeiou"
+
+
+def variante_de_nome(a: str, b: str) -> bool:
+    """Indica se a e b diferem só pela vogal final (nomes distintos, não erro de digitação)"""
+    curto, longo = sorted((a, b), key=len)
+    if len(longo) == len(curto) + 1:
+        return longo.startswith(curto) and longo[-1] in VOGAIS
+    if len(longo) == len(curto) and curto:
+        return curto[:-1] == longo[:-1] and curto[-1] in VOGAIS and longo[-1] in VOGAIS
+    return False
+
+
+class ArvoreBK:
+    """Árvore BK sobre a distância de edição (termo -> valor)"""
+
+    def __init__(self):
+        self._raiz = None
+
+    def inserir(self, termo: str, valor: str):
+        if self._raiz is None:
+            self._raiz = (termo, valor, {})
+            return
+        no = self._raiz
+        while True:
+            distancia = distancia_edicao(termo, no[0])
+            if distancia == 0:
+                return
+            filhos = no[2]
+            if distancia not in filhos:
+                filhos[distancia] = (termo, valor, {})
+                return
+            no = filhos[distancia]
+
+    def buscar(self, termo: str, limite: int) -> List[Tuple[int, str, str]]:
+        """(distância, termo, valor) de todos os termos a até `limite` edições"""
+        if self._raiz is None:
+            return []
+        encontrados = []
+        pilha = [self._raiz]
+        while pilha:
+            candidato, valor, filhos = pilha.pop()
+            distancia = distancia_edicao(termo, candidato)
+            if distancia <= limite:
+                encontrados.append((distancia, candidato, valor))
+            # Desigualdade triangular: só subárvores em [d - limite, d + limite]
+            for aresta, filho in filhos.items():
+                if distancia - limite <= aresta <= distancia + limite:
+                    pilha.append(filho)
+        return sorted(encontrados)
+
+
+class ResolvedorTecnicos:
+    """Apelidos exatos, depois busca aproximada; memoizado por fragmento"""
+
+    def __init__(self, mapa: Dict[str, str], tecnicos: Iterable[str]):
+        self.mapa = {normalizar_nome(chave): valor for chave, valor in mapa.items()}
+        self.arvore = ArvoreBK()
+        self._memo = {}
+        self._lock = threading.Lock()
+
+        # Primeiro nome -> técnicos que o usam
+        self.primeiros_nomes = {}
+        for nome in tecnicos:
+            partes = normalizar_nome(nome).split()
+            if partes:
+                self.primeiros_nomes.setdefault(partes[0], set()).add(nome)
+
+        # Termos do índice: apelidos, nomes completos e cada parte do nome.
+        # Partes compartilhadas por dois técnicos ficam de fora (ambíguas),
+        # a não ser que o mapa já decida ("gustavo" -> Gustavo Kauan)
+        termos = dict(self.mapa)
+        partes = {}
+        for nome in list(tecnicos) + list(mapa.values()):
+            termos.setdefault(normalizar_nome(nome), nome)
+            for parte in normalizar_nome(nome).split():
+                partes.setdefault(parte, set()).add(nome)
+        for parte, nomes in partes.items():
+            if len(nomes) == 1 and len(parte) >= TAMANHO_MINIMO_APROXIMADO:
+                termos.setdefault(parte, next(iter(nomes)))
+        for termo, valor in termos.items():
+            self.arvore.inserir(termo, valor)
+
+    def _aproximado(self, fragmento: str) -> Optional[str]:
+        # O fragmento inteiro e cada palavra dele. Só resolve quando todos os
+        # termos ao alcance apontam para o mesmo técnico
+        candidatos = [fragmento] + [p for p in fragmento.split() if p != fragmento]
+        alcancados = set()
+        for termo in candidatos:
+            if len(termo) < TAMANHO_MINIMO_APROXIMADO:
+                continue
+            for distancia, indexado, valor in self.arvore.buscar(termo, limite_distancia(termo)):
+                if distancia and variante_de_nome(termo, indexado):
+                    continue
+                alcancados.add(valor)
+        if len(alcancados) != 1:
+            return None
+        resolvido = next(iter(alcancados))
+
+        # Primeiro nome exato de outro técnico: não adivinha
+        donos = self.primeiros_nomes.get(fragmento.split()[0], set()) if fragmento.split() else set()
+        if donos and resolvido not in donos:
+            return None
+        return resolvido
+
+    def _resolver(self, fragmento: str) -> Optional[str]:
+        for chave, valor_padrao in self.mapa.items():
+            if chave in fragmento:
+                return valor_padrao
+        return self._aproximado(fragmento)
+
+    def resolver(self, nome_bruto: str) -> Tuple[str, bool]:
+        """(nome padronizado, resolvido); sem resolução devolve o fragmento em Title Case"""
+        fragmento = normalizar_nome(nome_bruto)
+        with self._lock:
+            if fragmento in self._memo:
+                resolvido = self._memo[fragmento]
+            else:
+                resolvido = self._memo[fragmento] = self._resolver(fragmento)
+        if resolvido is None:
+            return nome_bruto.title(), False
+        return resolvido, True
+
+    def fragmentos_memoizados(self) -> int:
+        return len(self._memo)
+
+
+_resolvedor = None
+
+
+def obter_resolvedor() -> ResolvedorTecnicos:
+    """Resolvedor do processo (o memo é compartilhado entre uploads)"""
+    global _resolvedor
+    if _resolvedor is None:
+        from log_parser import MAPA_TECNICOS, TECNICOS_PADRAO
+        _resolvedor = ResolvedorTecnicos(MAPA_TECNICOS, TECNICOS_PADRAO)
+    return _resolvedor
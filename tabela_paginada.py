@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Tabela paginada da aplicação InterNews
+Busca, ordenação e paginação acontecem no servidor; só a fatia visível
+(com o detalhe do atendimento truncado) é enviada ao navegador
+"""
+
+import math
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+TAMANHOS_PAGINA = [25, 50, 100, 250]
+COLUNA_DETALHE = "Detalhe Atendimento"
+LIMITE_DETALHE = 120
+
+
+def buscar(df: pd.DataFrame, termo: str) -> pd.DataFrame:
+    """Linhas em que alguma coluna contém o termo (sem diferenciar maiúsculas)"""
+    if not termo:
+        return df
+    mascara = np.zeros(len(df), dtype=bool)
+    for coluna in df.columns:
+        mascara |= df[coluna].astype(str).str.contains(termo, case=False, regex=False, na=False).to_numpy()
+    return df[mascara]
+
+
+def ordenar(df: pd.DataFrame, coluna: Optional[str], crescente: bool = True) -> pd.DataFrame:
+    """Ordena pela coluna escolhida (ordenação estável)"""
+    if not coluna or coluna not in df.columns:
+        return df
+    return df.sort_values(coluna, ascending=crescente, kind="stable", na_position="last")
+
+
+def fatiar_pagina(df: pd.DataFrame, pagina: int, tamanho: int) -> Tuple[pd.DataFrame, int, int]:
+    """Retorna a fatia da página (1-based), a posição inicial e o total de páginas"""
+    total_paginas = max(1, math.ceil(len(df) / tamanho))
+    pagina = min(max(pagina, 1), total_paginas)
+    inicio = (pagina - 1) * tamanho
+    return df.iloc[inicio:inicio + tamanho], inicio, total_paginas
+
+
+def truncar_texto(serie: pd.Series, limite: int = LIMITE_DETALHE) -> pd.Series:
+    """Corta textos longos, indicando o corte com reticências"""
+    texto = serie.astype(str)
+    longos = texto.str.len() > limite
+    return texto.where(~longos, texto.str.slice(0, limite) + "…")
+
+
+def controles_paginacao(total_linhas: int, chave: str, bloqueado: bool = False) -> Tuple[int, int]:
+    """
+    Seletores de tamanho e número da página; retorna (página, tamanho).
+    `bloqueado` desabilita a troca de página (ex.: edições não salvas).
+    """
+    col_tamanho, col_pagina, col_info = st.columns([1, 1, 2])
+
+    with col_tamanho:
+        tamanho = st.selectbox("Linhas por página", TAMANHOS_PAGINA, key=f"{chave}_tamanho", disabled=bloqueado)
+
+    total_paginas = max(1, math.ceil(total_linhas / tamanho))
+    chave_pagina = f"{chave}_pagina"
+    # Filtros podem reduzir o total de páginas entre execuções
+    if st.session_state.get(chave_pagina, 1) > total_paginas:
+        st.session_state[chave_pagina] = total_paginas
+
+    with col_pagina:
+        pagina = st.number_input(
+            f"Página (de {total_paginas})",
+            min_value=1,
+            max_value=total_paginas,
+            step=1,
+            key=chave_pagina,
+            disabled=bloqueado
+        )
+
+    with col_info:
+        inicio = (pagina - 1) * tamanho
+        fim = min(inicio + tamanho, total_linhas)
+        st.caption(f"Linhas {inicio + 1 if total_linhas else 0}–{fim} de {total_linhas}")
+
+    return int(pagina), int(tamanho)
+
+
+def renderizar_tabela_paginada(
+    df: pd.DataFrame,
+    chave: str,
+    memoizar: Callable[[Hashable, Callable], pd.DataFrame] = None,
+    chave_base: Hashable = None
+):
+    """
+    Renderiza a tabela de detalhamento com busca, ordenação, projeção de
+    colunas e paginação. `memoizar(chave, funcao)` permite reaproveitar o
+    resultado da busca/ordenação entre execuções.
+    """
+    col_busca, col_ordem, col_sentido = st.columns([2, 1, 1])
+
+    with col_busca:
+        termo = st.text_input("🔎 Buscar na tabela:", "", key=f"{chave}_busca")
+    with col_ordem:
+        coluna_ordem = st.selectbox("Ordenar por", [None] + list(df.columns), key=f"{chave}_ordem")
+    with col_sentido:
+        crescente = st.radio("Ordem", ["Crescente", "Decrescente"], horizontal=True, key=f"{chave}_sentido") == "Crescente"
+
+    colunas: List[str] = st.multiselect("Colunas exibidas", list(df.columns), default=list(df.columns), key=f"{chave}_colunas")
+
+    def calcular():
+        return ordenar(buscar(df, termo), coluna_ordem, crescente)
+
+    if memoizar is not None and chave_base is not None:
+        df_resultado = memoizar(("tabela", chave_base, termo, coluna_ordem, crescente), calcular)
+    else:
+        df_resultado = calcular()
+
+    pagina, tamanho = controles_paginacao(len(df_resultado), chave)
+    fatia, _, _ = fatiar_pagina(df_resultado, pagina, tamanho)
+
+    fatia_exibida = fatia[colunas] if colunas else fatia
+    if COLUNA_DETALHE in fatia_exibida.columns:
+        fatia_exibida = fatia_exibida.assign(**{COLUNA_DETALHE: truncar_texto(fatia_exibida[COLUNA_DETALHE])})
+
+    st.dataframe(fatia_exibida, use_container_width=True, height=400)
+
+    # Texto completo só é enviado quando pedido
+    if COLUNA_DETALHE in fatia.columns and not fatia.empty:
+        with st.expander("🔍 Ver detalhe completo"):
+            posicao = st.selectbox(
+                "Registro",
+                range(len(fatia)),
+                format_func=lambda i: f"{fatia.iloc[i].get('O.S', '')} - {fatia.iloc[i].get('Cliente', '')}",
+                key=f"{chave}_detalhe"
+            )
+            st.text(str(fatia.iloc[posicao][COLUNA_DETALHE]))
+
+
+def possui_alteracoes(estado: Dict) -> bool:
+    """Indica se o estado do st.data_editor tem edições, remoções ou inserções"""
+    return any(estado.get(campo) for campo in ("edited_rows", "deleted_rows", "added_rows"))
+
+
+def alteracoes_editor(fatia: pd.DataFrame, estado: Dict) -> Dict:
+    """
+    Converte o estado do st.data_editor (posições na página) em alterações
+    por ID de registro. Linhas sem ID (não gravadas) não são atualizáveis.
+    """
+    ids = fatia.index
+
+    def id_na_posicao(posicao) -> Optional[int]:
+        posicao = int(posicao)
+        if posicao >= len(ids) or pd.isna(ids[posicao]):
+            return None
+        return int(ids[posicao])
+
+    atualizados = {}
+    for posicao, campos in estado.get("edited_rows", {}).items():
+        registro_id = id_na_posicao(posicao)
+        if registro_id is not None:
+            atualizados[registro_id] = dict(campos)
+
+    removidos = [
+        registro_id for registro_id in map(id_na_posicao, estado.get("deleted_rows", []))
+        if registro_id is not None
+    ]
+    # Linhas removidas não precisam ser atualizadas
+    for registro_id in removidos:
+        atualizados.pop(registro_id, None)
+
+    inseridos = [
+        {coluna: valor for coluna, valor in linha.items() if coluna != "_index"}
+        for linha in estado.get("added_rows", [])
+    ]
+
+    return {"atualizados": atualizados, "inseridos": inseridos, "removidos": removidos}
+
+
+def aplicar_alteracoes(df: pd.DataFrame, alteracoes: Dict, ids_inseridos: List[int]) -> pd.DataFrame:
+    """Reflete em df as alterações já gravadas no banco"""
+    df = df[~df.index.isin(alteracoes["removidos"])].copy()
+
+    for registro_id, campos in alteracoes["atualizados"].items():
+        linhas = df.index == registro_id
+        for coluna, valor in campos.items():
+            if coluna in df.columns:
+                df.loc[linhas, coluna] = valor
+
+    if alteracoes["inseridos"]:
+        novos = pd.DataFrame(
+            alteracoes["inseridos"],
+            columns=df.columns,
+            index=pd.Index(ids_inseridos, dtype="Int64", name=df.index.name)
+        ).fillna("")
+        df = pd.concat([df, novos])
+
+    return df
+
+
+def limpar_editor(chave: str):
+    """Descarta o estado do editor paginado (após salvar as alterações)"""
+    st.session_state.pop(f"{chave}_editor", None)
+
+
+def renderizar_editor_paginado(df: pd.DataFrame, chave: str) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Editor de dados paginado: só a página atual vai ao navegador.
+    Retorna df com as edições (inclusive linhas adicionadas/removidas) da
+    página e o conjunto de alterações por ID de registro.
+
+    O estado do st.data_editor pertence à página exibida e é descartado
+    pelo Streamlit quando ela muda; por isso, com alterações não salvas, a
+    troca de página e de tamanho fica bloqueada até salvar ou descartar.
+    """
+    chave_editor = f"{chave}_editor"
+    bloqueado = possui_alteracoes(st.session_state.get(chave_editor, {}))
+
+    pagina, tamanho = controles_paginacao(len(df), chave, bloqueado=bloqueado)
+    fatia, inicio, _ = fatiar_pagina(df, pagina, tamanho)
+
+    if bloqueado:
+        col_aviso, col_descartar = st.columns([3, 1])
+        with col_aviso:
+            st.caption("🔒 Salve ou descarte as alterações desta página para trocar de página")
+        with col_descartar:
+            if st.button("↩️ Descartar alterações", key=f"{chave}_descartar"):
+                limpar_editor(chave)
+                st.rerun()
+
+    fatia_editada = st.data_editor(
+        fatia,
+        use_container_width=True,
+        num_rows="dynamic",
+        key=chave_editor
+    )
+    alteracoes = alteracoes_editor(fatia, st.session_state.get(chave_editor, {}))
+
+    if fatia_editada.equals(fatia):
+        return df, alteracoes
+
+    return pd.concat(
+        [df.iloc[:inicio], fatia_editada, df.iloc[inicio + len(fatia):]]
+    ), alteracoes
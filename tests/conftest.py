@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Configuração comum dos testes
+Banco SQLite e arquivo Parquet temporários (definidos antes de importar os
+módulos da aplicação), cache de consultas desligado e um log sintético
+pequeno do benchmarks/gerador_logs.py. INTERNEWS_TESTES_DATABASE_URL
+troca o SQLite por outro banco descartável (ex.: PostgreSQL).
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+_TEMPORARIO = tempfile.mkdtemp(prefix="internews_testes_")
+os.environ["DATABASE_URL"] = os.getenv("INTERNEWS_TESTES_DATABASE_URL", f"sqlite:///{_TEMPORARIO}/internews.db")
+os.environ.pop("DATABASE_URL_ASYNC", None)
+os.environ["INTERNEWS_ARQUIVO_DIR"] = str(Path(_TEMPORARIO) / "arquivo")
+os.environ["INTERNEWS_CACHE_CONSULTAS_TTL"] = "0"
+
+import pytest  # noqa: E402
+
+from benchmarks.gerador_logs import gerar_texto  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def texto_log() -> str:
+    """Log sintético de ~200 KB (determinístico)"""
+    return gerar_texto(200_000, semente=7)
+
+
+@pytest.fixture(scope="session")
+def banco():
+    """Esquema criado no banco de testes"""
+    from database_manager import GerenciadorBancoDados
+
+    sucesso, msg = GerenciadorBancoDados.inicializar()
+    assert sucesso, msg
+    return GerenciadorBancoDados
+
+
+@pytest.fixture
+def resumos_mensais(banco):
+    """
+    Função analise_id -> (resumos gravados, resumos calculados com GROUP BY
+    direto sobre registros), como listas ordenadas de tuplas
+    """
+    from sqlalchemy import text
+
+    from models import obter_engine
+
+    mes = "CASE WHEN data LIKE '__/__/____' THEN substr(data, 7, 4) || '-' || substr(data, 4, 2) ELSE 'sem-data' END"
+    consultas = {
+        "gravados": (
+            "SELECT mes, tecnico, tipo, atendimentos FROM resumo_mensal_tecnico WHERE analise_id = :id",
+            "SELECT mes, cliente, atendimentos, os_unicas FROM resumo_mensal_cliente WHERE analise_id = :id",
+        ),
+        "calculados": (
+            f"SELECT {mes} AS m, tecnico, tipo, COUNT(*) FROM registros WHERE analise_id = :id GROUP BY m, tecnico, tipo",
+            f"SELECT {mes} AS m, cliente, COUNT(*), COUNT(DISTINCT os) FROM registros WHERE analise_id = :id GROUP BY m, cliente",
+        ),
+    }
+
+    def comparar(analise_id: int):
+        with obter_engine().connect() as conn:
+            return tuple(
+                tuple(sorted(tuple(linha) for linha in conn.execute(text(sql), {"id": analise_id})) for sql in consultas[lado])
+                for lado in ("gravados", "calculados")
+            )
+    return comparar
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Modelo de visão em uma passada contra os agregados do pandas"""
+
+import numpy as np
+import pandas as pd
+
+from agregacao import calcular_modelo_visao
+
+
+def _df(linhas: int = 2000, semente: int = 5) -> pd.DataFrame:
+    aleatorio = np.random.default_rng(semente)
+    escolher = lambda valores: aleatorio.choice(valores, size=linhas)  # noqa: E731
+    return pd.DataFrame({
+        "Data": "01/01/2024",
+        "O.S": escolher([f"{n:06d}" for n in range(400)]),
+        "Cliente": escolher([f"Cliente {n}" for n in range(60)]),
+        "Técnico": escolher(["Samuel", "Daniela", "Gustavo", "Marcelo"]),
+        "Tipo": escolher(["Erro", "Rotina", "Fiscal", "Não Identificado"]),
+        "Versão Internews": escolher(["", "4.0.1", "4.1.0"]),
+    })
+
+
+def test_modelo_visao_igual_a_value_counts():
+    df = _df()
+    modelo = calcular_modelo_visao(df)
+    assert modelo.total_registros == len(df)
+    assert modelo.os_unicas == df["O.S"].nunique()
+    for dimensao, coluna in [("tecnicos", "Técnico"), ("tipos", "Tipo"), ("clientes", "Cliente"), ("versoes", "Versão Internews")]:
+        assert dict(getattr(modelo, dimensao)) == df[coluna].value_counts().to_dict()
+    assert modelo.quantidade_tipo("Erro") == (df["Tipo"] == "Erro").sum()
+
+
+def test_resumo_tecnicos_igual_ao_groupby():
+    df = _df()
+    esperado = df.groupby("Técnico").agg(
+        **{
+            "O.S Únicas": ("O.S", "nunique"),
+            "Clientes": ("Cliente", "nunique"),
+            "Erros": ("Tipo", lambda tipos: int((tipos == "Erro").sum())),
+        }
+    )
+    pd.testing.assert_frame_equal(calcular_modelo_visao(df).resumo_tecnicos_df(), esperado, check_dtype=False)
+
+
+def test_df_vazio():
+    modelo = calcular_modelo_visao(_df().iloc[:0])
+    assert modelo.total_registros == 0 and modelo.tipos == ()
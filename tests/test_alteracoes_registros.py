@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Alterações do editor gravadas em uma transação (UPDATE, INSERT e DELETE)"""
+
+import pandas as pd
+import pytest
+
+from benchmarks.gerador_logs import gerar_texto
+from ingestao import PipelineIngestao
+from models import Registro, obter_sessao
+
+
+@pytest.fixture
+def analise(banco):
+    resultado = PipelineIngestao().executar(gerar_texto(30_000, semente=31), "edicao.txt")
+    assert resultado.sucesso_analise and resultado.sucesso_registros, resultado.msg_registros
+    yield resultado.analise_id, resultado.df
+    banco.deletar_analise(resultado.analise_id)
+
+
+def _registros(ids):
+    sessao = obter_sessao()
+    try:
+        return {registro.id: registro for registro in sessao.query(Registro).filter(Registro.id.in_(ids))}
+    finally:
+        sessao.close()
+
+
+def test_update_insert_e_delete_em_uma_chamada(banco, analise, resumos_mensais):
+    analise_id, df = analise
+    editado, removido = (int(i) for i in df.index[:2])
+    novos = [
+        {"Data": "02/03/2024", "O.S": "999001", "Cliente": "CLIENTE NOVO", "Técnico": "Samuel", "Tipo": "Erro"},
+        {"Data": "03/03/2024", "O.S": "999002", "Cliente": "CLIENTE NOVO", "Técnico": "Daniela", "Tipo": "Erro"},
+    ]
+    sucesso, msg, ids_inseridos = banco.aplicar_alteracoes_registros(
+        atualizados={editado: {"Tipo": "Fiscal", "Técnico": "Técnico Editado", "Versão Internews": None}},
+        inseridos=novos,
+        removidos=[removido],
+        analise_id_novos=analise_id,
+    )
+    assert sucesso, msg
+    assert msg == "1 registro(s) atualizado(s), 2 inserido(s), 1 removido(s)"
+    assert len(ids_inseridos) == 2 and len(set(ids_inseridos)) == 2
+
+    registros = _registros([editado, removido, *ids_inseridos])
+    assert removido not in registros
+    assert (registros[editado].tipo, registros[editado].tecnico, registros[editado].versao_internews) == ("Fiscal", "Técnico Editado", "")
+    for registro_id, novo in zip(ids_inseridos, novos):
+        assert registros[registro_id].analise_id == analise_id
+        assert (registros[registro_id].os, registros[registro_id].tecnico) == (novo["O.S"], novo["Técnico"])
+
+    # Totais da análise e resumos mensais recalculados na mesma transação
+    esperado = df.drop(index=[removido]).copy()
+    esperado.loc[editado, ["Tipo", "Técnico"]] = ["Fiscal", "Técnico Editado"]
+    esperado = pd.concat([esperado, pd.DataFrame(novos)], ignore_index=True)
+    sucesso, gravada = banco.obter_analise_por_id(analise_id)
+    assert sucesso
+    assert gravada.total_registros == len(esperado)
+    assert gravada.tecnicos_unicos == esperado["Técnico"].nunique()
+    assert gravada.clientes_unicos == esperado["Cliente"].nunique()
+    assert gravada.tipos_distribuicao == esperado["Tipo"].value_counts().to_dict()
+    gravados, calculados = resumos_mensais(analise_id)
+    assert gravados == calculados
+    assert ("2024-03", "CLIENTE NOVO", 2, 2) in gravados[1]
+
+
+def test_insercao_sem_analise_e_recusada(banco):
+    assert banco.aplicar_alteracoes_registros({}, [{"Cliente": "X"}], []) == (
+        False, "Informe a análise que receberá os registros novos", None
+    )
+
+
+def test_falha_desfaz_a_transacao(banco, analise, monkeypatch):
+    analise_id, df = analise
+    editado, removido = (int(i) for i in df.index[:2])
+
+    def inserir_com_falha(sessao, linhas):
+        raise RuntimeError("falha simulada")
+
+    monkeypatch.setattr("database_manager.GerenciadorBancoDados._inserir_registros", staticmethod(inserir_com_falha))
+    sucesso, msg, ids = banco.aplicar_alteracoes_registros(
+        atualizados={editado: {"Tipo": "Fiscal"}},
+        inseridos=[{"Cliente": "X", "Técnico": "Y"}],
+        removidos=[removido],
+        analise_id_novos=analise_id,
+    )
+    assert (sucesso, ids) == (False, None) and "falha simulada" in msg
+
+    # O UPDATE e o DELETE anteriores à falha foram desfeitos
+    registros = _registros([editado, removido])
+    assert registros[editado].tipo == df.loc[editado, "Tipo"]
+    assert removido in registros
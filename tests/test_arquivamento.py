@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Ida e volta dos registros entre o banco e o arquivo Parquet"""
+
+import pandas as pd
+
+import arquivamento
+from ingestao import PipelineIngestao
+
+
+def _como_df(registros) -> pd.DataFrame:
+    colunas = ["id", "data", "os", "cliente", "tecnico", "tipo", "versao_internews", "detalhe_atendimento"]
+    linhas = [{coluna: getattr(registro, coluna) for coluna in colunas} for registro in registros]
+    return pd.DataFrame(linhas, columns=colunas).sort_values("id").reset_index(drop=True)
+
+
+def test_mes_dos_atendimentos():
+    meses = arquivamento.mes_dos_atendimentos(pd.Series(["05/03/2024", "N/D", "31/12/2023"]))
+    assert list(meses) == ["2024-03", arquivamento.MES_SEM_DATA, "2023-12"]
+
+
+def _registros() -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": [1, 2, 3],
+        "data": ["01/01/2024", "02/02/2024", "N/D"],
+        "os": ["000001", "000002", "000003"],
+        "cliente": ["A", "B", "A"],
+        "tecnico": ["Samuel", "Daniela", "Samuel"],
+        "tipo": ["Erro", "Rotina", "Erro"],
+        "versao_internews": ["4.0.1", "", "4.0.1"],
+        "detalhe_atendimento": ["x", "y", "z"],
+        "suporte_original": ["Samuel", "Daniela", "Samuel"],
+        "data_criacao": pd.Timestamp("2024-03-01 10:00"),
+    })
+
+
+def test_gravar_e_ler_arquivo(tmp_path):
+    registros = _registros()
+    raiz = str(tmp_path)
+
+    assert arquivamento.gravar_analise(7, registros, raiz) == 3
+    tabela = arquivamento.ler_registros([7], raiz=raiz).to_pandas().sort_values("id").reset_index(drop=True)
+    pd.testing.assert_frame_equal(tabela[registros.columns], registros, check_dtype=False)
+
+    assert arquivamento.contar_registros([7], raiz, arquivamento.filtro_igual("tecnico", "Samuel")) == 2
+    contagem = arquivamento.contar_por(["tipo"], [7], raiz=raiz).set_index("tipo")["quantidade"].to_dict()
+    assert contagem == {"Erro": 2, "Rotina": 1}
+
+    # Regravar substitui; remover apaga as partições
+    assert arquivamento.gravar_analise(7, registros.iloc[:1], raiz) == 1
+    assert arquivamento.remover_analise(7, raiz) == 1
+    assert arquivamento.contar_registros([7], raiz) == 0
+
+
+def test_arquivar_e_restaurar_analise(banco, texto_log, tmp_path):
+    resultado = PipelineIngestao().executar(texto_log, "arquivamento.txt")
+    analise_id = resultado.analise_id
+    sucesso, originais = banco.obter_registros_por_analise(analise_id)
+    assert sucesso
+    antes = _como_df(originais)
+
+    sucesso, msg = banco.arquivar_analise(analise_id, raiz=str(tmp_path))
+    assert sucesso, msg
+    assert arquivamento.contar_registros([analise_id], str(tmp_path)) == len(antes)
+    sucesso, arquivados = banco.obter_registros_por_analise(analise_id)
+    assert sucesso
+    pd.testing.assert_frame_equal(_como_df(arquivados), antes)
+
+    sucesso, msg = banco.restaurar_analise(analise_id)
+    assert sucesso, msg
+    sucesso, restaurados = banco.obter_registros_por_analise(analise_id)
+    assert sucesso
+    pd.testing.assert_frame_equal(_como_df(restaurados), antes)
+    assert arquivamento.contar_registros([analise_id], str(tmp_path)) == 0
+
+
+def test_remover_orfas_mantem_so_as_analises_informadas(tmp_path):
+    raiz = str(tmp_path)
+    for analise_id in (1, 2, 3):
+        arquivamento.gravar_analise(analise_id, _registros(), raiz)
+
+    # Três meses por análise
+    assert arquivamento.remover_orfas([2], raiz) == 6
+    assert arquivamento.contar_registros(raiz=raiz) == 3
+    assert arquivamento.remover_orfas([], raiz) == 3
+    assert not list(tmp_path.glob("mes=*"))
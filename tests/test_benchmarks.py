@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Gerador de logs sintéticos e comparação de resultados do benchmark"""
+
+import io
+
+from benchmarks.benchmark_parser import comparar
+from benchmarks.gerador_logs import gerar_texto, gravar_log, interpretar_tamanho, iterar_blocos
+from log_parser import LogParser
+
+
+def test_gerador_e_deterministico():
+    assert gerar_texto(20_000, semente=3) == gerar_texto(20_000, semente=3)
+    assert gerar_texto(20_000, semente=3) != gerar_texto(20_000, semente=4)
+
+    destino = io.StringIO()
+    blocos = gravar_log(destino, 20_000, semente=3)
+    assert destino.getvalue() == gerar_texto(20_000, semente=3)
+    assert blocos == sum(1 for _ in iterar_blocos(20_000, semente=3))
+
+
+def test_parser_enxerga_todos_os_blocos_gerados(texto_log):
+    parser = LogParser()
+    valido, msg = parser.validar_arquivo(texto_log)
+    assert valido, msg
+    assert sum(1 for _ in parser.iterar_blocos(texto_log)) == texto_log.count("\n[SAMUEL ")
+    assert len(texto_log.encode("utf-8")) >= 200_000
+
+
+def test_interpretar_tamanho():
+    assert interpretar_tamanho("512KB") == 512 * 1024
+    assert interpretar_tamanho("1.5mb") == int(1.5 * 1024 ** 2)
+    assert interpretar_tamanho("1GB") == 1024 ** 3
+    assert interpretar_tamanho("1000") == 1000
+
+
+def test_comparar_aponta_so_quedas_acima_da_tolerancia():
+    base = {"resultados": {"1MB": {"processar_arquivo": {"mb_s": 10.0}, "validar_arquivo": {"mb_s": 10.0}}}}
+    atual = {"resultados": {"1MB": {"processar_arquivo": {"mb_s": 8.0}, "validar_arquivo": {"mb_s": 9.5}}}}
+    assert comparar(atual, base, tolerancia=0.10) == ["1MB/processar_arquivo: 0.80x"]
+    assert comparar(atual, {}, tolerancia=0.10) == []
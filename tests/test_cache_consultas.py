@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Chaves, invalidação e cópias do cache de consultas"""
+
+import pandas as pd
+
+from cache_consultas import CacheConsultas, aplicar_cache
+from models import Analise
+
+LEITURAS = {"obter_analises": (("analises",), 300, 8)}
+
+
+class _Gerenciador:
+    chamadas = 0
+
+    @staticmethod
+    def obter_analises(versoes=None):
+        _Gerenciador.chamadas += 1
+        analise = Analise(id=1, nome_arquivo="a.txt", tipos_distribuicao={"Erro": 2})
+        return True, {"lista": [1, 2], "df": pd.DataFrame({"a": [1]}), "analise": analise}
+
+    @staticmethod
+    def salvar_analise():
+        return True, "ok"
+
+
+def _gerenciador():
+    cache = CacheConsultas(leituras=LEITURAS, escala_ttl=1)
+    classe = type("Gerenciador", (), dict(vars(_Gerenciador)))
+    _Gerenciador.chamadas = 0
+    return aplicar_cache(classe, cache), cache
+
+
+def test_argumentos_em_lista_sao_cacheados():
+    gerenciador, cache = _gerenciador()
+    gerenciador.obter_analises(versoes=["4.0.1", "4.0.2"])
+    gerenciador.obter_analises(versoes=["4.0.1", "4.0.2"])
+    assert _Gerenciador.chamadas == 1
+    assert cache.acertos["obter_analises"] == 1
+
+
+def test_gravacao_invalida_a_leitura():
+    gerenciador, _ = _gerenciador()
+    gerenciador.obter_analises()
+    gerenciador.salvar_analise()
+    gerenciador.obter_analises()
+    assert _Gerenciador.chamadas == 2
+
+
+def test_resultado_alterado_nao_contamina_o_cache():
+    gerenciador, _ = _gerenciador()
+    _, primeiro = gerenciador.obter_analises()
+    primeiro["lista"].append(3)
+    primeiro["df"].loc[0, "a"] = 99
+    primeiro["analise"].tipos_distribuicao["Erro"] = 0
+
+    _, segundo = gerenciador.obter_analises()
+    segundo["lista"].append(4)
+    _, terceiro = gerenciador.obter_analises()
+
+    assert _Gerenciador.chamadas == 1
+    assert terceiro["lista"] == [1, 2]
+    assert terceiro["df"].loc[0, "a"] == 1
+    assert terceiro["analise"].tipos_distribuicao == {"Erro": 2}
+    assert terceiro["analise"].nome_arquivo == "a.txt"
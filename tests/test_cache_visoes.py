@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Remoção LRU por bytes e invalidação do CacheVisoes"""
+
+from cache_visoes import CacheVisoes, estimar_tamanho
+
+VALOR = b"x" * 1000
+TAMANHO = estimar_tamanho(VALOR)
+
+
+def test_remove_o_menos_usado_ao_passar_do_limite():
+    cache = CacheVisoes(limite_bytes=TAMANHO * 3)
+    for chave in "abc":
+        cache.armazenar(chave, VALOR)
+
+    # "a" passa a ser o mais recente; "b" é o primeiro a sair
+    assert cache.obter_ou_calcular("a", lambda: None) is VALOR
+    cache.armazenar("d", VALOR)
+
+    calculados = []
+    cache.obter_ou_calcular("b", lambda: calculados.append("b") or VALOR)
+    assert calculados == ["b"]
+    estatisticas = cache.estatisticas()
+    assert estatisticas["remocoes"] == 2
+    assert estatisticas["bytes_usados"] <= cache.limite_bytes
+    assert estatisticas["itens"] == 3
+
+
+def test_valor_maior_que_o_limite_nao_e_guardado():
+    cache = CacheVisoes(limite_bytes=TAMANHO - 1)
+    chamadas = []
+    for _ in range(2):
+        cache.obter_ou_calcular("grande", lambda: chamadas.append(1) or VALOR)
+    assert len(chamadas) == 2
+    assert cache.estatisticas()["itens"] == 0
+
+
+def test_invalidar_por_predicado_libera_os_bytes():
+    cache = CacheVisoes(limite_bytes=TAMANHO * 10)
+    cache.armazenar(("visao", "upload1"), VALOR)
+    cache.armazenar(("modelo", "upload1"), VALOR)
+    cache.armazenar(("visao", "upload2"), VALOR)
+
+    assert cache.invalidar(lambda chave: "upload1" in chave) == 2
+    assert cache.estatisticas()["itens"] == 1
+    assert cache.bytes_usados == TAMANHO
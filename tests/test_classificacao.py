@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Mesmo tipo por texto (re) e por Series (RE2), com acentos e texto em NFD"""
+
+import unicodedata
+
+import pandas as pd
+import pytest
+
+from classificacao import ClassificadorTipos, Regra, trocar_fronteiras
+from log_parser import LogParser
+
+AMOSTRAS = [
+    ("Configuração do satélite", "Não Identificado"),
+    ("Configuração do SAT fiscal", "Fiscal"),
+    ("SAT", "Fiscal"),
+    ("Erro no sat.", "Erro"),
+    ("satisfação do cliente", "Não Identificado"),
+    ("Emissão de NFC-e", "Fiscal"),
+    ("Importação do XML", "Fiscal"),
+    ("xmlé", "Não Identificado"),
+    ("ÉXML", "Não Identificado"),
+    ("Instalação do sistema", "Instalação"),
+    (unicodedata.normalize("NFD", "Instalação do sistema"), "Instalação"),
+    (unicodedata.normalize("NFD", "Cópia de segurança"), "Backup"),
+    ("Implantação concluída", "Instalação"),
+    ("", "Não Identificado"),
+]
+
+
+@pytest.fixture(scope="module")
+def classificador() -> ClassificadorTipos:
+    return ClassificadorTipos.carregar()
+
+
+@pytest.mark.parametrize("texto, tipo", AMOSTRAS)
+def test_texto_e_series_concordam(classificador, texto, tipo):
+    assert classificador.classificar(texto) == tipo
+    assert classificador.classificar_serie(pd.Series([texto]))[0] == tipo
+
+
+def test_series_igual_a_classificar_no_log(classificador, texto_log):
+    textos = pd.Series([texto for texto, _ in AMOSTRAS] + list(LogParser().processar_arquivo(texto_log)["Detalhe Atendimento"]))
+    # Variantes acentuadas ao redor das palavras das regras
+    textos = pd.concat([textos, textos.str.replace(" ", "ã ", n=1), textos.str.replace(" ", " é", n=1)], ignore_index=True)
+    esperado = [classificador.classificar(texto) for texto in textos]
+    assert list(classificador.classificar_serie(textos)) == esperado
+
+
+def test_trocar_fronteiras():
+    assert trocar_fronteiras(r"\bsat\b").count("(?:^|$|") == 2
+    # Barra invertida escapada seguida de "b" não é fronteira
+    assert trocar_fronteiras(r"a\\b") == r"a\\b"
+    classificador = ClassificadorTipos([Regra("Caminho", 1, regex=(r"c:\\bin",))])
+    assert classificador.classificar(r"c:\bin") == "Caminho"
+    assert classificador.classificar_serie(pd.Series([r"c:\bin"]))[0] == "Caminho"
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Comparação de duas análises a partir dos resumos mensais"""
+
+import pandas as pd
+import pytest
+from sqlalchemy import delete
+
+from benchmarks.gerador_logs import gerar_texto
+from ingestao import PipelineIngestao
+from models import ResumoMensalCliente, ResumoMensalTecnico, obter_sessao
+
+
+def _ingerir(texto: str, nome: str):
+    resultado = PipelineIngestao().executar(texto, nome)
+    assert resultado.sucesso_analise and resultado.sucesso_registros, resultado.msg_registros
+    return resultado.analise_id, resultado.df
+
+
+def _diferencas(df_a: pd.DataFrame, df_b: pd.DataFrame, coluna: str) -> dict:
+    a, b = df_a[coluna].value_counts(), df_b[coluna].value_counts()
+    return b.sub(a, fill_value=0).astype(int).to_dict()
+
+
+def _versao_por_cliente(df: pd.DataFrame) -> pd.DataFrame:
+    """Versão mais frequente de cada cliente (empate: a maior versão)"""
+    contagem = (
+        df[df["Versão Internews"] != ""].groupby(["Cliente", "Versão Internews"]).size()
+        .rename("quantidade").reset_index()
+        .sort_values(["quantidade", "Versão Internews"], ascending=False)
+    )
+    return contagem.drop_duplicates("Cliente")[["Cliente", "Versão Internews"]]
+
+
+@pytest.fixture(scope="module")
+def duas_analises(banco, texto_log):
+    # B: outro log, com um cliente que some e um que aparece
+    texto_b = gerar_texto(150_000, semente=11).replace("[SAMUEL OTICA VISAO", "[SAMUEL OTICA NOVA")
+    return _ingerir(texto_log, "comparacao_a.txt"), _ingerir(texto_b, "comparacao_b.txt")
+
+
+def test_diferencas_iguais_as_dos_dataframes(banco, duas_analises):
+    (id_a, df_a), (id_b, df_b) = duas_analises
+    sucesso, comparacao = banco.comparar_analises(id_a, id_b)
+    assert sucesso, comparacao
+
+    for chave, coluna, dimensao in [("tipos", "Tipo", "tipo"), ("clientes", "Cliente", "cliente"), ("tecnicos", "Técnico", "tecnico")]:
+        tabela = comparacao[chave]
+        assert dict(zip(tabela[dimensao], tabela["delta"])) == _diferencas(df_a, df_b, coluna)
+        assert dict(zip(tabela[dimensao], tabela["a"])) == df_a[coluna].value_counts().reindex(tabela[dimensao], fill_value=0).to_dict()
+
+    totais = comparacao["totais"].set_index("metrica")
+    assert totais.loc["Registros", "delta"] == len(df_b) - len(df_a)
+    assert totais.loc["Clientes", "b"] == df_b["Cliente"].nunique()
+
+
+def test_clientes_novos_e_perdidos(banco, duas_analises):
+    (id_a, _), (id_b, _) = duas_analises
+    sucesso, comparacao = banco.comparar_analises(id_a, id_b)
+    assert sucesso, comparacao
+    assert comparacao["clientes_novos"] == ["OTICA NOVA"]
+    assert comparacao["clientes_perdidos"] == ["OTICA VISAO"]
+
+
+def test_migracao_de_versoes(banco, duas_analises):
+    (id_a, df_a), (id_b, df_b) = duas_analises
+    esperado = (
+        _versao_por_cliente(df_a).merge(_versao_por_cliente(df_b), on="Cliente", suffixes=("_a", "_b"))
+        .groupby(["Versão Internews_a", "Versão Internews_b"]).size().to_dict()
+    )
+    sucesso, comparacao = banco.comparar_analises(id_a, id_b)
+    assert sucesso, comparacao
+    migracao = comparacao["migracao_versoes"]
+    assert dict(zip(zip(migracao["versao_a"], migracao["versao_b"]), migracao["clientes"])) == esperado
+
+
+def test_resumos_ausentes_sao_recalculados(banco, duas_analises):
+    (id_a, _), (id_b, _) = duas_analises
+    _, antes = banco.comparar_analises(id_a, id_b)
+
+    # Como uma análise gravada por fora do gerenciador
+    sessao = obter_sessao()
+    for modelo in (ResumoMensalTecnico, ResumoMensalCliente):
+        sessao.execute(delete(modelo).where(modelo.analise_id == id_b))
+    sessao.commit()
+    sessao.close()
+
+    sucesso, depois = banco.comparar_analises(id_a, id_b)
+    assert sucesso, depois
+    for chave in ("tipos", "clientes", "tecnicos"):
+        pd.testing.assert_frame_equal(depois[chave], antes[chave])
+
+
+def test_analise_inexistente(banco, duas_analises):
+    (id_a, _), _ = duas_analises
+    assert banco.comparar_analises(id_a, 999_999) == (False, "Análise não encontrada: 999999")
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Barra lateral assíncrona e a queda para as consultas síncronas"""
+
+import logging
+
+import database_manager_async
+from database_manager_async import carregar_barra_lateral
+
+
+def _sem_driver():
+    raise ImportError("No module named 'asyncpg'")
+
+
+def _executar_proibido(corrotina, timeout=None):
+    corrotina.close()
+    raise AssertionError("usou o loop assíncrono")
+
+
+def test_sem_driver_usa_o_gerenciador_sincrono(banco, monkeypatch, caplog):
+    monkeypatch.setattr(database_manager_async, "obter_engine_async", _sem_driver)
+    monkeypatch.setattr(database_manager_async, "_aviso_sem_driver", False)
+    monkeypatch.setattr(database_manager_async, "executar", _executar_proibido)
+
+    with caplog.at_level(logging.WARNING, logger="database_manager_async"):
+        primeira = carregar_barra_lateral()
+        segunda = carregar_barra_lateral()
+
+    assert primeira == segunda == {
+        "historico": banco.obter_historico_completo(),
+        "estatisticas": banco.obter_estatisticas_gerais(),
+    }
+    avisos = [r for r in caplog.records if "Driver assíncrono indisponível" in r.getMessage()]
+    assert len(avisos) == 1
+
+
+def test_com_driver_igual_ao_sincrono(banco, texto_log):
+    from ingestao import PipelineIngestao
+
+    PipelineIngestao().executar(texto_log, "barra_lateral.txt")
+    assert carregar_barra_lateral() == {
+        "historico": banco.obter_historico_completo(),
+        "estatisticas": banco.obter_estatisticas_gerais(),
+    }
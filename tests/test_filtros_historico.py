@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Filtros do histórico sobre as distribuições de tipos e versões"""
+
+import pytest
+
+from models import obter_sessao
+
+DISTRIBUICOES = {
+    "muitos_erros": ({"Erro": 80, "Não Identificado": 3}, {"4.2.0": 50, "4.1.0": 33}),
+    "poucos_erros": ({"Erro": 10, "Rotina": 5}, {"4.1.0": 15}),
+    "sem_erros": ({"Rotina": 40}, {"3.9.9": 40}),
+}
+
+
+@pytest.fixture(scope="module")
+def analises(banco):
+    ids = {}
+    for nome, (tipos, versoes) in DISTRIBUICOES.items():
+        total = sum(tipos.values())
+        sucesso, msg, ids[nome] = banco.salvar_analise(f"{nome}.txt", total, 1, 1, 1, tipos, versoes)
+        assert sucesso, msg
+    return ids
+
+
+def _filtrar(banco, analises, **filtros):
+    sucesso, historico = banco.filtrar_analises(**filtros)
+    assert sucesso, historico
+    nomes = {analise_id: nome for nome, analise_id in analises.items()}
+    return {nomes[item["id"]] for item in historico if item["id"] in nomes}
+
+
+@pytest.mark.parametrize("filtros, esperado", [
+    ({"tipo": "Erro"}, {"muitos_erros", "poucos_erros"}),
+    ({"tipo": "Erro", "minimo": 50}, {"muitos_erros"}),
+    ({"tipo": "Erro", "maximo": 10}, {"poucos_erros"}),
+    ({"tipo": "Erro", "minimo": 11, "maximo": 79}, set()),
+    ({"tipo": "Não Identificado"}, {"muitos_erros"}),
+    ({"tipo": "Inexistente"}, set()),
+    ({"versoes": ["4.1.0"]}, {"muitos_erros", "poucos_erros"}),
+    ({"versoes": ["4.2.0", "3.9.9"]}, {"muitos_erros", "sem_erros"}),
+    ({"versoes": ["9.9.9"]}, set()),
+    ({"tipo": "Rotina", "versoes": ["4.1.0"]}, {"poucos_erros"}),
+    ({}, {"muitos_erros", "poucos_erros", "sem_erros"}),
+])
+def test_filtrar_analises(banco, analises, filtros, esperado):
+    assert _filtrar(banco, analises, **filtros) == esperado
+
+
+def test_sessao_fechada_quando_a_consulta_falha(banco, monkeypatch):
+    fechadas = []
+
+    def sessao_com_falha():
+        sessao = obter_sessao()
+        fechar = sessao.close
+        sessao.close = lambda: fechadas.append(sessao) or fechar()
+
+        def falhar(*args, **kwargs):
+            raise RuntimeError("falha simulada")
+        sessao.scalars = falhar
+        return sessao
+
+    monkeypatch.setattr("database_manager.obter_sessao", sessao_com_falha)
+    sucesso, msg = banco.filtrar_analises(tipo="Erro")
+    assert not sucesso and "falha simulada" in msg
+    assert len(fechadas) == 1
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Contagem de SQL por bloco medido, por execução e no formato do Prometheus"""
+
+from sqlalchemy import text
+
+import instrumentacao
+from instrumentacao import REGISTRO, finalizar_execucao, iniciar_execucao, medir
+from models import obter_engine
+
+
+def _consultar(conn, vezes: int):
+    for _ in range(vezes):
+        conn.execute(text("SELECT 1")).scalar_one()
+
+
+def test_medir_conta_o_sql_executado_dentro_do_bloco(banco):
+    with obter_engine().connect() as conn:
+        _consultar(conn, 1)  # fora de qualquer bloco
+        coletor = iniciar_execucao()
+        with medir("teste.externo") as externo:
+            _consultar(conn, 1)
+            with medir("teste.interno") as interno:
+                _consultar(conn, 2)
+        _consultar(conn, 1)
+        finalizar_execucao(coletor)
+
+    assert (interno.sql_comandos, externo.sql_comandos) == (2, 3)
+    assert 0 < interno.sql_tempo <= externo.sql_tempo <= externo.duracao
+    assert coletor.sql_comandos == 4
+    assert [m.nome for m in coletor.medicoes] == ["teste.interno", "teste.externo"]
+
+
+def test_erro_e_registrado_e_propagado():
+    try:
+        with medir("teste.erro"):
+            raise ValueError("falha")
+    except ValueError:
+        pass
+    assert REGISTRO.instantaneo()["teste.erro"]["erros"] >= 1
+
+
+def test_formato_prometheus():
+    registro = instrumentacao.RegistroMetricas()
+    registro.registrar(instrumentacao.Medicao('carga "x"', duracao=0.5, linhas=10, sql_comandos=3))
+    registro.registrar(instrumentacao.Medicao('carga "x"', duracao=1.5, erro="ValueError"))
+    texto = registro.formato_prometheus()
+
+    rotulo = '{operacao="carga \\"x\\""}'
+    assert f"internews_operacao_duracao_segundos_sum{rotulo} 2.000000" in texto
+    assert f"internews_operacao_duracao_segundos_count{rotulo} 2" in texto
+    assert f"internews_operacao_duracao_maxima_segundos{rotulo} 1.5" in texto
+    assert f"internews_operacao_sql_comandos_total{rotulo} 3" in texto
+    assert f"internews_operacao_erros_total{rotulo} 1" in texto
+    assert "# TYPE internews_operacao_linhas_total counter" in texto
+
+
+def test_sql_das_consultas_assincronas_vai_para_o_bloco_do_chamador(banco):
+    from database_manager_async import GerenciadorBancoDadosAsync, executar
+
+    coletor = iniciar_execucao()
+    with medir("teste.barra_lateral") as medicao:
+        resultado = executar(GerenciadorBancoDadosAsync.carregar_barra_lateral())
+    finalizar_execucao(coletor)
+
+    assert resultado["historico"][0] and resultado["estatisticas"][0]
+    # Histórico + quatro contagens, no loop assíncrono em outra thread
+    assert medicao.sql_comandos >= 5
+    assert coletor.sql_comandos >= medicao.sql_comandos
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Equivalência entre processar_arquivo, iterar_lotes e o pipeline de ingestão"""
+
+import pandas as pd
+import pytest
+
+from ingestao import AgregadorIncremental, PipelineIngestao
+from log_parser import LogParser
+
+
+def _registros_em_lotes(texto: str, tamanho_lote: int) -> pd.DataFrame:
+    lotes = list(LogParser().iterar_lotes(texto, tamanho_lote))
+    return pd.DataFrame([registro for lote in lotes for registro in lote])
+
+
+@pytest.fixture(scope="module")
+def df_arquivo(texto_log) -> pd.DataFrame:
+    return LogParser().processar_arquivo(texto_log)
+
+
+def test_log_sintetico_e_valido(texto_log, df_arquivo):
+    valido, msg = LogParser().validar_arquivo(texto_log)
+    assert valido, msg
+    assert len(df_arquivo) > 100
+
+
+@pytest.mark.parametrize("tamanho_lote", [1, 7, 500, 100_000])
+def test_iterar_lotes_igual_a_processar_arquivo(texto_log, df_arquivo, tamanho_lote):
+    pd.testing.assert_frame_equal(_registros_em_lotes(texto_log, tamanho_lote), df_arquivo)
+
+
+def test_lotes_respeitam_o_tamanho(texto_log):
+    parser = LogParser()
+    blocos = sum(1 for _ in parser.iterar_blocos(texto_log))
+    lotes = list(parser.iterar_lotes(texto_log, 50))
+    assert len(lotes) == -(-blocos // 50)
+
+
+def test_agregador_incremental_igual_aos_agregados_do_dataframe(texto_log, df_arquivo):
+    agregador = AgregadorIncremental()
+    for lote in LogParser().iterar_lotes(texto_log, 13):
+        agregador.adicionar_lote(lote)
+    resumo = agregador.resumo()
+
+    assert resumo["total_registros"] == len(df_arquivo)
+    assert resumo["tecnicos_unicos"] == df_arquivo["Técnico"].nunique()
+    assert resumo["clientes_unicos"] == df_arquivo["Cliente"].nunique()
+    assert resumo["os_unicas"] == df_arquivo["O.S"].nunique()
+    assert resumo["tipos_distribuicao"] == df_arquivo["Tipo"].value_counts().to_dict()
+    assert resumo["versoes_utilizadas"] == df_arquivo["Versão Internews"].value_counts().to_dict()
+
+
+def test_pipeline_grava_os_mesmos_registros(banco, texto_log, df_arquivo):
+    resultado = PipelineIngestao(tamanho_lote=37).executar(texto_log, "teste_pipeline.txt")
+
+    assert resultado.sucesso_analise and resultado.sucesso_registros, resultado.msg_registros
+    pd.testing.assert_frame_equal(resultado.df.reset_index(drop=True), df_arquivo)
+    assert resultado.df.index.notna().all() and resultado.df.index.is_unique
+
+    sucesso, registros = banco.obter_registros_por_analise(resultado.analise_id)
+    assert sucesso and len(registros) == len(df_arquivo)
+
+    sucesso, analise = banco.obter_analise_por_id(resultado.analise_id)
+    assert sucesso
+    assert analise.total_registros == len(df_arquivo)
+    assert analise.tipos_distribuicao == df_arquivo["Tipo"].value_counts().to_dict()
+
+
+def test_pipeline_descarta_analise_quando_gravacao_falha(banco, texto_log, monkeypatch):
+    sucesso, antes = banco.obter_analises(limite=1000)
+    salvar = banco.salvar_registros
+    chamadas = []
+
+    def salvar_com_falha(analise_id, lote):
+        chamadas.append(analise_id)
+        if len(chamadas) == 2:
+            return False, "falha simulada", None
+        return salvar(analise_id, lote)
+
+    monkeypatch.setattr("ingestao.GerenciadorBancoDados.salvar_registros", salvar_com_falha)
+    resultado = PipelineIngestao(tamanho_lote=20).executar(texto_log, "falha.txt")
+
+    assert not resultado.sucesso_analise and resultado.analise_id is None
+    assert resultado.df.index.isna().all()
+    sucesso, depois = banco.obter_analises(limite=1000)
+    assert len(depois) == len(antes)
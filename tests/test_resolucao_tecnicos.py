@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Distância de edição, limites, árvore BK e resolução de técnicos"""
+
+import random
+
+import pytest
+
+from resolucao_tecnicos import (
+    ArvoreBK,
+    ResolvedorTecnicos,
+    distancia_edicao,
+    limite_distancia,
+    normalizar_nome,
+    variante_de_nome,
+)
+
+
+@pytest.mark.parametrize("a, b, distancia", [
+    ("", "", 0),
+    ("daniel", "daniel", 0),
+    ("daniel", "danil", 1),
+    ("samuel", "samuell", 1),
+    ("kitten", "sitting", 3),
+    ("", "abc", 3),
+])
+def test_distancia_edicao(a, b, distancia):
+    assert distancia_edicao(a, b) == distancia
+    assert distancia_edicao(b, a) == distancia
+
+
+def test_distancia_com_limite_para_cedo():
+    assert distancia_edicao("kitten", "sitting", limite=1) == 2
+    assert distancia_edicao("abc", "abcdefgh", limite=2) == 3
+    assert distancia_edicao("danil", "daniel", limite=1) == 1
+
+
+@pytest.mark.parametrize("termo, limite", [("joao", 1), ("samuel", 1), ("gustavo", 2), ("guilherme", 2)])
+def test_limite_distancia_por_tamanho(termo, limite):
+    assert limite_distancia(termo) == limite
+
+
+def test_normalizar_nome():
+    assert normalizar_nome(" João.") == "joao"
+    assert normalizar_nome(None) == ""
+
+
+def test_arvore_bk_igual_a_busca_exaustiva():
+    aleatorio = random.Random(3)
+    letras = "abcde"
+    termos = {"".join(aleatorio.choice(letras) for _ in range(aleatorio.randint(3, 8))) for _ in range(300)}
+    arvore = ArvoreBK()
+    for termo in termos:
+        arvore.inserir(termo, termo.upper())
+
+    for _ in range(50):
+        consulta = "".join(aleatorio.choice(letras) for _ in range(aleatorio.randint(3, 8)))
+        for limite in (1, 2):
+            esperado = sorted(
+                (distancia_edicao(consulta, termo), termo, termo.upper())
+                for termo in termos if distancia_edicao(consulta, termo) <= limite
+            )
+            assert arvore.buscar(consulta, limite) == esperado
+
+
+@pytest.mark.parametrize("a, b, variante", [
+    ("daniel", "daniela", True),
+    ("paulo", "paula", True),
+    ("claudio", "claudia", True),
+    ("gutavo", "gustavo", False),
+    ("lukas", "lucas", False),
+    ("jarbass", "jarbas", False),
+])
+def test_variante_de_nome(a, b, variante):
+    assert variante_de_nome(a, b) is variante
+
+
+@pytest.fixture
+def resolvedor():
+    return ResolvedorTecnicos(
+        {"gus": "Gustavo Kauan"},
+        ["Daniela Nogueira", "Gustavo Kauan", "Alcelio Santos", "Ana Souza", "Bruno Silveira", "Marcos Lima", "Marcia Lopes"]
+    )
+
+
+@pytest.mark.parametrize("bruto, esperado", [
+    ("Danniela", "Daniela Nogueira"),
+    ("Nogeira", "Daniela Nogueira"),
+    ("Alcelo", "Alcelio Santos"),
+    ("Gutavo", "Gustavo Kauan"),
+])
+def test_erros_de_digitacao_sao_resolvidos(resolvedor, bruto, esperado):
+    assert resolvedor.resolver(bruto) == (esperado, True)
+
+
+@pytest.mark.parametrize("bruto", [
+    "Daniel",        # outro nome, não erro de digitação de Daniela
+    "Ana Silveira",  # primeiro nome exato de outro técnico
+    "Marcio",        # ao alcance de Marcos e de Marcia
+    "Fulano",
+])
+def test_casos_duvidosos_ficam_para_revisao(resolvedor, bruto):
+    assert resolvedor.resolver(bruto) == (bruto.title(), False)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Resumos mensais iguais ao GROUP BY sobre registros após cada gravação"""
+
+import pytest
+
+from benchmarks.gerador_logs import gerar_texto
+from ingestao import PipelineIngestao
+
+
+@pytest.fixture
+def analise(banco):
+    resultado = PipelineIngestao().executar(gerar_texto(60_000, semente=21), "resumos.txt")
+    assert resultado.sucesso_analise and resultado.sucesso_registros, resultado.msg_registros
+    yield resultado.analise_id, resultado.df
+    banco.deletar_analise(resultado.analise_id)
+
+
+def test_resumos_apos_ingestao(analise, resumos_mensais):
+    analise_id, df = analise
+    gravados, calculados = resumos_mensais(analise_id)
+    assert gravados == calculados
+    por_tecnico, por_cliente = gravados
+    assert sum(linha[-1] for linha in por_tecnico) == len(df)
+    assert sum(linha[2] for linha in por_cliente) == len(df)
+
+
+def test_resumos_apos_edicao(banco, analise, resumos_mensais):
+    analise_id, df = analise
+    ids = [int(i) for i in df.index[:6]]
+    sucesso, msg, _ = banco.aplicar_alteracoes_registros(
+        atualizados={
+            ids[0]: {"Técnico": "Técnico Novo"},
+            ids[1]: {"Tipo": "Fiscal", "Data": "15/07/2019"},
+            ids[2]: {"Cliente": "CLIENTE EDITADO", "Data": "sem data"},
+        },
+        inseridos=[{"Data": "01/01/2018", "O.S": "000001", "Cliente": "CLIENTE NOVO", "Técnico": "Samuel", "Tipo": "Erro"}],
+        removidos=ids[3:],
+        analise_id_novos=analise_id,
+    )
+    assert sucesso, msg
+
+    gravados, calculados = resumos_mensais(analise_id)
+    assert gravados == calculados
+    por_tecnico, por_cliente = gravados
+    assert any(linha[:3] == ("2019-07", df.loc[ids[1], "Técnico"], "Fiscal") for linha in por_tecnico)
+    assert ("2018-01", "CLIENTE NOVO", 1, 1) in por_cliente
+    assert any(linha[:2] == ("sem-data", "CLIENTE EDITADO") for linha in por_cliente)
+
+
+def test_resumos_apos_exclusao(banco, resumos_mensais):
+    resultado = PipelineIngestao().executar(gerar_texto(20_000, semente=22), "excluida.txt")
+    assert resumos_mensais(resultado.analise_id)[0] != ([], [])
+
+    sucesso, msg = banco.deletar_analise(resultado.analise_id)
+    assert sucesso, msg
+    assert resumos_mensais(resultado.analise_id) == (([], []), ([], []))
+
+
+def test_reconstrucao_completa_nao_altera_os_resumos(banco, analise, resumos_mensais):
+    analise_id, _ = analise
+    antes = resumos_mensais(analise_id)
+    sucesso, msg, ids = banco.reconstruir_resumos_mensais(todas=True)
+    assert sucesso, msg
+    assert analise_id in ids
+    assert resumos_mensais(analise_id) == antes
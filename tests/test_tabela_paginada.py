@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Paginação no servidor e conversão do estado do st.data_editor em alterações por ID"""
+
+import pandas as pd
+
+from tabela_paginada import (
+    aplicar_alteracoes,
+    alteracoes_editor,
+    buscar,
+    fatiar_pagina,
+    ordenar,
+    possui_alteracoes,
+    truncar_texto,
+)
+
+
+def _df(ids) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"Técnico": [f"T{i}" for i in range(len(ids))], "Tipo": ["Erro"] * len(ids)},
+        index=pd.Index(ids, dtype="Int64", name="ID")
+    )
+
+
+def test_fatiar_pagina_limita_a_pagina():
+    df = _df(range(10))
+    fatia, inicio, total_paginas = fatiar_pagina(df, pagina=4, tamanho=3)
+    assert (inicio, total_paginas) == (9, 4)
+    assert list(fatia.index) == [9]
+
+    # Página fora do intervalo vai para a última (ou a primeira)
+    assert fatiar_pagina(df, pagina=99, tamanho=3)[1] == 9
+    assert fatiar_pagina(df.iloc[:0], pagina=2, tamanho=3)[1:] == (0, 1)
+
+
+def test_buscar_e_ordenar():
+    df = pd.DataFrame({"Cliente": ["Mercado Sol", "Padaria", "mercado Lua"], "O.S": [3, 1, 2]})
+    assert list(buscar(df, "MERCADO").index) == [0, 2]
+    assert buscar(df, "") is df
+    assert list(ordenar(df, "O.S").index) == [1, 2, 0]
+    assert list(ordenar(df, "O.S", crescente=False).index) == [0, 2, 1]
+    assert ordenar(df, "Inexistente") is df
+
+
+def test_truncar_texto():
+    serie = pd.Series(["curto", "x" * 10])
+    assert list(truncar_texto(serie, limite=5)) == ["curto", "xxxxx…"]
+
+
+def test_posicoes_da_pagina_viram_ids():
+    df = _df([10, 11, 12, 13, 14, 15])
+    fatia, inicio, _ = fatiar_pagina(df, pagina=2, tamanho=3)
+    assert inicio == 3
+
+    alteracoes = alteracoes_editor(fatia, {
+        "edited_rows": {0: {"Tipo": "Rotina"}, "2": {"Técnico": "Outro"}},
+        "deleted_rows": [1],
+        "added_rows": [{"_index": None, "Técnico": "Novo", "Tipo": "Fiscal"}],
+    })
+    assert alteracoes == {
+        "atualizados": {13: {"Tipo": "Rotina"}, 15: {"Técnico": "Outro"}},
+        "inseridos": [{"Técnico": "Novo", "Tipo": "Fiscal"}],
+        "removidos": [14],
+    }
+
+
+def test_linha_removida_nao_e_atualizada_e_sem_id_e_ignorada():
+    fatia = _df([1, None, 3])
+    alteracoes = alteracoes_editor(fatia, {
+        "edited_rows": {0: {"Tipo": "Rotina"}, 1: {"Tipo": "Rotina"}},
+        "deleted_rows": [0, 1],
+    })
+    assert alteracoes == {"atualizados": {}, "inseridos": [], "removidos": [1]}
+
+
+def test_aplicar_alteracoes_reflete_o_que_foi_gravado():
+    df = _df([1, 2, 3])
+    alteracoes = {
+        "atualizados": {2: {"Tipo": "Rotina"}},
+        "inseridos": [{"Técnico": "Novo"}],
+        "removidos": [3],
+    }
+    resultado = aplicar_alteracoes(df, alteracoes, ids_inseridos=[99])
+
+    assert list(resultado.index) == [1, 2, 99]
+    assert resultado.loc[2, "Tipo"] == "Rotina"
+    assert resultado.loc[99, "Técnico"] == "Novo" and resultado.loc[99, "Tipo"] == ""
+    # O original não é alterado
+    assert list(df.index) == [1, 2, 3] and df.loc[2, "Tipo"] == "Erro"
+
+
+def test_possui_alteracoes():
+    assert not possui_alteracoes({})
+    assert not possui_alteracoes({"edited_rows": {}, "deleted_rows": [], "added_rows": []})
+    assert possui_alteracoes({"added_rows": [{}]})